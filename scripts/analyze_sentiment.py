@@ -4,8 +4,11 @@ CLI sentiment analysis tool for Hopes & Sorrows.
 """
 
 import sys
+import json
+import time
 import argparse
 from pathlib import Path
+from typing import Optional
 
 # Add src to Python path
 project_root = Path(__file__).parent.parent
@@ -55,6 +58,78 @@ def analyze_file(file_path: Path, verbose: bool = True):
         print(f"❌ Error reading file {file_path}: {e}")
         return None
 
+def analyze_batch_file(file_path: Path, workers: Optional[int] = None):
+    """
+    Analyze a file with one text per line, optionally across a worker pool.
+
+    workers=1 analyzes in this process; None or 0 leaves the count to
+    TransformerWorkerPool (SENTIMENT_WORKERS, or one per CPU core).
+    """
+    from hopes_sorrows.core.exceptions import ConfigurationError
+    from hopes_sorrows.analysis.sentiment.sa_transformers import get_analyzer
+    from hopes_sorrows.analysis.sentiment.worker_pool import TransformerWorkerPool
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        print(f"❌ File not found: {file_path}")
+        return None
+
+    if not texts:
+        print(f"⚠️  File {file_path} is empty")
+        return None
+
+    analyzer = get_analyzer()
+    start = time.perf_counter()
+    pool = None
+    if workers != 1:
+        try:
+            pool = TransformerWorkerPool(analyzer, workers=workers)
+        except ConfigurationError as e:
+            print(f"⚠️  {e}; analyzing in this process")
+    count = pool.workers if pool is not None else 1
+    print(f"📄 Analyzing {len(texts)} texts from: {file_path} ({count} worker{'s' if count != 1 else ''})")
+    if pool is not None:
+        with pool:
+            results = pool.analyze(texts)
+    else:
+        results = analyzer.analyze_batch(texts)
+    elapsed = time.perf_counter() - start
+
+    for text, result in zip(texts, results):
+        preview = text if len(text) <= 60 else text[:57] + "..."
+        print(f"  {result['category']:<20} {result['score']:+.3f}  {preview}")
+    print(f"\n✅ {len(texts)} texts in {elapsed:.2f}s ({len(texts) / elapsed:.1f} texts/s)")
+
+    return results
+
+def analyze_stream_file(file_path: Path, output_path: Path = None, batch_size: int = 64, embeddings: bool = False):
+    """Stream a JSONL file of {"id", "text", "speaker_id"} records to JSONL results."""
+    from hopes_sorrows.analysis.sentiment import analyze_stream, read_jsonl_records, open_embedding_store, json_default
+
+    store = open_embedding_store() if embeddings else None
+    out = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    count = 0
+    start = time.perf_counter()
+    try:
+        for record_id, result in analyze_stream(read_jsonl_records(file_path), batch_size=batch_size,
+                                                    embedding_store=store):
+            out.write(json.dumps({'id': record_id, **result}, default=json_default) + '\n')
+            count += 1
+    except FileNotFoundError:
+        print(f"❌ File not found: {file_path}", file=sys.stderr)
+        return None
+    finally:
+        if output_path:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count} records in {elapsed:.2f}s", file=sys.stderr)
+    if store is not None:
+        print(f"🧭 Embeddings stored in {store.directory} ({len(store)} total)", file=sys.stderr)
+    return count
+
 def interactive_mode():
     """Run in interactive mode."""
     print("🤖 Hopes & Sorrows - Interactive Sentiment Analysis")
@@ -89,9 +164,19 @@ def main():
     group.add_argument('-t', '--text', help='Text to analyze')
     group.add_argument('-f', '--file', type=Path, help='File containing text to analyze')
     group.add_argument('-i', '--interactive', action='store_true', help='Run in interactive mode')
+    group.add_argument('-b', '--batch', type=Path, help='File with one text per line to analyze in bulk')
+    group.add_argument('-s', '--stream', type=Path, help='JSONL file of id/text/speaker_id records to stream through the analyzer')
     
     parser.add_argument('-v', '--verbose', action='store_true', 
                        help='Verbose output with detailed formatting')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                       help='Worker processes for --batch (default: SENTIMENT_WORKERS, or one per CPU core; 1 = no pool)')
+    parser.add_argument('-o', '--output', type=Path,
+                       help='JSONL output file for --stream (defaults to stdout)')
+    parser.add_argument('--batch-size', type=int, default=64,
+                       help='Records per batch for --stream')
+    parser.add_argument('--embeddings', action='store_true',
+                       help='Also store each record\'s embedding in EMBEDDING_STORE_DIR during --stream')
     
     args = parser.parse_args()
     
@@ -99,6 +184,10 @@ def main():
         analyze_text(args.text, args.verbose)
     elif args.file:
         analyze_file(args.file, args.verbose)
+    elif args.batch:
+        analyze_batch_file(args.batch, args.workers)
+    elif args.stream:
+        analyze_stream_file(args.stream, args.output, args.batch_size, args.embeddings)
     elif args.interactive:
         interactive_mode()
     else:
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Worst-case latency report for the classifier's pattern matching modes.
+
+Feeds the 'exact' (unbounded '.*' gaps) and 'bounded' (token-window gaps)
+classifiers adversarial texts of growing length - dense runs of the anchor
+words that open gap patterns, with no completion to end the search - and
+reports pattern-detection time per text and per 1k characters. Bounded
+matching should stay flat per character while exact matching grows with
+the length. Also checks that both modes agree on realistic inputs.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add src to Python path
+project_root = Path(__file__).parent.parent
+src_path = project_root / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier
+
+console = Console()
+
+# Words that open a '.*' gap pattern; repeated without a closing word they force the longest searches
+ADVERSARIAL_ANCHORS = [
+    "both", "memories", "but", "excited", "death", "devastating", "although", "love", "want",
+    "grateful", "questioning", "grew", "home", "watching", "broke", "used", "before", "different",
+]
+
+# Realistic utterances, alone and joined into transcripts (from tests/test_classification.py)
+REALISTIC_TEXTS = [
+    "I will achieve my dreams and make a better future for myself.",
+    "I'm going to learn from this experience and grow stronger.",
+    "I lost everything I worked for and it's all gone now.",
+    "The pain is too much to bear, I feel broken inside.",
+    "I was hurt, but I've learned to heal and move forward.",
+    "Despite the challenges, I'm finding strength in myself.",
+    "I'm excited about the future but scared of what might happen.",
+    "I want to move on but I can't let go of the past.",
+    "I'm thinking about what this experience means to me.",
+    "Watching my childhood home being demolished broke something inside me.",
+    "The death of my father taught me that life is short and precious.",
+    "It feels like both an adventure and a terrible mistake.",
+]
+
+def adversarial_text(length: int) -> str:
+    """Anchor words repeated up to the given number of characters."""
+    chunk = " ".join(ADVERSARIAL_ANCHORS) + " "
+    return (chunk * (length // len(chunk) + 1))[:length]
+
+def time_detection(classifier, text: str, repeats: int) -> float:
+    """Best-of-N pattern detection time in milliseconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        classifier._detect_patterns(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+def agreement(exact, bounded):
+    """Share of realistic texts and transcripts on which both modes find the same patterns and category."""
+    texts = REALISTIC_TEXTS + [" ".join(REALISTIC_TEXTS[i:i + 4]) for i in range(0, len(REALISTIC_TEXTS), 4)]
+    same_patterns = same_category = 0
+    for text in texts:
+        exact_result = exact.classify_emotion(text, 0.0, "benchmark_exact")
+        bounded_result = bounded.classify_emotion(text, 0.0, "benchmark_bounded")
+        same_patterns += ([p.description for p, _ in exact_result.matched_patterns] ==
+                          [p.description for p, _ in bounded_result.matched_patterns])
+        same_category += exact_result.category == bounded_result.category
+    return {'texts': len(texts), 'same_patterns': same_patterns / len(texts), 'same_category': same_category / len(texts)}
+
+def build_report(lengths, repeats: int, gap_tokens: int, exact_limit: int):
+    """Time both modes over the adversarial lengths and return the report as a dict."""
+    exact = AdvancedHopeSorrowClassifier(match_mode="exact")
+    bounded = AdvancedHopeSorrowClassifier(match_mode="bounded", gap_tokens=gap_tokens)
+
+    rows = []
+    for length in lengths:
+        text = adversarial_text(length)
+        row = {'length': length, 'bounded_ms': time_detection(bounded, text, repeats), 'exact_ms': None}
+        # Exact matching blows up quickly; skip the lengths that would take minutes
+        if length <= exact_limit:
+            row['exact_ms'] = time_detection(exact, text, repeats)
+        rows.append(row)
+
+    return {'gap_tokens': gap_tokens, 'adversarial': rows, 'realistic': agreement(exact, bounded)}
+
+def print_report(report):
+    """Print the report as rich tables."""
+    table = Table(title=f"Adversarial pattern detection (gap window {report['gap_tokens']} tokens)",
+                  box=box.ROUNDED, header_style="bold magenta")
+    table.add_column("Chars", style="cyan", justify="right")
+    table.add_column("Exact (ms)", style="yellow", justify="right")
+    table.add_column("Exact (ms/1k chars)", style="yellow", justify="right")
+    table.add_column("Bounded (ms)", style="green", justify="right")
+    table.add_column("Bounded (ms/1k chars)", style="green", justify="right")
+    for row in report['adversarial']:
+        per_k = 1000.0 / row['length']
+        exact = row['exact_ms']
+        table.add_row(
+            str(row['length']),
+            f"{exact:.1f}" if exact is not None else "skipped",
+            f"{exact * per_k:.2f}" if exact is not None else "-",
+            f"{row['bounded_ms']:.1f}",
+            f"{row['bounded_ms'] * per_k:.2f}",
+        )
+    console.print(table)
+
+    realistic = report['realistic']
+    console.print(f"Realistic inputs ({realistic['texts']}): same patterns {realistic['same_patterns']:.0%}, "
+                  f"same category {realistic['same_category']:.0%}")
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Worst-case latency of exact vs bounded classifier pattern matching')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[500, 1000, 2000, 4000, 8000, 16000, 32000],
+                        help='Adversarial text lengths in characters')
+    parser.add_argument('--repeats', type=int, default=3, help='Timing repeats per length (best is reported)')
+    parser.add_argument('--gap-tokens', type=int, default=20, help='Token window of the bounded mode')
+    parser.add_argument('--exact-limit', type=int, default=8000,
+                        help='Longest text to run in exact mode')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = build_report(args.lengths, args.repeats, args.gap_tokens, args.exact_limit)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
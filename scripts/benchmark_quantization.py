@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Accuracy/latency regression report for the int8 quantized transformer mode.
+
+Runs the fp32 and int8 SentimentAnalyzer over a labelled corpus and reports
+how often they agree on the emotion category, how far apart their scores
+are, and p50/p95 per-utterance latency for each mode.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src to Python path
+project_root = Path(__file__).parent.parent
+src_path = project_root / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from hopes_sorrows.analysis.sentiment.sa_transformers import SentimentAnalyzer
+
+console = Console()
+
+# Labelled cases from tests/test_classification.py
+DEFAULT_CORPUS = [
+    ("I will achieve my dreams and make a better future for myself.", "hope"),
+    ("I'm going to learn from this experience and grow stronger.", "hope"),
+    ("There's a possibility that things will get better soon.", "hope"),
+    ("I lost everything I worked for and it's all gone now.", "sorrow"),
+    ("I should have made different choices, I regret my mistakes.", "sorrow"),
+    ("The pain is too much to bear, I feel broken inside.", "sorrow"),
+    ("I was hurt, but I've learned to heal and move forward.", "transformative"),
+    ("Despite the challenges, I'm finding strength in myself.", "transformative"),
+    ("I realized that my past mistakes don't define my future.", "transformative"),
+    ("I'm excited about the future but scared of what might happen.", "ambivalent"),
+    ("I want to move on but I can't let go of the past.", "ambivalent"),
+    ("I see the possibilities but I'm worried about the risks.", "ambivalent"),
+    ("I'm thinking about what this experience means to me.", "reflective_neutral"),
+    ("I need to understand why things happened this way.", "reflective_neutral"),
+    ("Let me reflect on what I've learned from this situation.", "reflective_neutral"),
+]
+
+def load_corpus(path: Path):
+    """Load a JSONL corpus of {"text": ..., "category": ...} records."""
+    corpus = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                corpus.append((record['text'], record.get('category')))
+    return corpus
+
+def run_mode(quantize: bool, corpus, warmup: int = 3):
+    """Analyze the corpus with one analyzer and record results and per-call latency."""
+    analyzer = SentimentAnalyzer(quantize=quantize)
+
+    for text, _ in corpus[:warmup]:
+        analyzer.analyze(text)
+
+    results = []
+    latencies = []
+    for text, _ in corpus:
+        start = time.perf_counter()
+        results.append(analyzer.analyze(text))
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    return results, np.array(latencies)
+
+def build_report(corpus, fp32_results, fp32_latencies, int8_results, int8_latencies):
+    """Compare the two runs and return the report as a dict."""
+    fp32_categories = [r['category'] for r in fp32_results]
+    int8_categories = [r['category'] for r in int8_results]
+    agreement = np.mean([a == b for a, b in zip(fp32_categories, int8_categories)])
+    score_diff = np.abs(np.array([float(r['score']) for r in fp32_results]) -
+                        np.array([float(r['score']) for r in int8_results]))
+
+    report = {
+        'samples': len(corpus),
+        'category_agreement': float(agreement),
+        'score_mean_abs_diff': float(score_diff.mean()),
+        'score_max_abs_diff': float(score_diff.max()),
+        'modes': {},
+        'disagreements': [
+            {'text': text, 'fp32': a, 'int8': b}
+            for (text, _), a, b in zip(corpus, fp32_categories, int8_categories) if a != b
+        ],
+    }
+
+    labelled = [expected for _, expected in corpus]
+    for mode, categories, latencies in (('fp32', fp32_categories, fp32_latencies),
+                                        ('int8', int8_categories, int8_latencies)):
+        scored = [(c, e) for c, e in zip(categories, labelled) if e]
+        report['modes'][mode] = {
+            'accuracy': float(np.mean([c == e for c, e in scored])) if scored else None,
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p95_ms': float(np.percentile(latencies, 95)),
+        }
+
+    return report
+
+def print_report(report):
+    """Print the report as rich tables."""
+    summary = Table(title="fp32 vs int8", box=box.ROUNDED, header_style="bold magenta")
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", style="green")
+    summary.add_row("Samples", str(report['samples']))
+    summary.add_row("Category agreement", f"{report['category_agreement']:.1%}")
+    summary.add_row("Mean |score diff|", f"{report['score_mean_abs_diff']:.4f}")
+    summary.add_row("Max |score diff|", f"{report['score_max_abs_diff']:.4f}")
+    console.print(summary)
+
+    modes = Table(title="Per mode", box=box.ROUNDED, header_style="bold magenta")
+    modes.add_column("Mode", style="cyan")
+    modes.add_column("Accuracy", style="green")
+    modes.add_column("p50 (ms)", style="yellow")
+    modes.add_column("p95 (ms)", style="yellow")
+    for mode, stats in report['modes'].items():
+        accuracy = f"{stats['accuracy']:.1%}" if stats['accuracy'] is not None else "n/a"
+        modes.add_row(mode, accuracy, f"{stats['latency_p50_ms']:.1f}", f"{stats['latency_p95_ms']:.1f}")
+    console.print(modes)
+
+    for item in report['disagreements']:
+        console.print(f"[yellow]⚠️ fp32={item['fp32']} int8={item['int8']}:[/yellow] {item['text']}")
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Compare fp32 and int8 quantized transformer inference')
+    parser.add_argument('-c', '--corpus', type=Path,
+                        help='JSONL file with {"text", "category"} records (defaults to the classification test cases)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else DEFAULT_CORPUS
+
+    fp32_results, fp32_latencies = run_mode(False, corpus)
+    int8_results, int8_latencies = run_mode(True, corpus)
+    report = build_report(corpus, fp32_results, fp32_latencies, int8_results, int8_latencies)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
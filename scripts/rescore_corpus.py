@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Re-score the stored corpus under new classifier weights and boosts.
+
+Reads every transcription's stored pattern hits (written at ingest, or by
+--backfill for older transcriptions), applies the weights from a JSON file
+to all of them in one vectorized pass and reports which categories change.
+With --write the changed categories are stored in one bulk update.
+
+Weights file format (every key optional):
+
+    {
+        "patterns": {"Explicit happiness": 0.95, "Loss language": 0.7},
+        "ambivalent_keyword_boost": 0.6,
+        "transformative_keyword_boost": 0.5
+    }
+
+Pattern weights are keyed by pattern description; the other keys are
+ScoringParameters fields.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add src to Python path
+project_root = Path(__file__).parent.parent
+src_path = project_root / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from hopes_sorrows.core.config import get_config
+from hopes_sorrows.data.db_manager import DatabaseManager
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier
+from hopes_sorrows.analysis.sentiment.rescoring import backfill_pattern_hits, rescore_corpus
+
+console = Console()
+
+def load_parameters(classifier, path):
+    """ScoringParameters from a weights file, or the classifier's defaults without one."""
+    if path is None:
+        return classifier.scoring_parameters()
+    overrides = json.loads(Path(path).read_text(encoding='utf-8'))
+    return classifier.scoring_parameters(overrides.pop('patterns', None), **overrides)
+
+def print_report(report, top: int):
+    """Print the re-scoring summary and the most common category transitions."""
+    action = "written" if report['written'] else "not written (dry run, use --write)"
+    console.print(f"Pattern set {report['match_version']}: {report['analyses']} analyses re-scored, "
+                  f"{report['changed']} changed, {action}")
+    if report['skipped']:
+        console.print(f"{report['skipped']} analyses skipped: their stored category did not come from the classifier "
+                      f"(combined, fast-path or fallback results)")
+    console.print(f"Loaded hits in {report['load_seconds']:.2f}s, scored in {report['score_seconds']:.3f}s")
+    if not report['transitions']:
+        return
+
+    table = Table(title="Category changes", box=box.ROUNDED, header_style="bold magenta")
+    table.add_column("From", style="yellow")
+    table.add_column("To", style="green")
+    table.add_column("Analyses", style="cyan", justify="right")
+    transitions = sorted(report['transitions'].items(), key=lambda item: item[1], reverse=True)
+    for (old, new), count in transitions[:top]:
+        table.add_row(old, new, str(count))
+    console.print(table)
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Re-score stored transcriptions from their stored pattern hits')
+    parser.add_argument('--weights', help='JSON file of pattern weights and scoring parameters to apply')
+    parser.add_argument('--database', help='Database URL (defaults to DATABASE_URL)')
+    parser.add_argument('--backfill', action='store_true',
+                        help='First extract and store hits for transcriptions that have none (runs the patterns once)')
+    parser.add_argument('--write', action='store_true', help='Store the changed categories')
+    parser.add_argument('--top', type=int, default=20, help='Category transitions to show')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.database or get_config().get_database_url())
+    try:
+        classifier = AdvancedHopeSorrowClassifier()
+        parameters = load_parameters(classifier, args.weights)
+        if args.backfill:
+            start = time.perf_counter()
+            count = backfill_pattern_hits(db_manager, classifier)
+            console.print(f"Stored pattern hits for {count} transcriptions in {time.perf_counter() - start:.1f}s")
+
+        report = rescore_corpus(db_manager, parameters, classifier, write=args.write)
+        if args.json:
+            report['transitions'] = [
+                {'from': old, 'to': new, 'count': count} for (old, new), count in report['transitions'].items()
+            ]
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report, args.top)
+    finally:
+        db_manager.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Run the shared sentiment inference server.
+
+Web workers and scripts started with INFERENCE_URL=http://<host>:<port> use
+this server instead of loading their own copy of the model.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from hopes_sorrows.core.config import get_config
+from hopes_sorrows.analysis.sentiment.inference_server import create_inference_app
+
+def main():
+    """Run the inference server."""
+    config = get_config()
+    parser = argparse.ArgumentParser(description='Shared sentiment inference server for Hopes & Sorrows')
+    parser.add_argument('--host', default=config.get('INFERENCE_HOST'), help='Interface to bind')
+    parser.add_argument('--port', type=int, default=config.get('INFERENCE_PORT'), help='Port to listen on')
+    args = parser.parse_args()
+
+    print("🧠 Loading and warming the sentiment model...")
+    app = create_inference_app()
+
+    print(f"🌐 Inference server running on http://{args.host}:{args.port}")
+    print(f"   Point clients at it with INFERENCE_URL=http://{args.host}:{args.port}")
+    try:
+        app.run(host=args.host, port=args.port, threaded=True)
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down gracefully...")
+
+if __name__ == '__main__':
+    main()
@@ -56,6 +56,10 @@ setup(
             "librosa>=0.10.0",
             "soundfile>=0.12.0",
         ],
+        "onnx": [
+            "onnx>=1.14.0",
+            "onnxruntime>=1.16.0",
+        ],
     },
     entry_points={
         "console_scripts": [
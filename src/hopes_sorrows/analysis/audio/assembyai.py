@@ -20,6 +20,8 @@ from ...analysis.sentiment.cli_formatter import format_sentiment_result, format_
 from ...analysis.sentiment.sa_transformers import analyze_sentiment as analyze_sentiment_transformer
 from ...analysis.sentiment.sa_LLM import analyze_sentiment as analyze_sentiment_llm
 from ...analysis.sentiment.combined_analyzer import analyze_sentiment_combined
+from ...analysis.sentiment.utterance_features import UtteranceFeatures
+from ...analysis.sentiment.rescoring import record_pattern_hits
 from ...data.db_manager import DatabaseManager
 from ...data.models import AnalyzerType, Transcription, SentimentAnalysis
 from ...core.config import get_config
@@ -194,16 +196,19 @@ def analyze_audio(audio_file, use_llm=True, expected_speakers=None):
 			console.print("[yellow]- Minimize background noise and cross-talk[/yellow]")
 			console.print("[yellow]- Consider using multichannel recording if possible[/yellow]")
 		
+		# Text features of every utterance, computed once and shared by the quality checks and all analyzers
+		utterance_features = [UtteranceFeatures(u.text) for u in transcript.utterances]
+		
 		# ENHANCED: Analyze utterance patterns for quality assessment
-		short_utterances = [u for u in transcript.utterances if len(u.text.split()) < 3]
-		very_short_utterances = [u for u in transcript.utterances if len(u.text.strip()) < 5]  # Less than 5 characters
+		short_utterances = [u for u, f in zip(transcript.utterances, utterance_features) if len(f.tokens) < 3]
+		very_short_utterances = [u for u, f in zip(transcript.utterances, utterance_features) if len(f.text_clean) < 5]  # Less than 5 characters
 		nonsensical_utterances = []
 		
 		# Check for nonsensical content
-		for utterance in transcript.utterances:
-			text = utterance.text.strip().lower()
+		for utterance, features in zip(transcript.utterances, utterance_features):
+			text = features.text_lower
 			# Check for patterns that suggest nonsensical input
-			if (len(text.split()) < 2 and 
+			if (len(features.tokens) < 2 and 
 				not any(word in text for word in ['yes', 'no', 'ok', 'okay', 'hello', 'hi', 'bye', 'thanks', 'thank you']) and
 				len(text) > 0):
 				nonsensical_utterances.append(utterance)
@@ -228,19 +233,21 @@ def analyze_audio(audio_file, use_llm=True, expected_speakers=None):
 		results = []
 		processed_count = 0
 		skipped_count = 0
+		# (transcription id, features) of new analyses, whose pattern hits are stored for re-scoring
+		hit_records = []
 		
-		for utterance in transcript.utterances:
+		for utterance, features in zip(transcript.utterances, utterance_features):
 			speaker_id = utterance.speaker
-			text = utterance.text.strip()
+			text = features.text_clean
 			
 			# ENHANCED: Skip empty or very short utterances
-			if not text or len(text.strip()) < 2:
+			if not text or len(text) < 2:
 				skipped_count += 1
 				console.print(f"[dim]⏭️ Skipped empty/very short utterance[/dim]")
 				continue
 			
 			# ENHANCED: Check for nonsensical content and handle appropriately
-			if _is_nonsensical_content(text):
+			if features.is_nonsensical:
 				console.print(f"[yellow]⚠️ Potentially nonsensical content detected: \"{text[:50]}...\"[/yellow]")
 				console.print(f"[yellow]Proceeding with analysis but results may be unreliable[/yellow]")
 				
@@ -287,7 +294,7 @@ def analyze_audio(audio_file, use_llm=True, expected_speakers=None):
 				try:
 					# Use combined analyzer for single, more accurate result
 					combined_sentiment = analyze_sentiment_combined(
-						text, speaker_id, None, use_llm=use_llm, verbose=False
+						text, speaker_id, None, use_llm=use_llm, verbose=False, features=features
 					)
 					processed_count += 1
 					console.print(f"[green]🔄[/green] Combined analysis: {combined_sentiment['category']} (confidence: {combined_sentiment['confidence']:.1%})")
@@ -295,7 +302,7 @@ def analyze_audio(audio_file, use_llm=True, expected_speakers=None):
 					console.print(f"[red]❌ Combined analysis failed for utterance: {str(e)}[/red]")
 					# Fallback to simple transformer analysis
 					try:
-						combined_sentiment = analyze_sentiment_transformer(text, speaker_id, None, verbose=False)
+						combined_sentiment = analyze_sentiment_transformer(text, speaker_id, None, verbose=False, features=features)
 						console.print(f"[yellow]🔄[/yellow] Fallback to transformer: {combined_sentiment['category']}")
 					except Exception as e2:
 						console.print(f"[red]❌ Transformer fallback also failed: {str(e2)}[/red]")
@@ -324,6 +331,7 @@ def analyze_audio(audio_file, use_llm=True, expected_speakers=None):
 					explanation=combined_sentiment.get('explanation', analysis_description)
 				)
 				console.print(f"[green]💾[/green] Stored NEW {analyzer_type.value} analysis: {combined_sentiment['category']}")
+				hit_records.append((transcription.id, features))
 				
 				# Store detailed metadata about the combination in the explanation field
 				if 'combination_strategy' in combined_sentiment:
@@ -343,11 +351,24 @@ def analyze_audio(audio_file, use_llm=True, expected_speakers=None):
 				"text": text,
 				"start_time": utterance.start,
 				"end_time": utterance.end,
+				"nonsensical": features.is_nonsensical,
 				"combined_sentiment": combined_sentiment,
 				"transformer_sentiment": combined_sentiment,  # For backward compatibility
 				"llm_sentiment": None  # No longer storing separate LLM results
 			})
 
+		# Store the utterances' pattern hits so the corpus can be re-scored without re-running the patterns
+		if hit_records:
+			try:
+				record_pattern_hits(
+					db_manager,
+					[transcription_id for transcription_id, _ in hit_records],
+					[features.text for _, features in hit_records],
+					[features for _, features in hit_records]
+				)
+			except Exception as e:
+				console.print(f"[yellow]⚠️ Could not store pattern hits for re-scoring: {str(e)}[/yellow]")
+		
 		# ENHANCED: Provide processing summary
 		console.print(f"\n[bold green]✅ Processing Complete[/bold green]")
 		console.print(f"[green]Successfully processed: {processed_count} utterances[/green]")
@@ -402,55 +423,7 @@ def _is_nonsensical_content(text: str) -> bool:
 	Returns:
 		bool: True if the content appears nonsensical
 	"""
-	text_lower = text.lower().strip()
-	words = text_lower.split()
-	
-	# Very short single words that aren't common speech
-	if len(words) == 1 and len(text_lower) < 4:
-		common_short_words = ['yes', 'no', 'ok', 'hi', 'bye', 'wow', 'oh', 'ah', 'um', 'uh', 'you']
-		if text_lower not in common_short_words:
-			return True
-	
-	# Repetitive patterns (like "la la la", "tick tock tick tock")
-	if len(words) >= 3:
-		# Check for repetitive patterns - but only if words are actually repeated
-		unique_words = set(words)
-		
-		# Case 1: Very few unique words repeated many times (like "la la la la")
-		if len(unique_words) <= 2 and len(words) >= 4:
-			return True
-		
-		# Case 2: Moderate repetition with simple words (like "tick tock tick tock la la la")
-		if len(unique_words) <= 3 and len(words) >= 6:
-			# Check if most words are repeated
-			word_counts = {}
-			for word in words:
-				word_counts[word] = word_counts.get(word, 0) + 1
-			
-			# If any word appears 3+ times, it's likely nonsensical
-			max_repetitions = max(word_counts.values())
-			if max_repetitions >= 3:
-				return True
-	
-	# Check for patterns that suggest noise/nonsense
-	nonsense_patterns = [
-		r'^[a-z]{1,3}\.{3,}$',  # Single letters with dots like "a..."
-		r'^[a-z\s]{1,10}\.$',   # Very short with just a period
-		r'^[^a-zA-Z\s]*$',      # No letters at all (symbols only)
-		r'^[a-z]\s[a-z]\s[a-z](\s[a-z])*$',  # FIXED: Only single letters separated by spaces (like "a b c d")
-	]
-	
-	import re
-	for pattern in nonsense_patterns:
-		if re.match(pattern, text_lower):
-			return True
-	
-	# Check for excessive punctuation or symbols
-	non_alpha_count = sum(1 for char in text if not char.isalpha() and not char.isspace())
-	if len(text) > 0 and non_alpha_count / len(text) > 0.5:  # More than 50% non-alphabetic
-		return True
-	
-	return False
+	return UtteranceFeatures(text).is_nonsensical
 
 def _create_fallback_sentiment_result(text: str, error_type: str) -> dict:
 	"""
@@ -590,7 +563,10 @@ def print_analysis(analysis):
 			
 			if len(text.strip()) < 10:
 				issues.append("Very short text")
-			if _is_nonsensical_content(text):
+			nonsensical = utterance.get("nonsensical")
+			if nonsensical is None:
+				nonsensical = _is_nonsensical_content(text)
+			if nonsensical:
 				issues.append("Potentially nonsensical content")
 			if utterance["transformer_sentiment"]["confidence"] < 0.3:
 				issues.append("Low confidence analysis")
@@ -6,6 +6,9 @@ from .sa_transformers import SentimentAnalyzer, analyze_sentiment
 from .sa_LLM import LLMSentimentAnalyzer, analyze_sentiment as analyze_sentiment_llm
 from .advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
 from .combined_analyzer import CombinedSentimentAnalyzer, analyze_sentiment_combined
+from .utterance_features import UtteranceFeatures
+from .incremental import ClassificationSession
+from .streaming import analyze_stream, read_jsonl_records, open_embedding_store, json_default
 
 __all__ = [
     'SentimentAnalyzer',
@@ -13,7 +16,13 @@ __all__ = [
     'AdvancedHopeSorrowClassifier',
     'EmotionCategory',
     'CombinedSentimentAnalyzer',
+    'UtteranceFeatures',
+    'ClassificationSession',
     'analyze_sentiment',
     'analyze_sentiment_llm',
-    'analyze_sentiment_combined'
+    'analyze_sentiment_combined',
+    'analyze_stream',
+    'read_jsonl_records',
+    'json_default',
+    'open_embedding_store'
 ] 
\ No newline at end of file
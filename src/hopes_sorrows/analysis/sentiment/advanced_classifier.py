@@ -1,10 +1,25 @@
 import re
+import math
+import hashlib
+import threading
 from enum import Enum
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple, Union
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 
+from .pattern_engine import PatternEngine, bound_gaps
+from .text_normalizer import TextNormalizer
+from .speaker_state import SpeakerStateStore, get_speaker_state_store
+from .utterance_features import UtteranceFeatures
+from ...core.config import get_config
+from ...core.exceptions import ConfigurationError
+
+# Bump when the scoring logic changes in a way the pattern lists don't capture
+CLASSIFIER_LOGIC_VERSION = 1
+
+PATTERN_MATCH_MODES = ("exact", "bounded")
+
 class EmotionCategory(Enum):
 	HOPE = "hope"
 	SORROW = "sorrow"
@@ -19,17 +34,226 @@ class LinguisticPattern:
 	category: EmotionCategory
 	description: str
 
-@dataclass
 class ClassificationResult:
-	category: EmotionCategory
-	confidence: float
-	score: float
-	matched_patterns: List[Tuple[LinguisticPattern, float]]
-	explanation: str
-	timestamp: datetime
+	"""
+	Outcome of classify_emotion.
+	
+	Holds the raw category scores and pattern matches. The explanation, the
+	category_scores dict and the serialized pattern list are built on first
+	access, since most callers never read them; so is the match list of an
+	incremental session's result (see incremental.ClassificationSession).
+	"""
+	
+	__slots__ = ("category", "confidence", "score", "timestamp", "margin", "_matches", "_collect_matches",
+				 "_raw_scores", "_category_scores", "_explanation", "_explain", "_pattern_dicts")
+	
+	def __init__(
+		self,
+		category: EmotionCategory,
+		confidence: float,
+		score: float,
+		matched_patterns: List[Tuple[LinguisticPattern, float]],
+		explanation: str,
+		timestamp: datetime,
+		margin: float = 0.0,
+		category_scores: Optional[Dict[str, float]] = None
+	):
+		self.category = category
+		self.confidence = confidence
+		self.score = score
+		self.timestamp = timestamp
+		self.margin = margin  # Winning category score minus the runner-up
+		self._matches = matched_patterns
+		self._collect_matches = None
+		self._raw_scores = None
+		self._category_scores = category_scores if category_scores is not None else {}
+		self._explanation = explanation
+		self._explain = None
+		self._pattern_dicts = None
+	
+	@classmethod
+	def deferred(
+		cls,
+		category: EmotionCategory,
+		confidence: float,
+		score: float,
+		matched_patterns: Union[List[Tuple[LinguisticPattern, float]], Callable[[], List[Tuple[LinguisticPattern, float]]]],
+		margin: float,
+		raw_scores: Dict[EmotionCategory, float],
+		explain: Callable[["ClassificationResult"], str]
+	) -> "ClassificationResult":
+		"""
+		Result whose category_scores come from raw_scores and whose explanation is explain(result), both on first access.
+		
+		matched_patterns may be a callable building the match list, which is then also called on first access.
+		"""
+		result = cls(category, confidence, score, None, None, datetime.now(), margin)
+		if callable(matched_patterns):
+			result._collect_matches = matched_patterns
+		else:
+			result._matches = matched_patterns
+		result._raw_scores = raw_scores
+		result._category_scores = None
+		result._explain = explain
+		return result
+	
+	@property
+	def matched_patterns(self) -> List[Tuple[LinguisticPattern, float]]:
+		"""(pattern, weighted score) of every pattern match."""
+		if self._matches is None:
+			self._matches = self._collect_matches()
+			self._collect_matches = None
+		return self._matches
+	
+	@property
+	def category_scores(self) -> Dict[str, float]:
+		"""Category scores by category name."""
+		if self._category_scores is None:
+			self._category_scores = {category.value: score for category, score in self._raw_scores.items()}
+		return self._category_scores
+	
+	@property
+	def explanation(self) -> str:
+		"""Human-readable account of the classification."""
+		if self._explanation is None:
+			self._explanation = self._explain(self)
+			self._explain = None
+		return self._explanation
+	
+	@property
+	def pattern_dicts(self) -> List[Dict]:
+		"""Matched patterns as JSON-ready dicts of description, weight and category."""
+		if self._pattern_dicts is None:
+			self._pattern_dicts = [
+				{
+					"pattern": pattern.description,
+					"weight": weight,
+					"category": pattern.category.value
+				}
+				for pattern, weight in self.matched_patterns
+			]
+		return self._pattern_dicts
+	
+	def to_dict(self) -> Dict:
+		"""Classification fields of an analysis result."""
+		return {
+			"category": self.category.value,
+			"classification_confidence": self.confidence,
+			"matched_patterns": self.pattern_dicts,
+			"explanation": self.explanation
+		}
+	
+	def __repr__(self) -> str:
+		return (f"ClassificationResult(category={self.category}, confidence={self.confidence!r}, "
+				f"score={self.score!r}, margin={self.margin!r}, matched_patterns={len(self.matched_patterns)})")
+
+# Column order of the category score matrices returned by classify_batch
+CATEGORY_COLUMNS = list(EmotionCategory)
+
+@dataclass
+class BatchClassification:
+	categories: List[EmotionCategory]
+	confidences: np.ndarray  # (N,)
+	margins: np.ndarray  # (N,) winning category score minus the runner-up
+	category_scores: np.ndarray  # (N, 5), columns in CATEGORY_COLUMNS order
+
+# Bits of PatternHits.flags: why a text skipped scoring, and which keyword boosts it triggers
+HIT_SKIPPED_SHORT = 1
+HIT_SKIPPED_NONSENSICAL = 2
+HIT_FILTERED = 4
+HIT_AMBIVALENT_KEYWORDS = 8
+HIT_AMBIVALENT_STRONG_KEYWORDS = 16
+HIT_TRANSFORMATIVE_KEYWORDS = 32
+HIT_REFLECTIVE_KEYWORDS = 64
+
+# Every substring keyword_flags looks for
+BOOST_KEYWORDS = ("both", "and", "&", "adventure", "mistake", "terrible", "wonderful", "death", "taught", "showed",
+				  "made me", "forced me", "questioning", "find myself", "thinking", "wondering")
+
+# Characters on each side of a pattern hit that decide its context multiplier
+CONTEXT_CHARS = 20
+
+def keyword_flags(contains: Callable[[str], bool]) -> int:
+	"""HIT_*_KEYWORDS bits of a normalized text, given a test for whether it contains a keyword."""
+	flags = 0
+	if contains("both") and (contains("and") or contains("&")):
+		flags |= HIT_AMBIVALENT_KEYWORDS
+		if any(contains(word) for word in ["adventure", "mistake", "terrible", "wonderful"]):
+			flags |= HIT_AMBIVALENT_STRONG_KEYWORDS
+	if any(contains(word) for word in ["death", "taught", "showed", "made me", "forced me"]):
+		flags |= HIT_TRANSFORMATIVE_KEYWORDS
+	if contains("questioning") or (contains("find myself") and any(contains(word) for word in ["questioning", "thinking", "wondering"])):
+		flags |= HIT_REFLECTIVE_KEYWORDS
+	return flags
+
+@dataclass
+class PatternHits:
+	"""Everything classification takes from N texts: sparse pattern hits plus per-text flags."""
+	match_version: str  # Matching fingerprint of the pattern set that produced the hits
+	flags: np.ndarray  # (N,) HIT_* bits per text
+	rows: np.ndarray  # (hits,) text of every hit, in ascending order
+	patterns: np.ndarray  # (hits,) pattern index of every hit
+	context: np.ndarray  # (hits,) context multiplier of every hit
+
+	def __len__(self) -> int:
+		return len(self.flags)
+
+@dataclass(frozen=True)
+class ScoringParameters:
+	"""Tunable numbers that turn pattern hits into category scores; defaults are the built-in values."""
+	pattern_weights: np.ndarray  # (patterns,) weight of every pattern, in pattern set order
+	ambivalent_contrast_threshold: float = 0.3  # Hope and sorrow both above this boost ambivalence
+	ambivalent_contrast_factor: float = 1.5  # ...by the smaller of the two times this factor
+	strong_ambivalent_threshold: float = 0.8  # An ambivalent hit above this...
+	strong_ambivalent_factor: float = 2.0  # ...multiplies the ambivalent score by this factor
+	ambivalent_keyword_boost: float = 0.5  # "both ... and"
+	ambivalent_strong_keyword_boost: float = 0.8  # "both ... and" with adventure/mistake/terrible/wonderful
+	transformative_keyword_boost: float = 0.6  # death, taught, showed, made me, forced me
+	reflective_keyword_boost: float = 0.7  # questioning, find myself thinking/wondering
+
+@dataclass(frozen=True)
+class CompiledPatternSet:
+	"""Read-only compiled form of a pattern list, safe to share between threads and classifiers."""
+	version: str
+	match_version: str  # Fingerprint of what decides pattern hits; weights and categories excluded
+	patterns: Tuple[LinguisticPattern, ...]
+	engine: PatternEngine
+	columns: np.ndarray  # (patterns,) category column of every pattern
+	weights: np.ndarray  # (patterns, categories) weight of every pattern in its category column
 
 class AdvancedHopeSorrowClassifier:
-	def __init__(self):
+	"""
+	Pattern-based emotion classifier.
+	
+	The compiled pattern set is immutable and shared; the only mutable state,
+	per-speaker calibration and narrative arcs, lives in a SpeakerStateStore
+	behind per-speaker locks. One instance can serve concurrent requests.
+	"""
+	
+	# Compiled pattern sets shared by every instance, keyed by pattern set version
+	_pattern_sets: Dict[str, CompiledPatternSet] = {}
+	_pattern_sets_lock = threading.Lock()
+	# Normalizer for the default replacement tables, compiled once
+	text_normalizer = TextNormalizer()
+
+	def __init__(self, match_mode: Optional[str] = None, gap_tokens: Optional[int] = None,
+				 speaker_state: Optional[SpeakerStateStore] = None):
+		"""
+		Set up the pattern lists and the compiled matcher.
+		
+		Args:
+			match_mode: 'bounded' limits '.*' gaps to gap_tokens whitespace breaks, 'exact'
+				keeps them unbounded (defaults to PATTERN_MATCH_MODE)
+			gap_tokens: Max whitespace breaks a bounded gap crosses (defaults to PATTERN_GAP_TOKENS)
+			speaker_state: Store of speaker calibration and narrative arcs (defaults to the
+				store shared by all classifiers)
+		"""
+		config = get_config()
+		self.match_mode = (match_mode or config.get('PATTERN_MATCH_MODE') or "bounded").lower()
+		if self.match_mode not in PATTERN_MATCH_MODES:
+			raise ConfigurationError(f"Unknown PATTERN_MATCH_MODE '{self.match_mode}' (expected 'exact' or 'bounded')")
+		self.gap_tokens = config.get('PATTERN_GAP_TOKENS') if gap_tokens is None else gap_tokens
+		
 		self.hope_patterns = [
 			LinguisticPattern(r"\b(happy|joy|delighted|thrilled|excited|elated)\b", 0.9, EmotionCategory.HOPE, "Explicit happiness"),
 			LinguisticPattern(r"\b(will|going to|plan to|hope|dream|wish)\b", 0.8, EmotionCategory.HOPE, "Future-oriented language"),
@@ -149,45 +373,144 @@ class AdvancedHopeSorrowClassifier:
 			LinguisticPattern(r"\b(stories.*connected|meaningful life|live.*meaningful)\b", 0.8, EmotionCategory.REFLECTIVE_NEUTRAL, "Meaning-making")
 		]
 		
-		self.speaker_profiles = {}
-		self.narrative_arcs = {}
+		if speaker_state is None:
+			speaker_state = get_speaker_state_store(category.value for category in EmotionCategory)
+		self.speaker_state = speaker_state
+		self.pattern_set = self._compile_pattern_set(
+			self.hope_patterns + self.sorrow_patterns + self.transformative_patterns +
+			self.ambivalent_patterns + self.reflective_neutral_patterns
+		)
+
+	@property
+	def all_patterns(self) -> Tuple[LinguisticPattern, ...]:
+		return self.pattern_set.patterns
+
+	@property
+	def pattern_engine(self) -> PatternEngine:
+		return self.pattern_set.engine
+
+	@property
+	def pattern_set_version(self) -> str:
+		return self.pattern_set.version
+
+	@property
+	def match_version(self) -> str:
+		return self.pattern_set.match_version
+
+	@property
+	def pattern_columns(self) -> np.ndarray:
+		return self.pattern_set.columns
+
+	@property
+	def pattern_weights(self) -> np.ndarray:
+		return self.pattern_set.weights
+
+	def _compile_pattern_set(self, patterns: List[LinguisticPattern]) -> CompiledPatternSet:
+		"""Return the shared compiled set for these patterns, compiling it on first use."""
+		version = self._compute_pattern_set_version(patterns)
+		with self._pattern_sets_lock:
+			if version not in self._pattern_sets:
+				engine = PatternEngine([
+					bound_gaps(pattern.pattern, self.gap_tokens) if self.match_mode == "bounded" else pattern.pattern
+					for pattern in patterns
+				])
+				columns = np.array([CATEGORY_COLUMNS.index(pattern.category) for pattern in patterns], dtype=np.int64)
+				weights = np.zeros((len(patterns), len(CATEGORY_COLUMNS)))
+				weights[np.arange(len(patterns)), columns] = [pattern.weight for pattern in patterns]
+				columns.flags.writeable = False
+				weights.flags.writeable = False
+				self._pattern_sets[version] = CompiledPatternSet(
+					version, self._compute_match_version(patterns), tuple(patterns), engine, columns, weights
+				)
+			return self._pattern_sets[version]
+
+	def _compute_pattern_set_version(self, patterns: List[LinguisticPattern]) -> str:
+		"""Fingerprint the pattern lists so cached results can be tied to the patterns that produced them."""
+		digest = hashlib.sha256()
+		digest.update(f"{self.match_mode}:{self.gap_tokens if self.match_mode == 'bounded' else ''}\x1e".encode("utf-8"))
+		for phrase, replacement in self.text_normalizer.replacements.items():
+			digest.update(f"{phrase}\x1f{replacement}\x1e".encode("utf-8"))
+		for pattern in patterns:
+			digest.update(f"{pattern.pattern}\x1f{pattern.weight}\x1f{pattern.category.value}\x1f{pattern.description}\x1e".encode("utf-8"))
+		return f"{CLASSIFIER_LOGIC_VERSION}-{digest.hexdigest()[:16]}"
+
+	def _compute_match_version(self, patterns: List[LinguisticPattern]) -> str:
+		"""Fingerprint what decides pattern hits, so stored hits outlive weight and boost tuning."""
+		digest = hashlib.sha256()
+		digest.update(f"{self.match_mode}:{self.gap_tokens if self.match_mode == 'bounded' else ''}\x1e".encode("utf-8"))
+		for phrase, replacement in self.text_normalizer.replacements.items():
+			digest.update(f"{phrase}\x1f{replacement}\x1e".encode("utf-8"))
+		for pattern in patterns:
+			digest.update(f"{pattern.pattern}\x1e".encode("utf-8"))
+		return f"{CLASSIFIER_LOGIC_VERSION}-{digest.hexdigest()[:16]}"
+
+	def scoring_parameters(self, pattern_weights: Optional[Dict[str, float]] = None, **overrides) -> ScoringParameters:
+		"""
+		Scoring parameters of this classifier, optionally tuned.
+		
+		Args:
+			pattern_weights: New weights by pattern description; other patterns keep theirs
+			**overrides: New values of other ScoringParameters fields
+			
+		Returns:
+			ScoringParameters for score_hits
+		"""
+		weights = np.array([pattern.weight for pattern in self.all_patterns], dtype=np.float64)
+		if pattern_weights:
+			indices = {pattern.description: index for index, pattern in enumerate(self.all_patterns)}
+			unknown = sorted(set(pattern_weights) - set(indices))
+			if unknown:
+				raise ValueError(f"Unknown pattern descriptions: {', '.join(unknown)}")
+			for description, weight in pattern_weights.items():
+				weights[indices[description]] = weight
+		weights.flags.writeable = False
+		return replace(ScoringParameters(weights), **overrides)
 
 	def _detect_patterns(self, text: str) -> List[Tuple[LinguisticPattern, float]]:
 		"""Detect linguistic patterns in the text and return matches with scores."""
-		matches = []
-		
-		all_patterns = (self.hope_patterns + self.sorrow_patterns + self.transformative_patterns + 
-						self.ambivalent_patterns + self.reflective_neutral_patterns)
-		
-		for pattern in all_patterns:
-			found = re.finditer(pattern.pattern, text.lower())
-			for match in found:
-				# Calculate context score based on surrounding words
-				start = max(0, match.start() - 20)
-				end = min(len(text), match.end() + 20)
-				context = text[start:end]
-				
-				# Adjust weight based on context
-				context_score = 1.0
-				if "not" in context or "never" in context:
-					context_score = -1.0
-				elif "very" in context or "really" in context:
-					context_score = 1.5
-				
-				score = pattern.weight * context_score
-				matches.append((pattern, score))
-		
-		return matches
+		return [
+			(self.all_patterns[index], self.all_patterns[index].weight * context_score)
+			for index, context_score in self._pattern_hits(text)
+		]
+
+	def _pattern_hits(self, text: str) -> List[Tuple[int, float]]:
+		"""(pattern index, context multiplier) for every pattern match in the text."""
+		# One pass over the lowercased text for the whole pattern set
+		return [
+			(index, self._context_score(text, match_start, match_end))
+			for index, match_start, match_end in self.pattern_engine.scan(text.lower())
+		]
+	
+	def _context_score(self, text: str, match_start: int, match_end: int) -> float:
+		"""Context multiplier of the match at text[match_start:match_end], from the words around it."""
+		# Calculate context score based on surrounding words
+		start = max(0, match_start - CONTEXT_CHARS)
+		end = min(len(text), match_end + CONTEXT_CHARS)
+		context = text[start:end]
+		
+		# Adjust weight based on context
+		if "not" in context or "never" in context:
+			return -1.0
+		if "very" in context or "really" in context:
+			return 1.5
+		return 1.0
 		
 	def _calculate_category_scores(self, matches: List[Tuple[LinguisticPattern, float]]) -> Dict[EmotionCategory, float]:
 		"""Calculate scores for each emotion category based on pattern matches."""
-		scores = {category: 0.0 for category in EmotionCategory}
-		
+		values = {category: [] for category in EmotionCategory}
 		for pattern, score in matches:
-			scores[pattern.category] += score
+			values[pattern.category].append(score)
 		
+		# Exact sums, so the scores don't depend on the order the matches were found in
+		scores = {category: math.fsum(category_values) for category, category_values in values.items()}
+		ambivalent = values[EmotionCategory.AMBIVALENT]
+		return self._combine_category_scores(scores, max(ambivalent) if ambivalent else None)
+	
+	def _combine_category_scores(self, scores: Dict[EmotionCategory, float],
+								 strongest_ambivalent: Optional[float]) -> Dict[EmotionCategory, float]:
+		"""Normalized category scores from the per-category match sums and the strongest ambivalent match, if any."""
 		# Special logic for ambivalent detection
-		scores = self._apply_ambivalent_logic(matches, scores)
+		scores = self._apply_ambivalent_logic(scores, strongest_ambivalent)
 		
 		# Normalize scores
 		total = sum(abs(score) for score in scores.values())
@@ -196,7 +519,7 @@ class AdvancedHopeSorrowClassifier:
 		
 		return scores
 	
-	def _apply_ambivalent_logic(self, matches: List[Tuple[LinguisticPattern, float]], scores: Dict[EmotionCategory, float]) -> Dict[EmotionCategory, float]:
+	def _apply_ambivalent_logic(self, scores: Dict[EmotionCategory, float], strongest_ambivalent: Optional[float]) -> Dict[EmotionCategory, float]:
 		"""Apply special logic to detect ambivalence from contrasting emotions."""
 		hope_score = scores[EmotionCategory.HOPE]
 		sorrow_score = scores[EmotionCategory.SORROW]
@@ -206,25 +529,18 @@ class AdvancedHopeSorrowClassifier:
 			ambivalent_boost = min(hope_score, sorrow_score) * 1.5
 			scores[EmotionCategory.AMBIVALENT] += ambivalent_boost
 		
-		# Check for explicit ambivalent patterns
-		ambivalent_matches = [m for m in matches if m[0].category == EmotionCategory.AMBIVALENT]
-		if ambivalent_matches:
-			# Strong ambivalent patterns should dominate
-			max_ambivalent_score = max(m[1] for m in ambivalent_matches)
-			if max_ambivalent_score > 0.8:
-				scores[EmotionCategory.AMBIVALENT] *= 2.0
+		# Strong explicit ambivalent patterns should dominate
+		if strongest_ambivalent is not None and strongest_ambivalent > 0.8:
+			scores[EmotionCategory.AMBIVALENT] *= 2.0
 		
 		return scores
 		
 	def _detect_narrative_arc(self, speaker_id: str, current_category: EmotionCategory) -> float:
 		"""Track and analyze the narrative arc for a speaker."""
-		if speaker_id not in self.narrative_arcs:
-			self.narrative_arcs[speaker_id] = []
-		
-		self.narrative_arcs[speaker_id].append(current_category)
+		history = self.speaker_state.append_category(speaker_id, current_category.value)
 		
 		# Calculate narrative arc score based on recent history
-		recent_history = self.narrative_arcs[speaker_id][-5:]  # Last 5 entries
+		recent_history = [EmotionCategory(category) for category in history[-5:]]  # Last 5 entries
 		if len(recent_history) < 2:
 			return 0.0
 		
@@ -241,18 +557,16 @@ class AdvancedHopeSorrowClassifier:
 		
 	def _get_speaker_calibration(self, speaker_id: str) -> Dict[EmotionCategory, float]:
 		"""Get speaker-specific calibration factors."""
-		if speaker_id not in self.speaker_profiles:
-			self.speaker_profiles[speaker_id] = {
-				category: 1.0 for category in EmotionCategory
-			}
-		return self.speaker_profiles[speaker_id]
+		factors = self.speaker_state.calibration(speaker_id)
+		return {category: factors[category.value] for category in EmotionCategory}
 		
 	def classify_emotion(
 		self,
 		text: str,
 		sentiment_score: float,
 		speaker_id: str,
-		context_window: Optional[List[str]] = None
+		context_window: Optional[List[str]] = None,
+		features: Optional[UtteranceFeatures] = None
 	) -> ClassificationResult:
 		"""
 		Classify the emotional content of text using advanced linguistic analysis.
@@ -262,44 +576,85 @@ class AdvancedHopeSorrowClassifier:
 			sentiment_score: Base sentiment score from transformer/LLM (-1 to 1)
 			speaker_id: Unique identifier for the speaker
 			context_window: Optional list of previous utterances for context
+			features: Precomputed features of text, reused instead of derived again
 			
 		Returns:
 			ClassificationResult with category, confidence, and explanation
 		"""
+		features = UtteranceFeatures.of(text, features)
+		
 		# ENHANCED: Handle edge cases first
-		text_clean = text.strip()
+		text_clean = features.text_clean
 		
 		# Check for very short or nonsensical content
 		if len(text_clean) < 3:
-			return ClassificationResult(
-				category=EmotionCategory.REFLECTIVE_NEUTRAL,
-				confidence=0.1,
-				score=0.0,
-				matched_patterns=[],
-				explanation="Text too short for reliable emotion classification. Defaulting to neutral.",
-				timestamp=datetime.now()
-			)
+			return self._short_result()
 		
 		# Check for nonsensical patterns
-		if self._is_likely_nonsensical(text_clean):
-			return ClassificationResult(
-				category=EmotionCategory.REFLECTIVE_NEUTRAL,
-				confidence=0.2,
-				score=sentiment_score,
-				matched_patterns=[],
-				explanation=f"Content appears nonsensical or may be transcription error. Applying neutral classification with base sentiment score ({sentiment_score:.2f}).",
-				timestamp=datetime.now()
-			)
+		if features.is_nonsensical:
+			return self._nonsensical_result(sentiment_score)
 		
 		# ENHANCED: Normalize text for more consistent pattern matching
-		normalized_text = self._normalize_text_for_classification(text_clean)
+		normalized_text = features.normalized(self.text_normalizer)
 		
 		# Detect linguistic patterns on normalized text
-		matches = self._detect_patterns(normalized_text)
+		matches = [
+			(self.all_patterns[index], self.all_patterns[index].weight * context_score)
+			for index, context_score in features.pattern_hits(self)
+		]
 		
 		# Calculate category scores
 		category_scores = self._calculate_category_scores(matches)
 		
+		# Keyword boosts look at the normalized text, filtered content at the original
+		flags = keyword_flags(normalized_text.__contains__)
+		if "***" in text or "*" in text:
+			flags |= HIT_FILTERED
+		
+		return self._finish_classification(category_scores, flags, sentiment_score, speaker_id, context_window, matches)
+	
+	def _short_result(self) -> ClassificationResult:
+		"""Fixed neutral result of a text too short to classify."""
+		return ClassificationResult(
+			category=EmotionCategory.REFLECTIVE_NEUTRAL,
+			confidence=0.1,
+			score=0.0,
+			matched_patterns=[],
+			explanation="Text too short for reliable emotion classification. Defaulting to neutral.",
+			timestamp=datetime.now()
+		)
+	
+	def _nonsensical_result(self, sentiment_score: float) -> ClassificationResult:
+		"""Fixed neutral result of a text that looks like noise or a transcription error."""
+		return ClassificationResult(
+			category=EmotionCategory.REFLECTIVE_NEUTRAL,
+			confidence=0.2,
+			score=sentiment_score,
+			matched_patterns=[],
+			explanation=f"Content appears nonsensical or may be transcription error. Applying neutral classification with base sentiment score ({sentiment_score:.2f}).",
+			timestamp=datetime.now()
+		)
+	
+	def _finish_classification(
+		self,
+		category_scores: Dict[EmotionCategory, float],
+		flags: int,
+		sentiment_score: float,
+		speaker_id: str,
+		context_window: Optional[List[str]],
+		matches: Union[List[Tuple[LinguisticPattern, float]], Callable[[], List[Tuple[LinguisticPattern, float]]]]
+	) -> ClassificationResult:
+		"""
+		Turn normalized pattern category scores into the classification result.
+		
+		Args:
+			category_scores: Normalized category scores from the pattern matches
+			flags: HIT_* keyword and filtered-content bits of the text
+			sentiment_score: Base sentiment score (-1 to 1)
+			speaker_id: Speaker whose calibration (and narrative arc) apply
+			context_window: Optional list of previous utterances for context
+			matches: The pattern matches, or a callable building them (see ClassificationResult.deferred)
+		"""
 		# ENHANCED: Handle cases where no patterns are detected but we have strong sentiment
 		total_pattern_score = sum(abs(score) for score in category_scores.values())
 		if total_pattern_score == 0.0:  # No patterns detected
@@ -314,27 +669,24 @@ class AdvancedHopeSorrowClassifier:
 				category_scores[EmotionCategory.REFLECTIVE_NEUTRAL] = 1.0
 		
 		# ENHANCED: Apply special detection logic for high-priority patterns
-		text_lower = normalized_text.lower()
-		
 		# Check for high-priority ambivalent patterns first
-		if "both" in text_lower and ("and" in text_lower or "&" in text_lower):
-			ambivalent_boost = 0.5
-			if any(word in text_lower for word in ["adventure", "mistake", "terrible", "wonderful"]):
-				ambivalent_boost = 0.8
+		if flags & HIT_AMBIVALENT_KEYWORDS:
+			ambivalent_boost = 0.8 if flags & HIT_AMBIVALENT_STRONG_KEYWORDS else 0.5
 			category_scores[EmotionCategory.AMBIVALENT] += ambivalent_boost
 		
 		# Check for transformative patterns (learning from loss/pain)
-		if any(word in text_lower for word in ["death", "taught", "showed", "made me", "forced me"]):
+		if flags & HIT_TRANSFORMATIVE_KEYWORDS:
 			transformative_boost = 0.6
 			category_scores[EmotionCategory.TRANSFORMATIVE] += transformative_boost
 		
 		# Check for reflective patterns (philosophical questioning)
-		if "questioning" in text_lower or ("find myself" in text_lower and any(word in text_lower for word in ["questioning", "thinking", "wondering"])):
+		if flags & HIT_REFLECTIVE_KEYWORDS:
 			reflective_boost = 0.7
 			category_scores[EmotionCategory.REFLECTIVE_NEUTRAL] += reflective_boost
 		
 		# ENHANCED: Detect filtered profanity/NSFW content
-		if "***" in text or "*" in text:  # Filtered content detected
+		filtered = bool(flags & HIT_FILTERED)
+		if filtered:  # Filtered content detected
 			# This indicates inappropriate content was filtered by AssemblyAI
 			# Such content is typically negative/harmful, so classify as sorrow or neutral
 			if sentiment_score < -0.3:  # Negative sentiment + filtered content = sorrow
@@ -353,15 +705,17 @@ class AdvancedHopeSorrowClassifier:
 			category_scores[EmotionCategory.HOPE] *= 1.3    # Reduced from 1.5
 			category_scores[EmotionCategory.SORROW] *= 0.7  # Reduced penalty
 		
-		# Apply speaker calibration
-		calibration = self._get_speaker_calibration(speaker_id)
-		for category in category_scores:
-			category_scores[category] *= calibration[category]
-		
-		# Consider narrative arc
-		if context_window:
-			narrative_score = self._detect_narrative_arc(speaker_id, max(category_scores.items(), key=lambda x: x[1])[0])
-			category_scores[EmotionCategory.TRANSFORMATIVE] += narrative_score
+		# Calibration and narrative arc read and update the speaker's state as one step
+		with self.speaker_state.locked(speaker_id):
+			# Apply speaker calibration
+			calibration = self._get_speaker_calibration(speaker_id)
+			for category in category_scores:
+				category_scores[category] *= calibration[category]
+			
+			# Consider narrative arc
+			if context_window:
+				narrative_score = self._detect_narrative_arc(speaker_id, max(category_scores.items(), key=lambda x: x[1])[0])
+				category_scores[EmotionCategory.TRANSFORMATIVE] += narrative_score
 		
 		# ENHANCED: Determine final category with better thresholds
 		max_category = max(category_scores.items(), key=lambda x: x[1])
@@ -377,77 +731,236 @@ class AdvancedHopeSorrowClassifier:
 		if max_score > 1.0:  # Strong pattern match
 			confidence = min(0.98, confidence + 0.2)
 		
-		# Generate explanation
-		explanation = self._generate_explanation(final_category, matches, confidence, sentiment_score, category_scores, text)
-		
-		return ClassificationResult(
+		# The explanation is only generated if someone reads it
+		return ClassificationResult.deferred(
 			category=final_category,
 			confidence=confidence,
 			score=sentiment_score,
 			matched_patterns=matches,
-			explanation=explanation,
-			timestamp=datetime.now()
+			margin=margin,
+			raw_scores=category_scores,
+			explain=lambda result: self._generate_explanation(final_category, result.matched_patterns, confidence,
+															  sentiment_score, category_scores, filtered)
 		)
 		
-	def _is_likely_nonsensical(self, text: str) -> bool:
+	def classify_batch(
+		self,
+		texts: List[str],
+		sentiment_scores,
+		speaker_ids: Optional[List[Optional[str]]] = None,
+		features: Optional[List[Optional[UtteranceFeatures]]] = None
+	) -> BatchClassification:
 		"""
-		Check if text appears to be nonsensical or likely transcription error.
+		Classify many texts at once, scoring categories as array operations.
+		
+		The texts are scanned once by extract_hits; score_hits then puts the
+		hits into a sparse (text, pattern) matrix of context multipliers,
+		multiplies it by the pattern weights and applies the ambivalent boost,
+		normalization, keyword boosts, sentiment influence and speaker
+		calibration to the whole (N, 5) score matrix. Categories and
+		confidences match classify_emotion without a context window. Matched
+		patterns and explanations are not built.
 		
 		Args:
-			text: The text to analyze
+			texts: Texts to classify
+			sentiment_scores: Base sentiment score per text (-1 to 1)
+			speaker_ids: Speaker per text (None entries and a missing list mean "unknown")
+			features: Optional precomputed UtteranceFeatures per text
 			
 		Returns:
-			bool: True if content appears nonsensical
+			BatchClassification with per-text categories, confidences, margins and the score matrix
+		"""
+		count = len(texts)
+		speaker_ids = list(speaker_ids) if speaker_ids is not None else [None] * count
+		if len(speaker_ids) != count:
+			raise ValueError(f"Expected {count} speaker ids, got {len(speaker_ids)}")
+		hits = self.extract_hits(texts, features)
+		
+		# Speaker calibration, one row of factors per text
+		calibrations = {}
+		for speaker_id in speaker_ids:
+			speaker_id = speaker_id or "unknown"
+			if speaker_id not in calibrations:
+				calibration = self._get_speaker_calibration(speaker_id)
+				calibrations[speaker_id] = [calibration[category] for category in CATEGORY_COLUMNS]
+		calibration = np.array([calibrations[speaker_id or "unknown"] for speaker_id in speaker_ids]).reshape(count, len(CATEGORY_COLUMNS))
+		
+		return self.score_hits(hits, sentiment_scores, calibration)
+		
+	def extract_hits(self, texts: List[str], features: Optional[List[Optional[UtteranceFeatures]]] = None) -> PatternHits:
 		"""
-		text_lower = text.lower().strip()
-		words = text_lower.split()
-		
-		# Very short single words that aren't common speech
-		if len(words) == 1 and len(text_lower) < 4:
-			common_short_words = ['yes', 'no', 'ok', 'hi', 'bye', 'wow', 'oh', 'ah', 'um', 'uh', 'you']
-			if text_lower not in common_short_words:
-				return True
-		
-		# Repetitive patterns (like "la la la", "tick tock tick tock")
-		if len(words) >= 3:
-			# Check for repetitive patterns - but only if words are actually repeated
-			unique_words = set(words)
+		Run the patterns and keyword checks over texts, without scoring them.
+		
+		The result depends only on the texts and match_version, so it can be
+		stored and scored again under other ScoringParameters (see score_hits).
+		
+		Args:
+			texts: Texts to scan
+			features: Optional precomputed UtteranceFeatures per text
 			
-			# Case 1: Very few unique words repeated many times (like "la la la la")
-			if len(unique_words) <= 2 and len(words) >= 4:
-				return True
+		Returns:
+			PatternHits of the texts
+		"""
+		count = len(texts)
+		features = list(features) if features is not None else [None] * count
+		if len(features) != count:
+			raise ValueError(f"Expected {count} feature sets, got {len(features)}")
+		
+		flags = np.zeros(count, dtype=np.uint8)
+		hit_rows, hit_patterns, hit_context = [], [], []
+		for row, (text, text_features) in enumerate(zip(texts, features)):
+			text_features = UtteranceFeatures.of(text, text_features)
+			if len(text_features.text_clean) < 3:
+				flags[row] = HIT_SKIPPED_SHORT
+				continue
+			if text_features.is_nonsensical:
+				flags[row] = HIT_SKIPPED_NONSENSICAL
+				continue
 			
-			# Case 2: Moderate repetition with simple words (like "tick tock tick tock la la la")
-			if len(unique_words) <= 3 and len(words) >= 6:
-				# Check if most words are repeated
-				word_counts = {}
-				for word in words:
-					word_counts[word] = word_counts.get(word, 0) + 1
-				
-				# If any word appears 3+ times, it's likely nonsensical
-				max_repetitions = max(word_counts.values())
-				if max_repetitions >= 3:
-					return True
-		
-		# Check for patterns that suggest noise/nonsense
-		nonsense_patterns = [
-			r'^[a-z]{1,3}\.{3,}$',  # Single letters with dots like "a..."
-			r'^[a-z\s]{1,10}\.$',   # Very short with just a period
-			r'^[^a-zA-Z\s]*$',      # No letters at all (symbols only)
-			r'^[a-z]\s[a-z]\s[a-z](\s[a-z])*$',  # FIXED: Only single letters separated by spaces (like "a b c d")
-		]
+			normalized_text = text_features.normalized(self.text_normalizer)
+			for index, context_score in text_features.pattern_hits(self):
+				hit_rows.append(row)
+				hit_patterns.append(index)
+				hit_context.append(context_score)
+			
+			# Keyword boosts, as in classify_emotion
+			row_flags = keyword_flags(normalized_text.__contains__)
+			if "*" in text:
+				row_flags |= HIT_FILTERED
+			flags[row] = row_flags
+		
+		return PatternHits(
+			match_version=self.match_version,
+			flags=flags,
+			rows=np.asarray(hit_rows, dtype=np.int64),
+			patterns=np.asarray(hit_patterns, dtype=np.int64),
+			context=np.asarray(hit_context, dtype=np.float64)
+		)
 		
-		import re
-		for pattern in nonsense_patterns:
-			if re.match(pattern, text_lower):
-				return True
+	def score_hits(
+		self,
+		hits: PatternHits,
+		sentiment_scores,
+		calibration: Optional[np.ndarray] = None,
+		parameters: Optional[ScoringParameters] = None
+	) -> BatchClassification:
+		"""
+		Score extracted pattern hits as array operations over all texts at once.
+		
+		Args:
+			hits: PatternHits from extract_hits (or loaded from storage)
+			sentiment_scores: Base sentiment score per text (-1 to 1)
+			calibration: Optional (N, 5) speaker calibration factors, columns in CATEGORY_COLUMNS order
+			parameters: Weights and boosts to score with (defaults to this classifier's)
+			
+		Returns:
+			BatchClassification with per-text categories, confidences, margins and the score matrix
+		"""
+		if hits.match_version != self.match_version:
+			raise ValueError(f"Pattern hits were extracted by pattern set {hits.match_version}, not {self.match_version}")
+		parameters = parameters or self.scoring_parameters()
+		if len(parameters.pattern_weights) != len(self.all_patterns):
+			raise ValueError(f"Expected {len(self.all_patterns)} pattern weights, got {len(parameters.pattern_weights)}")
+		count = len(hits)
+		sentiment = np.asarray(sentiment_scores, dtype=np.float64).reshape(-1)
+		if len(sentiment) != count:
+			raise ValueError(f"Expected {count} sentiment scores, got {len(sentiment)}")
+		
+		hope, sorrow, transformative, ambivalent, neutral = (CATEGORY_COLUMNS.index(category) for category in (
+			EmotionCategory.HOPE, EmotionCategory.SORROW, EmotionCategory.TRANSFORMATIVE,
+			EmotionCategory.AMBIVALENT, EmotionCategory.REFLECTIVE_NEUTRAL
+		))
+		flags = hits.flags
+		
+		# Sparse hit matrix (COO triplets of context multipliers) times the pattern weights, per category column
+		hit_columns = self.pattern_columns[hits.patterns]
+		hit_scores = hits.context * parameters.pattern_weights[hits.patterns]
+		scores = np.zeros((count, len(CATEGORY_COLUMNS)))
+		np.add.at(scores, (hits.rows, hit_columns), hit_scores)
+		
+		# Contrasting hope and sorrow boost ambivalence; a strong ambivalent pattern doubles it
+		threshold = parameters.ambivalent_contrast_threshold
+		contrast = (scores[:, hope] > threshold) & (scores[:, sorrow] > threshold)
+		scores[:, ambivalent] += np.where(contrast, np.minimum(scores[:, hope], scores[:, sorrow]) * parameters.ambivalent_contrast_factor, 0.0)
+		strongest_ambivalent = np.full(count, -np.inf)
+		ambivalent_hits = hit_columns == ambivalent
+		np.maximum.at(strongest_ambivalent, hits.rows[ambivalent_hits], hit_scores[ambivalent_hits])
+		scores[strongest_ambivalent > parameters.strong_ambivalent_threshold, ambivalent] *= parameters.strong_ambivalent_factor
+		
+		# Normalize rows by their absolute total
+		totals = np.abs(scores).sum(axis=1)
+		scored = totals > 0
+		scores[scored] /= totals[scored, None]
+		
+		# No patterns: base categories from the sentiment score
+		unscored = ~scored
+		negative, positive = unscored & (sentiment < -0.5), unscored & (sentiment > 0.5)
+		scores[negative, sorrow], scores[negative, neutral] = 0.8, 0.2
+		scores[positive, hope], scores[positive, neutral] = 0.8, 0.2
+		scores[unscored & ~negative & ~positive, neutral] = 1.0
+		
+		# Keyword boosts
+		both_and = (flags & HIT_AMBIVALENT_KEYWORDS) > 0
+		scores[both_and, ambivalent] += np.where(
+			(flags[both_and] & HIT_AMBIVALENT_STRONG_KEYWORDS) > 0,
+			parameters.ambivalent_strong_keyword_boost, parameters.ambivalent_keyword_boost
+		)
+		scores[(flags & HIT_TRANSFORMATIVE_KEYWORDS) > 0, transformative] += parameters.transformative_keyword_boost
+		scores[(flags & HIT_REFLECTIVE_KEYWORDS) > 0, neutral] += parameters.reflective_keyword_boost
+		
+		# Filtered profanity: sorrow with negative sentiment, otherwise neutral; hope is penalized
+		filtered = (flags & HIT_FILTERED) > 0
+		filtered_negative, filtered_other = filtered & (sentiment < -0.3), filtered & ~(sentiment < -0.3)
+		scores[filtered_negative, sorrow] += 0.9
+		scores[filtered_negative, hope] *= 0.1
+		scores[filtered_other, neutral] += 0.8
+		scores[filtered_other, hope] *= 0.2
+		
+		# Only very strong sentiment shifts hope and sorrow
+		very_negative, very_positive = sentiment < -0.7, sentiment > 0.7
+		scores[very_negative, sorrow] *= 1.3
+		scores[very_negative, hope] *= 0.7
+		scores[very_positive, hope] *= 1.3
+		scores[very_positive, sorrow] *= 0.7
+		
+		if calibration is not None:
+			scores *= np.asarray(calibration, dtype=np.float64).reshape(count, len(CATEGORY_COLUMNS))
+		
+		# Winner, margin over the runner-up and confidence
+		winners = scores.argmax(axis=1)
+		ranked = np.sort(scores, axis=1)
+		max_scores = ranked[:, -1]
+		margins = max_scores - ranked[:, -2]
+		confidences = np.minimum(0.95, np.maximum(0.1, max_scores + margins * 0.3))
+		strong = max_scores > 1.0
+		confidences[strong] = np.minimum(0.98, confidences[strong] + 0.2)
+		
+		# Short and nonsensical texts keep their fixed neutral result
+		short = (flags & HIT_SKIPPED_SHORT) > 0
+		skipped = short | ((flags & HIT_SKIPPED_NONSENSICAL) > 0)
+		scores[skipped] = 0.0
+		margins[skipped] = 0.0
+		confidences[skipped] = np.where(short[skipped], 0.1, 0.2)
+		winners[skipped] = neutral
+		
+		return BatchClassification(
+			categories=[CATEGORY_COLUMNS[column] for column in winners],
+			confidences=confidences,
+			margins=margins,
+			category_scores=scores
+		)
 		
-		# Check for excessive punctuation or symbols
-		non_alpha_count = sum(1 for char in text if not char.isalpha() and not char.isspace())
-		if len(text) > 0 and non_alpha_count / len(text) > 0.5:  # More than 50% non-alphabetic
-			return True
+	def _is_likely_nonsensical(self, text: str) -> bool:
+		"""
+		Check if text appears to be nonsensical or likely transcription error.
 		
-		return False
+		Args:
+			text: The text to analyze
+			
+		Returns:
+			bool: True if content appears nonsensical
+		"""
+		return UtteranceFeatures(text).is_nonsensical
 		
 	def _generate_explanation(
 		self,
@@ -456,7 +969,7 @@ class AdvancedHopeSorrowClassifier:
 		confidence: float,
 		sentiment_score: float,
 		category_scores: Dict[EmotionCategory, float],
-		original_text: str = ""
+		filtered: bool = False
 	) -> str:
 		"""Generate a detailed explanation of the classification."""
 		explanation_parts = []
@@ -517,69 +1030,28 @@ class AdvancedHopeSorrowClassifier:
 			explanation_parts.append("Focuses on grief, loss, or regret")
 		
 		# ENHANCED: Add note about filtered content if detected
-		if "***" in original_text or "*" in original_text:
+		if filtered:
 			explanation_parts.append("Note: Inappropriate content was filtered by AssemblyAI content safety")
 		
 		return " | ".join(explanation_parts)
 		
 	def update_speaker_profile(self, speaker_id: str, category: EmotionCategory, accuracy: float):
 		"""Update speaker profile based on feedback."""
-		if speaker_id not in self.speaker_profiles:
-			self.speaker_profiles[speaker_id] = {
-				cat: 1.0 for cat in EmotionCategory
-			}
-		
 		# Adjust calibration factor based on accuracy
-		self.speaker_profiles[speaker_id][category] *= (1.0 + (accuracy - 0.5))
+		self.speaker_state.scale_calibration(speaker_id, category.value, 1.0 + (accuracy - 0.5))
 		
 	def _normalize_text_for_classification(self, text: str) -> str:
 		"""
 		Normalize text to reduce classification variance from minor differences.
 		
+		Lowercases, fixes common transcription errors, converts key reflective
+		verbs from past to present tense and collapses whitespace, in one scan
+		(see text_normalizer for the replacement tables).
+		
 		Args:
 			text: The original text
 			
 		Returns:
 			str: Normalized text for more consistent pattern matching
 		"""
-		import re
-		
-		# Convert to lowercase for processing
-		normalized = text.lower()
-		
-		# Fix common transcription errors
-		transcription_fixes = {
-			r'\bof the past\b': 'over the past',  # Common transcription error
-			r'\bof my\b': 'over my',
-			r'\bof time\b': 'over time',
-			r'\bthru\b': 'through',
-			r'\bu\b': 'you',
-			r'\bur\b': 'your',
-			r'\bcuz\b': 'because',
-		}
-		
-		for pattern, replacement in transcription_fixes.items():
-			normalized = re.sub(pattern, replacement, normalized)
-		
-		# Normalize tense variations for more consistent classification
-		# Convert past tense to present tense for key reflective verbs
-		tense_normalizations = {
-			r'\brealized\b': 'realize',
-			r'\blearned\b': 'learn', 
-			r'\bunderstood\b': 'understand',
-			r'\brecognized\b': 'recognize',
-			r'\bdiscovered\b': 'discover',
-			r'\bfound\b': 'find',
-			r'\bthought\b': 'think',
-			r'\bfelt\b': 'feel',
-			r'\bsaw\b': 'see',
-			r'\bknew\b': 'know'
-		}
-		
-		for pattern, replacement in tense_normalizations.items():
-			normalized = re.sub(pattern, replacement, normalized)
-		
-		# Remove extra whitespace
-		normalized = re.sub(r'\s+', ' ', normalized).strip()
-		
-		return normalized
+		return self.text_normalizer.normalize(text)
@@ -0,0 +1,324 @@
+"""
+Inference backends for the transformer emotion model.
+
+A backend takes padded tokenizer output and returns an (N, num_labels)
+matrix of emotion probabilities, and on request the (N, hidden_size)
+mean-pooled final hidden states from the same forward pass.
+SentimentAnalyzer picks one through the SENTIMENT_BACKEND configuration key.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification
+
+from ...core.exceptions import ConfigurationError, AnalysisError
+
+try:
+	import onnxruntime as ort
+	ONNX_AVAILABLE = True
+except ImportError:
+	ONNX_AVAILABLE = False
+
+# Max absolute difference in probabilities accepted between ONNX and PyTorch
+ONNX_TOLERANCE = 1e-4
+
+# Padded sequence lengths the TorchScript backend traces a graph for
+TORCHSCRIPT_BUCKETS = (32, 64, 128, 256, 512)
+
+# Bumped whenever the outputs of exported ONNX/TorchScript graphs change, so stale artifacts are re-exported
+EXPORT_FORMAT_VERSION = 2
+
+# Sentences used to check an exported graph against the PyTorch model
+_VERIFICATION_TEXTS = [
+	"I will achieve my dreams and make a better future for myself.",
+	"I lost everything I worked for and it's all gone now.",
+	"Hello",
+]
+
+class TorchBackend:
+	"""Runs the model in PyTorch eager mode, optionally with int8 dynamic quantization."""
+
+	name = "torch"
+	tensor_type = "pt"
+
+	def __init__(self, model_name: str, device: str, quantize: bool = False):
+		self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+		self.model.eval()
+		self.num_labels = self.model.config.num_labels
+		self.hidden_size = self.model.config.hidden_size
+		self.quantized = quantize
+
+		if quantize:
+			# Dynamic int8 kernels are CPU-only; weights of every Linear layer are
+			# stored as int8 and activations are quantized on the fly.
+			self.device = "cpu"
+			self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+			self.name = "torch-int8"
+		else:
+			self.device = device
+			self.model.to(self.device)
+
+	def predict_probabilities(self, inputs: Dict) -> np.ndarray:
+		"""Run one forward pass and return softmax probabilities."""
+		inputs = {key: val.to(self.device) for key, val in inputs.items()}
+		with torch.no_grad():
+			outputs = self.model(**inputs)
+		probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
+		return probs.cpu().numpy()
+
+	def predict_with_embeddings(self, inputs: Dict) -> Tuple[np.ndarray, np.ndarray]:
+		"""Run one forward pass and return softmax probabilities and pooled final hidden states."""
+		inputs = {key: val.to(self.device) for key, val in inputs.items()}
+		with torch.no_grad():
+			outputs = self.model(**inputs, output_hidden_states=True)
+		probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
+		pooled = _mean_pool(outputs.hidden_states[-1], inputs["attention_mask"])
+		return probs.cpu().numpy(), pooled.cpu().numpy()
+
+class _LogitsAndHidden(torch.nn.Module):
+	"""Wraps a Hugging Face classifier so tracing and export see plain (logits, last hidden state) outputs."""
+
+	def __init__(self, model):
+		super().__init__()
+		self.model = model
+
+	def forward(self, input_ids, attention_mask):
+		outputs = self.model(input_ids=input_ids, attention_mask=attention_mask, output_hidden_states=True)
+		return outputs.logits, outputs.hidden_states[-1]
+
+class TorchScriptBackend:
+	"""
+	Runs TorchScript graphs traced for a few fixed sequence-length buckets.
+
+	Inputs are padded up to the nearest bucket so every call hits a traced
+	graph; traced graphs are saved to disk and loaded on later starts. Inputs
+	longer than the largest bucket run on the eager model.
+	"""
+
+	name = "torchscript"
+	tensor_type = "pt"
+
+	def __init__(self, model_name: str, tokenizer, device: str, cache_dir: Path, buckets=TORCHSCRIPT_BUCKETS):
+		self.model_name = model_name
+		self.device = device
+		self.pad_token_id = tokenizer.pad_token_id
+		self.buckets = sorted(buckets)
+		# Traced graphs are tied to the torch version that produced them
+		self.cache_dir = (Path(cache_dir) /
+						  f"{_safe_model_name(model_name)}-torch{torch.__version__.split('+')[0]}-v{EXPORT_FORMAT_VERSION}")
+		self._eager = None
+
+		self.graphs = {}
+		for length in self.buckets:
+			path = self.cache_dir / f"len{length}.pt"
+			if not path.exists():
+				self._trace(length, path)
+			self.graphs[length] = torch.jit.load(str(path), map_location=self.device)
+			self.graphs[length].eval()
+		logits, hidden = self.graphs[self.buckets[0]](*self._example(self.buckets[0]))
+		self.num_labels = int(logits.shape[-1])
+		self.hidden_size = int(hidden.shape[-1])
+		print(f"TorchScript graphs ready for lengths {self.buckets} ({self.cache_dir})")
+
+	def predict_probabilities(self, inputs: Dict) -> np.ndarray:
+		"""Run one forward pass on the smallest fitting bucket graph and return softmax probabilities."""
+		logits, _, _ = self._run(inputs)
+		return torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
+
+	def predict_with_embeddings(self, inputs: Dict) -> Tuple[np.ndarray, np.ndarray]:
+		"""Run one forward pass and return softmax probabilities and pooled final hidden states."""
+		logits, hidden, attention_mask = self._run(inputs)
+		probs = torch.nn.functional.softmax(logits, dim=-1)
+		return probs.cpu().numpy(), _mean_pool(hidden, attention_mask).cpu().numpy()
+
+	def _run(self, inputs: Dict):
+		"""Forward pass on the smallest fitting bucket graph; returns (logits, hidden states, attention mask)."""
+		input_ids = inputs["input_ids"].to(self.device)
+		attention_mask = inputs["attention_mask"].to(self.device)
+		length = input_ids.shape[1]
+		bucket = next((b for b in self.buckets if b >= length), None)
+
+		with torch.no_grad():
+			if bucket is None:
+				logits, hidden = self._eager_model()(input_ids, attention_mask)
+			else:
+				padding = bucket - length
+				if padding:
+					input_ids = torch.nn.functional.pad(input_ids, (0, padding), value=self.pad_token_id)
+					attention_mask = torch.nn.functional.pad(attention_mask, (0, padding), value=0)
+				logits, hidden = self.graphs[bucket](input_ids, attention_mask)
+		return logits, hidden, attention_mask
+
+	def _eager_model(self):
+		"""Load the eager model on first use (only needed for tracing and oversized inputs)."""
+		if self._eager is None:
+			model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+			model.eval()
+			self._eager = _LogitsAndHidden(model).eval().to(self.device)
+		return self._eager
+
+	def _example(self, length: int):
+		"""Dummy (input_ids, attention_mask) of the given length for tracing."""
+		input_ids = torch.full((2, length), self.pad_token_id, dtype=torch.long, device=self.device)
+		input_ids[:, :4] = torch.arange(4, 8, device=self.device)
+		attention_mask = (input_ids != self.pad_token_id).long()
+		return input_ids, attention_mask
+
+	def _trace(self, length: int, path: Path):
+		"""Trace the eager model for one bucket and save the graph atomically."""
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+		print(f"Tracing {self.model_name} for sequence length {length}")
+		try:
+			with torch.no_grad():
+				graph = torch.jit.trace(self._eager_model(), self._example(length))
+			torch.jit.save(graph, str(tmp_path))
+			os.replace(tmp_path, path)
+		finally:
+			if tmp_path.exists():
+				tmp_path.unlink()
+
+class OnnxBackend:
+	"""Runs an exported ONNX graph with ONNX Runtime's CPU execution provider."""
+
+	name = "onnx"
+	tensor_type = "np"
+
+	def __init__(self, model_name: str, tokenizer, cache_dir: Path):
+		if not ONNX_AVAILABLE:
+			raise ConfigurationError("SENTIMENT_BACKEND=onnx requires the 'onnxruntime' package")
+
+		self.model_path = Path(cache_dir) / f"{_safe_model_name(model_name)}.v{EXPORT_FORMAT_VERSION}.onnx"
+		if not self.model_path.exists():
+			export_onnx_model(model_name, tokenizer, self.model_path)
+
+		self.session = ort.InferenceSession(str(self.model_path), providers=["CPUExecutionProvider"])
+		self.input_names = [graph_input.name for graph_input in self.session.get_inputs()]
+		outputs = {output.name: output for output in self.session.get_outputs()}
+		self.num_labels = outputs["logits"].shape[-1]
+		self.hidden_size = outputs["last_hidden_state"].shape[-1]
+
+	def predict_probabilities(self, inputs: Dict) -> np.ndarray:
+		"""Run one forward pass and return softmax probabilities."""
+		feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+		logits = self.session.run(["logits"], feed)[0]
+		return _softmax(logits)
+
+	def predict_with_embeddings(self, inputs: Dict) -> Tuple[np.ndarray, np.ndarray]:
+		"""Run one forward pass and return softmax probabilities and pooled final hidden states."""
+		feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+		logits, hidden = self.session.run(["logits", "last_hidden_state"], feed)
+		mask = feed["attention_mask"][:, :, None].astype(np.float32)
+		pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1.0)
+		return _softmax(logits), pooled.astype(np.float32)
+
+def create_backend(name: str, model_name: str, tokenizer, device: str, cache_dir: Optional[Path] = None,
+				   quantize: bool = False):
+	"""
+	Create the inference backend selected by name.
+
+	Args:
+		name: Backend name ('torch', 'torchscript' or 'onnx')
+		model_name: Hugging Face model identifier
+		tokenizer: Tokenizer for the model (used when exporting graphs)
+		device: Torch device for the eager and TorchScript backends
+		cache_dir: Directory for exported model artifacts
+		quantize: Apply int8 dynamic quantization (torch backend only)
+
+	Returns:
+		A backend exposing predict_probabilities(), predict_with_embeddings(),
+		num_labels, hidden_size and tensor_type
+	"""
+	name = (name or "torch").lower()
+	if quantize and name != "torch":
+		raise ConfigurationError(f"SENTIMENT_QUANTIZE is only supported by the torch backend, not '{name}'")
+	if name == "torch":
+		return TorchBackend(model_name, device, quantize=quantize)
+	if name == "torchscript":
+		return TorchScriptBackend(model_name, tokenizer, device, cache_dir or default_torchscript_cache_dir())
+	if name == "onnx":
+		return OnnxBackend(model_name, tokenizer, cache_dir or Path("data/models/onnx"))
+	raise ConfigurationError(f"Unknown SENTIMENT_BACKEND '{name}' (expected 'torch', 'torchscript' or 'onnx')")
+
+def backend_name(name: str, quantize: bool = False) -> str:
+	"""Name the backend create_backend(name, quantize=quantize) would report, without creating it."""
+	name = (name or "torch").lower()
+	return "torch-int8" if name == "torch" and quantize else name
+
+def default_torchscript_cache_dir() -> Path:
+	"""Directory next to the Hugging Face hub cache where traced graphs are kept."""
+	from huggingface_hub import constants
+	return Path(constants.HF_HUB_CACHE).parent / "torchscript"
+
+def export_onnx_model(model_name: str, tokenizer, model_path: Path):
+	"""
+	Export the model to ONNX once and verify it against PyTorch.
+
+	The graph is written to a temporary file and only moved into place after
+	its probabilities match the PyTorch model within ONNX_TOLERANCE, so other
+	processes never load a partial or mismatched export.
+	"""
+	model_path = Path(model_path)
+	model_path.parent.mkdir(parents=True, exist_ok=True)
+	tmp_path = model_path.with_suffix(f".{os.getpid()}.tmp")
+
+	print(f"Exporting {model_name} to ONNX: {model_path}")
+	model = AutoModelForSequenceClassification.from_pretrained(model_name)
+	model.eval()
+	# eval() on the wrapper too: export restores the wrapper's mode recursively afterwards
+	wrapped = _LogitsAndHidden(model).eval()
+	sample = tokenizer(_VERIFICATION_TEXTS, padding=True, return_tensors="pt")
+
+	try:
+		with torch.no_grad():
+			torch.onnx.export(
+				wrapped,
+				(sample["input_ids"], sample["attention_mask"]),
+				str(tmp_path),
+				input_names=["input_ids", "attention_mask"],
+				output_names=["logits", "last_hidden_state"],
+				dynamic_axes={
+					"input_ids": {0: "batch", 1: "sequence"},
+					"attention_mask": {0: "batch", 1: "sequence"},
+					"logits": {0: "batch"},
+					"last_hidden_state": {0: "batch", 1: "sequence"},
+				},
+				opset_version=14,
+				dynamo=False,
+			)
+			expected = torch.nn.functional.softmax(model(**sample).logits, dim=-1).numpy()
+
+		session = ort.InferenceSession(str(tmp_path), providers=["CPUExecutionProvider"])
+		actual = _softmax(session.run(["logits"], {
+			"input_ids": sample["input_ids"].numpy(),
+			"attention_mask": sample["attention_mask"].numpy(),
+		})[0])
+		max_diff = float(np.abs(expected - actual).max())
+		if max_diff > ONNX_TOLERANCE:
+			raise AnalysisError(f"ONNX export differs from PyTorch by {max_diff:.2e} (tolerance {ONNX_TOLERANCE:.0e})")
+
+		os.replace(tmp_path, model_path)
+		print(f"ONNX export verified (max probability difference {max_diff:.2e})")
+	finally:
+		if tmp_path.exists():
+			tmp_path.unlink()
+
+def _safe_model_name(model_name: str) -> str:
+	"""Turn a model identifier into a file-system friendly name."""
+	return re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name)
+
+def _mean_pool(hidden: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+	"""Average hidden states over the real (unpadded) tokens of each sequence."""
+	mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+	return (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1.0)
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+	"""Numerically stable softmax over the last axis."""
+	shifted = logits - logits.max(axis=-1, keepdims=True)
+	exp = np.exp(shifted)
+	return exp / exp.sum(axis=-1, keepdims=True)
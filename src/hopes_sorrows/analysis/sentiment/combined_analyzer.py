@@ -3,10 +3,23 @@ Combined Sentiment Analysis Module
 Combines LLM and Transformer analyses for more accurate emotion classification.
 """
 
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
 from enum import Enum
-from .sa_transformers import analyze_sentiment as analyze_sentiment_transformer
-from .sa_LLM import analyze_sentiment as analyze_sentiment_llm
+import numpy as np
+from .sa_transformers import (
+    analyze_sentiment as analyze_sentiment_transformer,
+    configured_model_identity,
+    EmotionMapping
+)
+from .sa_LLM import analyze_sentiment as analyze_sentiment_llm, Config as LLMConfig
+from .advanced_classifier import AdvancedHopeSorrowClassifier
+from .utterance_features import UtteranceFeatures
+from .result_cache import cached_analysis
+from ...core.config import get_config
 
 class CombinationStrategy(Enum):
     """Strategies for combining LLM and transformer analyses"""
@@ -19,16 +32,30 @@ class CombinationStrategy(Enum):
 class CombinedSentimentAnalyzer:
     """Combines LLM and Transformer sentiment analyses for improved accuracy"""
     
-    def __init__(self, strategy=CombinationStrategy.WEIGHTED_AVERAGE):
+    def __init__(self, strategy=CombinationStrategy.WEIGHTED_AVERAGE, cascade: Optional[bool] = None,
+                 cascade_margin: Optional[float] = None, audit_rate: Optional[float] = None):
+        config = get_config()
         self.strategy = strategy
         self.weights = {
             'transformer': 0.6,  # Transformer is faster and more consistent
             'llm': 0.4           # LLM provides deeper understanding but more variable
         }
+        
+        # Cascade: answer from the pattern classifier alone when its margin is decisive
+        self.cascade = config.get('CASCADE_ENABLED') if cascade is None else cascade
+        self.cascade_margin = config.get('CASCADE_MARGIN_THRESHOLD') if cascade_margin is None else cascade_margin
+        self.audit_rate = config.get('CASCADE_AUDIT_RATE') if audit_rate is None else audit_rate
+        self.lexical_classifier = AdvancedHopeSorrowClassifier()
+        self._sentiment_mapping = EmotionMapping()
+        self._stats_lock = threading.Lock()
+        self._auditor = None
+        self.cascade_stats = {'requests': 0, 'fast_path': 0, 'full_path': 0, 'audited': 0, 'audit_disagreements': 0}
+        self.recent_disagreements = deque(maxlen=50)
     
     def analyze(self, text: str, speaker_id: Optional[str] = None, 
                 context_window: Optional[List[str]] = None, 
-                use_llm: bool = True, verbose: bool = False) -> Dict:
+                use_llm: bool = True, verbose: bool = False, allow_fast_path: bool = True,
+                features: Optional[UtteranceFeatures] = None) -> Dict:
         """
         Perform combined sentiment analysis using both transformer and LLM.
         
@@ -38,15 +65,111 @@ class CombinedSentimentAnalyzer:
             context_window: Optional context for analysis
             use_llm: Whether to use LLM analysis (if False, returns transformer only)
             verbose: Whether to show detailed output
+            allow_fast_path: Let the cascade skip the models for decisive texts (when cascade is enabled)
+            features: Precomputed UtteranceFeatures of text, shared by every stage
             
         Returns:
             Combined analysis result with single emotion decision
         """
+        if self.cascade and allow_fast_path and not context_window:
+            fast_result = self._lexical_fast_path(text, speaker_id, features)
+            with self._stats_lock:
+                self.cascade_stats['requests'] += 1
+                self.cascade_stats['fast_path' if fast_result else 'full_path'] += 1
+            
+            if fast_result is not None:
+                if verbose:
+                    print(f"⚡ Lexical fast path: {fast_result['category']} (margin: {fast_result['lexical_margin']:.2f})")
+                if self.audit_rate > 0 and random.random() < self.audit_rate:
+                    self._submit_audit(text, speaker_id, use_llm, fast_result)
+                return fast_result
+        
+        return self._analyze_full(text, speaker_id, context_window, use_llm, verbose, features)
+    
+    def _lexical_fast_path(self, text: str, speaker_id: Optional[str],
+                           features: Optional[UtteranceFeatures] = None) -> Optional[Dict]:
+        """Classify with patterns only; return a result if the margin clears the threshold, else None."""
+        features = UtteranceFeatures.of(text, features)
+        text_clean = features.text_clean
+        # Filtered (***) content is scored from the model's sentiment, so it always takes the full path
+        if not text_clean or "*" in text_clean:
+            return None
+        
+        classification = self.lexical_classifier.classify_emotion(text_clean, 0.0, speaker_id or "unknown", features=features)
+        if not classification.matched_patterns or classification.margin < self.cascade_margin:
+            return None
+        
+        # Lexical sentiment: hope minus sorrow evidence over all positive category evidence
+        scores = classification.category_scores
+        total = sum(max(value, 0.0) for value in scores.values())
+        score = (scores['hope'] - scores['sorrow']) / total if total > 0 else 0.0
+        score = max(-1.0, min(1.0, score))
+        confidence = classification.confidence
+        label = str(self._sentiment_mapping.label_for(np.array([score]), np.array([confidence]))[0])
+        
+        return {
+            'score': score,
+            'label': label,
+            'category': classification.category.value,
+            'intensity': abs(score),
+            'confidence': confidence,
+            'classification_confidence': confidence,
+            'matched_patterns': classification.pattern_dicts,
+            'explanation': classification.explanation,
+            'analysis_source': 'lexical_fast_path',
+            'combination_strategy': 'cascade',
+            'lexical_margin': classification.margin,
+            'has_llm': False,
+            'transformer_category': None,
+            'llm_category': None,
+            'confidence_sources': {'transformer': None, 'llm': None},
+            'degraded': False
+        }
+    
+    def _submit_audit(self, text: str, speaker_id: Optional[str], use_llm: bool, fast_result: Dict):
+        """Re-run a sampled fast-path text through the full path in the background and compare."""
+        with self._stats_lock:
+            if self._auditor is None:
+                self._auditor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cascade-audit")
+        self._auditor.submit(self._audit, text, speaker_id, use_llm, fast_result)
+    
+    def _audit(self, text: str, speaker_id: Optional[str], use_llm: bool, fast_result: Dict):
+        try:
+            full_result = self._analyze_full(text, speaker_id, None, use_llm, False)
+        except Exception as e:
+            print(f"⚠️ Cascade audit failed: {e}")
+            return
+        
+        with self._stats_lock:
+            self.cascade_stats['audited'] += 1
+            if full_result['category'] != fast_result['category']:
+                self.cascade_stats['audit_disagreements'] += 1
+                self.recent_disagreements.append({
+                    'text': text,
+                    'fast_path': fast_result['category'],
+                    'full_path': full_result['category'],
+                    'margin': fast_result['lexical_margin']
+                })
+    
+    def get_cascade_stats(self) -> Dict:
+        """Fast-path counters plus the audit disagreement rate."""
+        with self._stats_lock:
+            stats = dict(self.cascade_stats)
+            stats['recent_disagreements'] = list(self.recent_disagreements)
+        stats['enabled'] = self.cascade
+        stats['margin_threshold'] = self.cascade_margin
+        stats['fast_path_rate'] = stats['fast_path'] / stats['requests'] if stats['requests'] else 0.0
+        stats['audit_disagreement_rate'] = stats['audit_disagreements'] / stats['audited'] if stats['audited'] else 0.0
+        return stats
+    
+    def _analyze_full(self, text: str, speaker_id: Optional[str], context_window: Optional[List[str]],
+                      use_llm: bool, verbose: bool, features: Optional[UtteranceFeatures] = None) -> Dict:
+        """Transformer (and optionally LLM) analysis combined by the configured strategy."""
         
         # Always get transformer analysis (fast and reliable)
         try:
             transformer_result = analyze_sentiment_transformer(
-                text, speaker_id, context_window, verbose=False
+                text, speaker_id, context_window, verbose=False, features=features
             )
             if verbose:
                 print(f"🤖 Transformer result: {transformer_result['category']} (confidence: {transformer_result['confidence']:.1%})")
@@ -60,7 +183,7 @@ class CombinedSentimentAnalyzer:
         if use_llm:
             try:
                 llm_result = analyze_sentiment_llm(
-                    text, speaker_id, context_window, api_key=None, verbose=False
+                    text, speaker_id, context_window, api_key=None, verbose=False, features=features
                 )
                 if verbose:
                     print(f"🧠 LLM result: {llm_result['category']} (confidence: {llm_result['confidence']:.1%})")
@@ -92,6 +215,9 @@ class CombinedSentimentAnalyzer:
             'transformer': transformer_result['confidence'],
             'llm': llm_result['confidence'] if llm_result else None
         }
+        # A failed sub-analysis is transient; such results are kept out of the result cache
+        final_result['degraded'] = ('error' in transformer_result or
+                                    (use_llm and (llm_result is None or 'error' in llm_result)))
         
         if verbose:
             self._print_combination_details(transformer_result, llm_result, final_result)
@@ -247,7 +373,8 @@ class CombinedSentimentAnalyzer:
             "category": "reflective_neutral",
             "intensity": 0.0,
             "confidence": 0.0,
-            "explanation": f"Analysis failed ({error_type}). Fallback neutral classification."
+            "explanation": f"Analysis failed ({error_type}). Fallback neutral classification.",
+            "error": error_type
         }
     
     def _print_combination_details(self, transformer_result: Dict, llm_result: Dict, final_result: Dict):
@@ -291,7 +418,9 @@ def get_combined_analyzer(strategy=CombinationStrategy.WEIGHTED_AVERAGE):
 
 def analyze_sentiment_combined(text: str, speaker_id: Optional[str] = None, 
                              context_window: Optional[List[str]] = None,
-                             use_llm: bool = True, verbose: bool = True) -> Dict:
+                             use_llm: bool = True, verbose: bool = True,
+                             allow_fast_path: bool = True,
+                             features: Optional[UtteranceFeatures] = None) -> Dict:
     """
     Analyze sentiment using combined LLM and transformer approach.
     
@@ -301,12 +430,37 @@ def analyze_sentiment_combined(text: str, speaker_id: Optional[str] = None,
         context_window: Optional context window
         use_llm: Whether to use LLM analysis
         verbose: Whether to show detailed output
+        allow_fast_path: Let the lexical cascade answer decisive texts (when CASCADE_ENABLED)
+        features: Precomputed UtteranceFeatures of text (built here when omitted)
+        
+    Results without a context window are served from the result cache
+    when RESULT_CACHE_ENABLED is set.
         
     Returns:
         Combined sentiment analysis result
     """
     analyzer = get_combined_analyzer()
-    return analyzer.analyze(text, speaker_id, context_window, use_llm, verbose)
+    if context_window:
+        return analyzer.analyze(text, speaker_id, context_window, use_llm, verbose, allow_fast_path, features)
+
+    # Keyed by the configured model, so a cache lookup (or a lexical fast path) never loads it
+    try:
+        model_name = configured_model_identity()
+    except Exception:
+        # No identity to key by (e.g. the inference server is down): analyze uncached, which degrades on errors
+        return analyzer.analyze(text, speaker_id, None, use_llm, verbose, allow_fast_path, features)
+    analyzer_type = f"combined:{analyzer.strategy.value}"
+    if use_llm:
+        model_name += f"+{LLMConfig.LLM_MODEL}"
+        analyzer_type += ":llm"
+    if analyzer.cascade and allow_fast_path:
+        analyzer_type += f":cascade@{analyzer.cascade_margin}"
+
+    return cached_analysis(
+        text, analyzer_type, model_name, analyzer.lexical_classifier.pattern_set_version,
+        lambda: analyzer.analyze(text, speaker_id, None, use_llm, verbose, allow_fast_path, features),
+        should_store=lambda r: not r.get('degraded')
+    )
 
 # Export main function
 __all__ = ['CombinedSentimentAnalyzer', 'CombinationStrategy', 'analyze_sentiment_combined'] 
\ No newline at end of file
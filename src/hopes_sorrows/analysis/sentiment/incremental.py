@@ -0,0 +1,287 @@
+"""
+Incremental classification of a growing transcript.
+
+classify_emotion normalizes and scans its whole text on every call, so
+re-classifying a live transcript each time words arrive costs time in
+proportion to everything said so far. ClassificationSession keeps what a
+classification derives from the text - normalized text, pattern hits,
+category sums, keyword flags and the statistics of the nonsense check -
+in two parts: a committed part that no later text can change, and a short
+tail derived again on every update.
+
+Committing relies on every derivation looking only a bounded distance
+ahead:
+
+- the normalizer rewrites phrases of a few words, so raw text up to a
+  whitespace run normalizes the same whatever follows, unless a
+  multi-word phrase crosses it;
+- in 'bounded' match mode a pattern attempt crosses at most a fixed
+  number of whitespace breaks (its gaps times PATTERN_GAP_TOKENS plus its
+  literal spaces, see bound_gaps), and a hit's context multiplier reads
+  CONTEXT_CHARS characters on either side.
+
+An update therefore normalizes only the raw tail and scans the normalized
+text from the hit frontier, which trails the committed text by that many
+breaks, so its cost depends on the delta, not on the transcript length.
+Category sums are kept as exact partial sums, and classify_emotion sums
+with math.fsum, so the result equals classify_emotion on the whole text
+(without a context window; the narrative arc is left to final
+utterances). In 'exact' match mode a '.*' gap can reach any distance, and
+the session classifies the whole text on every update instead.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .advanced_classifier import (
+	AdvancedHopeSorrowClassifier, ClassificationResult, EmotionCategory, BOOST_KEYWORDS, CONTEXT_CHARS, HIT_FILTERED,
+	keyword_flags
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Text made only of single letters, each followed by one whitespace character (the "a b c d" nonsense shape)
+_SINGLE_LETTERS = re.compile(r"(?:[a-z]\s)*")
+_SINGLE_LETTERS_END = re.compile(r"(?:[a-z]\s)*[a-z]")
+
+# A scanned hit: (pattern index, start, end, weighted score), positions in the scanned window
+ScoredHit = Tuple[int, int, int, float]
+
+def _add_exact(partials: List[float], value: float):
+	"""Add value to the exact sum held as non-overlapping partials (Shewchuk's algorithm, as in math.fsum)."""
+	i = 0
+	for partial in partials:
+		if abs(value) < abs(partial):
+			value, partial = partial, value
+		high = value + partial
+		low = partial - (high - value)
+		if low:
+			partials[i] = low
+			i += 1
+		value = high
+	partials[i:] = [value]
+
+class ClassificationSession:
+	"""Classifies one speaker's growing text, deriving only its tail again on each update."""
+
+	def __init__(self, classifier: Optional[AdvancedHopeSorrowClassifier] = None, speaker_id: str = "unknown"):
+		"""
+		Args:
+			classifier: Classifier whose patterns, scoring and speaker calibration to use (defaults to a new one)
+			speaker_id: Speaker whose text this session classifies
+		"""
+		self.classifier = classifier or AdvancedHopeSorrowClassifier()
+		self.speaker_id = speaker_id
+		self._exact = self.classifier.match_mode == "exact"
+		self._text = ""  # Whole text, only kept in exact match mode
+
+		replacements = self.classifier.text_normalizer.replacements
+		self._phrases = [phrase for phrase in replacements if any(char.isspace() for char in phrase)]
+		self._phrase_length = max((len(phrase) for phrase in replacements), default=0)
+		# Raw tokens left uncommitted: enough for any phrase to be complete before a split
+		self._keep_tokens = max((len(phrase.split()) for phrase in replacements), default=1) + 1
+		# Whitespace breaks one pattern attempt can cross: its bounded gaps and literal spaces
+		self._reach = max((
+			pattern.pattern.count(".*") * self.classifier.gap_tokens + pattern.pattern.count(" ") + pattern.pattern.count("\\s")
+			for pattern in self.classifier.all_patterns
+		), default=0)
+		self._keyword_overlap = max(len(word) for word in BOOST_KEYWORDS) - 1
+
+		# Raw text not committed yet, and statistics of the committed raw text
+		self._tail = ""
+		self._started = False  # Committed text has content, so the tail is not stripped at its start
+		self._clean_length = 0  # Committed characters from the first non-whitespace one
+		self._non_alpha = 0
+		self._tokens = 0
+		self._word_counts = Counter()
+		self._single_letters = True
+		self._filtered = False
+
+		# Committed normalized text from _offset on; keywords found before _offset (plus overlap)
+		self._normalized = ""
+		self._offset = 0
+		self._keywords = set()
+
+		# Hits starting before _frontier (a position in the normalized text) are committed
+		self._frontier = 0
+		self._next_start = [0] * len(self.classifier.all_patterns)
+		self._hits: Dict[int, List[float]] = {}  # Committed weighted scores per pattern index, in position order
+		self._partials = {category: [] for category in EmotionCategory}
+		self._strongest_ambivalent = None
+
+	def update(self, text: str, sentiment_score: float) -> ClassificationResult:
+		"""
+		Append text to the transcript and classify all of it.
+
+		Args:
+			text: New text, appended as is (including any separating whitespace); may be empty
+			sentiment_score: Base sentiment score of the whole transcript (-1 to 1)
+
+		Returns:
+			ClassificationResult equal to classify_emotion on the whole transcript
+		"""
+		if self._exact:
+			self._text += text
+			return self.classifier.classify_emotion(self._text, sentiment_score, self.speaker_id)
+
+		self._tail += text
+		self._filtered = self._filtered or "*" in text
+		if not self._started:
+			# Nothing committed yet: the tail is the whole text
+			result = self.classifier.classify_emotion(self._tail, sentiment_score, self.speaker_id)
+			self._commit_text()
+			return result
+
+		tail = self._tail.rstrip()
+		window = self._normalized + self.classifier.text_normalizer.normalize(tail)
+		hits = self._scan(window)
+		result = self._classify(tail, window, hits, sentiment_score)
+		self._commit_text()
+		self._commit_hits(hits)
+		return result
+
+	def _scan(self, window: str) -> List[ScoredHit]:
+		"""Hits starting at or after the frontier, in window = the normalized text from _offset on."""
+		classifier = self.classifier
+		patterns = classifier.all_patterns
+		offset = self._offset
+		return [
+			(index, start, end, patterns[index].weight * classifier._context_score(window, start, end))
+			for index, start, end in classifier.pattern_engine.scan(
+				window, self._frontier - offset, [max(position - offset, 0) for position in self._next_start]
+			)
+		]
+
+	def _classify(self, tail: str, window: str, hits: List[ScoredHit], sentiment_score: float) -> ClassificationResult:
+		"""Classification of the whole text from the committed state and the tail's hits."""
+		classifier = self.classifier
+		# Committed text is longer than the short-text limit, so only the nonsense check applies
+		if self._is_nonsensical(tail):
+			return classifier._nonsensical_result(sentiment_score)
+
+		patterns = classifier.all_patterns
+		tail_scores = {category: [] for category in EmotionCategory}
+		for index, _, _, score in hits:
+			tail_scores[patterns[index].category].append(score)
+		scores = {category: math.fsum(self._partials[category] + tail_scores[category]) for category in EmotionCategory}
+		strongest_ambivalent = max(
+			tail_scores[EmotionCategory.AMBIVALENT] + ([self._strongest_ambivalent] if self._strongest_ambivalent is not None else []),
+			default=None
+		)
+		category_scores = classifier._combine_category_scores(scores, strongest_ambivalent)
+
+		flags = keyword_flags(lambda word: word in self._keywords or word in window)
+		if self._filtered:
+			flags |= HIT_FILTERED
+
+		# The match list is only built if the result's matches are read
+		committed = {index: len(index_scores) for index, index_scores in self._hits.items()}
+
+		def collect_matches() -> List[Tuple]:
+			by_index = {index: self._hits[index][:count] for index, count in committed.items()}
+			for index, _, _, score in hits:
+				by_index.setdefault(index, []).append(score)
+			return [(patterns[index], score) for index in sorted(by_index) for score in by_index[index]]
+
+		return classifier._finish_classification(category_scores, flags, sentiment_score, self.speaker_id, None, collect_matches)
+
+	def _is_nonsensical(self, tail: str) -> bool:
+		"""UtteranceFeatures.is_nonsensical of the whole text, from the committed statistics and the stripped tail."""
+		lowered = tail.lower()
+		words = lowered.split()
+		count = self._tokens + len(words)
+
+		# Committed text and tail both hold words, so the single-word and single-token
+		# patterns can't apply, and the text is longer than the short-with-period pattern
+		if count >= 3:
+			word_counts = self._word_counts
+			unique_words = len(word_counts) + len(set(words).difference(word_counts))
+			if unique_words <= 2 and count >= 4:
+				return True
+			if unique_words <= 3 and count >= 6 and max((word_counts + Counter(words)).values()) >= 3:
+				return True
+			if self._single_letters and _SINGLE_LETTERS_END.fullmatch(lowered):
+				return True
+
+		non_alpha = self._non_alpha + sum(1 for char in tail if not char.isalpha() and not char.isspace())
+		return non_alpha / (self._clean_length + len(tail)) > 0.5
+
+	def _commit_text(self):
+		"""Move raw text whose normalization later text can't change from the tail into the committed statistics."""
+		tail = self._tail
+		content, end = len(tail) - len(tail.lstrip()), len(tail.rstrip())
+		starts = [match.end() for match in _WHITESPACE.finditer(tail) if match.end() < len(tail)]
+		# Latest token start with keep_tokens tokens after it, with no phrase across it
+		for split in reversed(starts[:len(starts) - self._keep_tokens + 1]):
+			if split <= content or end - split < self._phrase_length + 2:
+				continue
+			if not self._phrase_crosses(tail, split):
+				self._commit_raw(tail[:split])
+				self._tail = tail[split:]
+				return
+
+	def _phrase_crosses(self, text: str, split: int) -> bool:
+		"""Whether a multi-word normalizer phrase could run across text[split]."""
+		before = text[max(0, split - self._phrase_length):split].lower()
+		around = before + text[split:split + self._phrase_length].lower()
+		for phrase in self._phrases:
+			position = around.find(phrase)
+			while position != -1:
+				if position < len(before) < position + len(phrase):
+					return True
+				position = around.find(phrase, position + 1)
+		return False
+
+	def _commit_raw(self, piece: str):
+		"""Add a raw piece ending in whitespace to the committed statistics and normalized text."""
+		if not self._started:
+			piece = piece.lstrip()
+			self._started = True
+		self._clean_length += len(piece)
+		self._non_alpha += sum(1 for char in piece if not char.isalpha() and not char.isspace())
+		lowered = piece.lower()
+		words = lowered.split()
+		self._tokens += len(words)
+		self._word_counts.update(words)
+		self._single_letters = self._single_letters and _SINGLE_LETTERS.fullmatch(lowered) is not None
+		# The piece's whitespace run normalizes to one space whatever follows it
+		self._normalized += self.classifier.text_normalizer.normalize(piece) + " "
+
+	def _commit_hits(self, hits: List[ScoredHit]):
+		"""Commit the hits no later text can change, and forget normalized text the scan no longer reads."""
+		normalized = self._normalized
+		# An attempt starting before the frontier crosses at most reach breaks, so it ends inside the committed text
+		position = len(normalized)
+		for _ in range(self._reach + 2):
+			position = normalized.rfind(" ", 0, position)
+			if position < 0:
+				return
+		frontier = position + 1
+		# ...and so must the context its multiplier reads
+		for index, start, end, _ in hits:
+			if start < frontier and end + CONTEXT_CHARS > len(normalized):
+				frontier = start
+		if self._offset + frontier <= self._frontier:
+			return
+
+		patterns = self.classifier.all_patterns
+		for index, start, end, score in hits:
+			if start >= frontier:
+				continue
+			self._hits.setdefault(index, []).append(score)
+			category = patterns[index].category
+			_add_exact(self._partials[category], score)
+			if category == EmotionCategory.AMBIVALENT:
+				self._strongest_ambivalent = score if self._strongest_ambivalent is None else max(self._strongest_ambivalent, score)
+			self._next_start[index] = self._offset + max(end, start + 1)
+		self._frontier = self._offset + frontier
+
+		# Scans from the frontier read CONTEXT_CHARS before it; keywords in older text are remembered
+		drop = self._frontier - CONTEXT_CHARS - self._offset
+		if drop > 0:
+			dropped = normalized[:drop + self._keyword_overlap]
+			self._keywords.update(word for word in BOOST_KEYWORDS if word in dropped)
+			self._normalized = normalized[drop:]
+			self._offset += drop
@@ -0,0 +1,111 @@
+"""
+Client for the shared inference server.
+
+RemoteSentimentAnalyzer offers the parts of the SentimentAnalyzer interface
+used by analyze_sentiment and the combined analyzer, and forwards the work
+to the server at INFERENCE_URL.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+
+from ...core.exceptions import AnalysisError
+
+class RemoteSentimentAnalyzer:
+	"""SentimentAnalyzer stand-in that calls a running inference server."""
+
+	def __init__(self, base_url: str, timeout: float = 30.0):
+		"""
+		Set up the client; the server is first contacted when it is used.
+
+		Args:
+			base_url: Server URL, e.g. http://127.0.0.1:5055
+			timeout: Seconds to wait for each request
+		"""
+		self.base_url = base_url.rstrip("/")
+		self.timeout = timeout
+		self._session = requests.Session()
+		self._info = None
+		self._info_lock = threading.Lock()
+
+	@property
+	def model_name(self) -> str:
+		"""Hugging Face model the server runs."""
+		return self._server_info()["model_name"]
+
+	@property
+	def model_identity(self) -> str:
+		"""Model and backend name of the server's analyzer."""
+		return self._server_info()["model_identity"]
+
+	@property
+	def pattern_set_version(self) -> str:
+		"""Version of the server's classifier patterns."""
+		return self._server_info()["pattern_set_version"]
+
+	def _server_info(self) -> Dict:
+		"""The server's /info, fetched on first use and kept once it succeeds (raises AnalysisError while unreachable)."""
+		if self._info is None:
+			with self._info_lock:
+				if self._info is None:
+					info = self._request("GET", "/info")
+					print(f"Using inference server at {self.base_url} ({info['model_identity']})")
+					self._info = info
+		return self._info
+
+	def analyze(self, text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None,
+				return_embedding: bool = False, features=None) -> Dict:
+		"""Analyze one text on the server (features are derived there, so local ones are not sent)."""
+		return _decode_embedding(self._request("POST", "/analyze", {
+			"text": text,
+			"speaker_id": speaker_id,
+			"context_window": context_window,
+			"return_embedding": return_embedding,
+		}))
+
+	def analyze_batch(self, texts: List[str], speaker_ids: Optional[List[Optional[str]]] = None,
+					  batch_size: Optional[int] = None, return_embeddings: bool = False) -> List[Dict]:
+		"""Analyze many texts with one request."""
+		if speaker_ids is not None and len(speaker_ids) != len(texts):
+			raise ValueError("speaker_ids must have the same length as texts")
+		results = self._request("POST", "/analyze_batch", {
+			"texts": texts,
+			"speaker_ids": speaker_ids,
+			"batch_size": batch_size,
+			"return_embeddings": return_embeddings,
+		})["results"]
+		return [_decode_embedding(result) for result in results]
+
+	def embed(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+		"""Pooled final hidden states for texts, computed on the server."""
+		results = self.analyze_batch(texts, batch_size=batch_size, return_embeddings=True)
+		return np.stack([result["embedding"] for result in results]) if results else np.zeros((0, 0), dtype=np.float32)
+
+	def enable_micro_batching(self, *args, **kwargs):
+		"""Batching happens on the server."""
+
+	def disable_micro_batching(self):
+		"""Batching happens on the server."""
+
+	def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+		try:
+			response = self._session.request(method, self.base_url + path, json=payload, timeout=self.timeout)
+		except requests.RequestException as e:
+			raise AnalysisError(f"Inference server unreachable at {self.base_url}: {e}")
+
+		try:
+			body = response.json()
+		except ValueError:
+			body = {}
+		if response.status_code != 200:
+			raise AnalysisError(f"Inference server error ({response.status_code}): {body.get('error', response.text)}")
+		return body
+
+def _decode_embedding(result: Dict) -> Dict:
+	"""Turn a JSON embedding list back into a float32 array."""
+	if "embedding" in result:
+		result["embedding"] = np.asarray(result["embedding"], dtype=np.float32)
+	return result
@@ -0,0 +1,78 @@
+"""
+Standalone inference server hosting one SentimentAnalyzer per host.
+
+Web workers and scripts point INFERENCE_URL at this server instead of each
+loading their own copy of the model. Requests are served on threads, so
+concurrent /analyze calls are coalesced by the analyzer's micro-batcher.
+Start it with scripts/run_inference_server.py.
+"""
+
+import json
+from typing import Optional
+
+from flask import Flask, Response, request
+
+from .sa_transformers import SentimentAnalyzer, create_local_analyzer, warm_up_analyzer, get_model_status
+from .streaming import json_default
+
+def _json_response(payload, status: int = 200) -> Response:
+	return Response(json.dumps(payload, default=json_default), status=status, mimetype="application/json")
+
+def create_inference_app(analyzer: Optional[SentimentAnalyzer] = None, warm_up: bool = True) -> Flask:
+	"""
+	Create the inference server app.
+
+	Args:
+		analyzer: Analyzer to serve (defaults to a local model, regardless of INFERENCE_URL)
+		warm_up: Run warm-up batches before returning the app
+	"""
+	analyzer = analyzer or create_local_analyzer()
+	if warm_up:
+		warm_up_analyzer(analyzer=analyzer)
+
+	app = Flask(__name__)
+	app.analyzer = analyzer
+
+	@app.route('/info')
+	def info():
+		"""Model identity, used by clients for result-cache keys."""
+		return _json_response({
+			'model_name': analyzer.model_name,
+			'model_identity': analyzer.model_identity,
+			'pattern_set_version': analyzer.pattern_set_version,
+		})
+
+	@app.route('/health')
+	def health():
+		status = get_model_status()
+		return _json_response(status, 200 if status['ready'] or not warm_up else 503)
+
+	@app.route('/analyze', methods=['POST'])
+	def analyze():
+		data = request.get_json(force=True)
+		text = data.get('text')
+		if text is None:
+			return _json_response({'error': "'text' is required"}, 400)
+		try:
+			result = analyzer.analyze(text, data.get('speaker_id'), data.get('context_window'),
+									  return_embedding=bool(data.get('return_embedding')))
+		except Exception as e:
+			return _json_response({'error': str(e)}, 500)
+		return _json_response(result)
+
+	@app.route('/analyze_batch', methods=['POST'])
+	def analyze_batch():
+		data = request.get_json(force=True)
+		texts = data.get('texts')
+		if not isinstance(texts, list):
+			return _json_response({'error': "'texts' must be a list"}, 400)
+		try:
+			results = analyzer.analyze_batch(texts, data.get('speaker_ids'), data.get('batch_size'),
+											 return_embeddings=bool(data.get('return_embeddings')))
+		except ValueError as e:
+			return _json_response({'error': str(e)}, 400)
+		except Exception as e:
+			return _json_response({'error': str(e)}, 500)
+		return _json_response({'results': results})
+
+	return app
@@ -0,0 +1,117 @@
+"""
+Request-coalescing micro-batcher.
+
+Concurrent callers submit single items; one worker thread groups whatever
+arrives within a short window into a batch, makes a single batched call and
+hands every caller its own result through a future. Every future resolves:
+items still queued when the worker stops fail with MicroBatcherClosed.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Sequence
+
+_STOP = object()
+
+class MicroBatcherClosed(RuntimeError):
+	"""The micro-batcher was closed before (or while) an item was submitted."""
+
+class MicroBatcher:
+	"""Coalesces concurrent single-item calls into batched calls on one worker thread."""
+
+	def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]], max_batch_size: int = 16,
+				 max_wait_ms: float = 10.0, name: str = "micro-batcher"):
+		"""
+		Start the worker thread.
+
+		Args:
+			batch_fn: Called with a list of submitted items, must return one result per item
+			max_batch_size: Maximum number of items passed to a single batch_fn call
+			max_wait_ms: How long to wait for more items after the first one arrives
+			name: Name of the worker thread
+		"""
+		if max_batch_size < 1:
+			raise ValueError("max_batch_size must be at least 1")
+
+		self.batch_fn = batch_fn
+		self.max_batch_size = max_batch_size
+		self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+		self._queue = queue.Queue()
+		self._closed = False
+		self._lock = threading.Lock()  # Makes the closed check and the put atomic, so nothing is queued after _STOP
+		self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+		self._thread.start()
+
+	def submit(self, item: Any) -> Future:
+		"""Queue an item and return a future that resolves to its result."""
+		future = Future()
+		with self._lock:
+			if self._closed:
+				raise MicroBatcherClosed("MicroBatcher is closed")
+			self._queue.put((item, future))
+		return future
+
+	def close(self, timeout: float = None):
+		"""Stop the worker thread after the queued items have been processed."""
+		with self._lock:
+			if self._closed:
+				return
+			self._closed = True
+			self._queue.put(_STOP)
+		self._thread.join(timeout)
+
+	def _run(self):
+		"""Worker loop: block for the first item, then fill the batch until it is full or the wait expires."""
+		stopping = False
+		while not stopping:
+			entry = self._queue.get()
+			if entry is _STOP:
+				break
+
+			batch = [entry]
+			deadline = time.monotonic() + self.max_wait
+			while len(batch) < self.max_batch_size:
+				remaining = deadline - time.monotonic()
+				try:
+					entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+				except queue.Empty:
+					break
+				if entry is _STOP:
+					stopping = True
+					break
+				batch.append(entry)
+
+			self._process(batch)
+
+		self._fail_remaining()
+
+	def _fail_remaining(self):
+		"""Fail the futures of items left in the queue once the worker stops."""
+		while True:
+			try:
+				entry = self._queue.get_nowait()
+			except queue.Empty:
+				return
+			if entry is not _STOP and entry[1].set_running_or_notify_cancel():
+				entry[1].set_exception(MicroBatcherClosed("MicroBatcher closed before the item was processed"))
+
+	def _process(self, batch: List[tuple]):
+		"""Run batch_fn once and resolve every caller's future."""
+		pending = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+		if not pending:
+			return
+
+		try:
+			results = self.batch_fn([item for item, _ in pending])
+			if len(results) != len(pending):
+				raise RuntimeError(f"batch_fn returned {len(results)} results for {len(pending)} items")
+		except Exception as e:
+			for _, future in pending:
+				future.set_exception(e)
+			return
+
+		for (_, future), result in zip(pending, results):
+			future.set_result(result)
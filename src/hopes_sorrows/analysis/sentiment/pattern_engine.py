@@ -0,0 +1,219 @@
+"""
+Compiled single-pass matcher for the classifier's linguistic patterns.
+
+Every classifier pattern has the shape \\b(alt|alt|...)..., so a match can
+only start at a word where one of the literal prefixes of its first group
+starts. PatternEngine builds an inverted index from each prefix's anchor
+word (its first word) to the patterns it opens. Scanning tokenizes the
+text once and looks every token up in the index, so only the patterns
+anchored at a token are tried there, and the cost depends on what the
+text contains rather than on how many patterns exist.
+
+Python's re cannot return overlapping hits of different patterns from one
+alternation, so the candidate patterns are run individually, at their
+anchor positions, with re.finditer's non-overlapping leftmost rule
+replayed per pattern. Hits are identical to running re.finditer for every
+pattern in turn. Patterns without a usable literal prefix fall back to
+their own finditer scan.
+
+bound_gaps() rewrites the unbounded '.*' gaps between pattern words into a
+window that crosses at most N whitespace breaks. A '.*' gap retried from
+every anchor costs quadratic time on long texts, while a bounded gap costs
+a constant per anchor, so a whole scan stays linear in the text length.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# A pattern hit: (pattern index, start, end) in the scanned text
+PatternHit = Tuple[int, int, int]
+
+_LITERAL_RUN = re.compile(r"[\w' -]*")
+_WORD = re.compile(r"\w+")
+_QUANTIFIERS = "?*+{"
+
+# Rest of the current token, up to N whitespace breaks with the tokens after them, and the start of the next one
+_TOKEN_GAP = r"(?:\S*\s+){{0,{max_tokens}}}\S*"
+_LAZY_TOKEN_GAP = r"(?:\S*?\s+){{0,{max_tokens}}}?\S*?"
+
+def bound_gaps(pattern: str, max_tokens: int) -> str:
+	"""
+	Replace every unbounded '.*' (or lazy '.*?') gap in pattern with one crossing at most max_tokens whitespace breaks.
+
+	A gap of N breaks spans up to N - 1 whole words between the text around
+	it. Within that window the rewritten pattern matches the same texts as
+	the original (line breaks aside); greedy gaps may end earlier than '.*' did.
+	"""
+	if max_tokens < 0:
+		raise ValueError("max_tokens must be non-negative")
+	gap = _TOKEN_GAP.format(max_tokens=max_tokens)
+	lazy_gap = _LAZY_TOKEN_GAP.format(max_tokens=max_tokens)
+	result, i, in_class = [], 0, False
+	while i < len(pattern):
+		char = pattern[i]
+		if char == "\\":
+			result.append(pattern[i:i + 2])
+			i += 2
+			continue
+		if in_class:
+			in_class = char != "]"
+		elif char == "[":
+			in_class = True
+		elif pattern.startswith(".*", i):
+			lazy = pattern.startswith("?", i + 2)
+			result.append(lazy_gap if lazy else gap)
+			i += 3 if lazy else 2
+			continue
+		result.append(char)
+		i += 1
+	return "".join(result)
+
+def literal_prefixes(pattern: str) -> Optional[Set[str]]:
+	"""
+	Literal prefixes every match of pattern must start with.
+
+	Returns None when pattern doesn't start with \\b and a group of
+	alternatives that all begin with a literal word character.
+	"""
+	if not pattern.startswith("\\b("):
+		return None
+
+	# Find the end of the first group and split it at top-level '|'
+	alternatives, current, depth, i = [], [], 0, 3
+	if pattern.startswith("?:", i):
+		i += 2
+	elif pattern.startswith("?", i):
+		return None
+	while i < len(pattern):
+		char = pattern[i]
+		if char == "\\":
+			current.append(pattern[i:i + 2])
+			i += 2
+			continue
+		if char == "(":
+			depth += 1
+		elif char == ")":
+			if depth == 0:
+				break
+			depth -= 1
+		elif char == "|" and depth == 0:
+			alternatives.append("".join(current))
+			current = []
+			i += 1
+			continue
+		current.append(char)
+		i += 1
+	else:
+		return None
+	alternatives.append("".join(current))
+
+	# An optional first group means the pattern can start elsewhere
+	if i + 1 < len(pattern) and pattern[i + 1] in _QUANTIFIERS:
+		return None
+
+	prefixes = set()
+	for alternative in alternatives:
+		prefix = _LITERAL_RUN.match(alternative).group(0)
+		# A quantifier makes the last literal character optional
+		if len(prefix) < len(alternative) and alternative[len(prefix)] in _QUANTIFIERS:
+			prefix = prefix[:-1]
+		if not prefix or not re.match(r"\w", prefix[0]):
+			return None
+		prefixes.add(prefix)
+	return prefixes
+
+class PatternEngine:
+	"""Scans text for every pattern of a fixed list in one pass."""
+
+	def __init__(self, patterns: Sequence[str]):
+		"""
+		Compile the pattern set.
+
+		Args:
+			patterns: Regex strings, matched case-sensitively
+		"""
+		self.patterns = list(patterns)
+		self._compiled = [re.compile(pattern) for pattern in self.patterns]
+
+		# prefix -> pattern indices, grouped by the prefix's anchor word. A word followed
+		# by more literal text must be a whole token; a bare word may start a longer one
+		# ("broke.*inside" also matches "broken inside").
+		whole: Dict[str, Dict[str, List[int]]] = {}
+		partial: Dict[str, Dict[str, List[int]]] = {}
+		self._unanchored = []
+		for index, pattern in enumerate(self.patterns):
+			prefixes = literal_prefixes(pattern)
+			if prefixes is None:
+				self._unanchored.append(index)
+				continue
+			for prefix in prefixes:
+				anchor = _WORD.match(prefix).group(0)
+				table = whole if len(anchor) < len(prefix) else partial
+				table.setdefault(anchor, {}).setdefault(prefix, []).append(index)
+
+		self._whole_anchors = _freeze_index(whole)
+		self._partial_anchors = _freeze_index(partial)
+		self._partial_lengths = sorted({len(anchor) for anchor in partial})
+
+	def scan(self, text: str, start: int = 0, next_start: Optional[Sequence[int]] = None) -> List[PatternHit]:
+		"""
+		Find every pattern hit in text.
+
+		Args:
+			text: Text to scan
+			start: Resume a scan at this position, which must not be inside a word
+			next_start: Per pattern, where the resumed scan may find its next hit:
+				the end of its last hit before start, as finditer would continue
+
+		Returns:
+			list: (pattern index, start, end) hits ordered by pattern index, then
+			position - the order of running re.finditer for each pattern in turn
+		"""
+		hits = []
+		next_start = list(next_start) if next_start is not None else [0] * len(self.patterns)
+		compiled = self._compiled
+
+		for token in _WORD.finditer(text, start):
+			position = token.start()
+			for prefix, indices in self._anchored_at(token.group()):
+				if not text.startswith(prefix, position):
+					continue
+				for index in indices:
+					# Skip positions inside this pattern's previous match, as finditer does
+					if position < next_start[index]:
+						continue
+					match = compiled[index].match(text, position)
+					if match:
+						hits.append((index, position, match.end()))
+						next_start[index] = max(match.end(), position + 1)
+
+		for index in self._unanchored:
+			hits.extend((index, match.start(), match.end())
+						for match in compiled[index].finditer(text, max(start, next_start[index])))
+
+		hits.sort()
+		return hits
+
+	def candidates(self, text: str) -> Set[int]:
+		"""Indices of the patterns that could match text, from its tokens alone."""
+		candidates = set(self._unanchored)
+		for token in set(_WORD.findall(text)):
+			for _, indices in self._anchored_at(token):
+				candidates.update(indices)
+		return candidates
+
+	def _anchored_at(self, token: str) -> List[Tuple[str, Tuple[int, ...]]]:
+		"""(prefix, pattern indices) entries whose anchor word matches token."""
+		entries = list(self._whole_anchors.get(token, ()))
+		for length in self._partial_lengths:
+			if length > len(token):
+				break
+			entries.extend(self._partial_anchors.get(token[:length], ()))
+		return entries
+
+def _freeze_index(index: Dict[str, Dict[str, List[int]]]) -> Dict[str, Tuple[Tuple[str, Tuple[int, ...]], ...]]:
+	"""anchor -> ((prefix, pattern indices), ...) with tuples for fast iteration."""
+	return {
+		anchor: tuple((prefix, tuple(indices)) for prefix, indices in prefixes.items())
+		for anchor, prefixes in index.items()
+	}
@@ -0,0 +1,168 @@
+"""
+Re-scoring the stored corpus from persisted pattern hits.
+
+Scanning a transcription with the classifier's patterns is the expensive
+part of classification, and its outcome - which patterns hit with which
+context multiplier, plus the keyword and skip flags - does not depend on
+the pattern weights or boosts. record_pattern_hits stores that outcome per
+transcription in the pattern_hits table, keyed by the classifier's
+match_version, as packed uint16 pattern ids and float32 multipliers.
+rescore_corpus loads all stored hits with one query and scores the whole
+corpus under new ScoringParameters in one score_hits call, so trying new
+weights takes seconds instead of a pipeline run.
+
+Not every stored category came from the classifier: combined analyses
+store a weighted average score and the category of the more confident
+analyzer, and fast-path or fallback results have their own. So re-scoring
+compares the new categories with a baseline scored the same way under the
+classifier's own parameters, and only changes analyses whose stored
+category is that baseline.
+"""
+
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .advanced_classifier import AdvancedHopeSorrowClassifier, PatternHits, ScoringParameters
+from .utterance_features import UtteranceFeatures
+
+# Storage dtypes of the packed hit columns
+PATTERN_ID_DTYPE = np.dtype("<u2")
+CONTEXT_DTYPE = np.dtype("<f4")
+
+def encode_hits(hits: PatternHits) -> List[Tuple[bytes, bytes, int]]:
+	"""Split PatternHits into one (pattern_ids, context_scores, flags) record per text."""
+	if len(hits.patterns) and hits.patterns.max() > np.iinfo(PATTERN_ID_DTYPE).max:
+		raise ValueError("Pattern index too large for the stored uint16 pattern ids")
+	bounds = np.searchsorted(hits.rows, np.arange(len(hits) + 1))
+	pattern_ids = hits.patterns.astype(PATTERN_ID_DTYPE)
+	context = hits.context.astype(CONTEXT_DTYPE)
+	return [
+		(pattern_ids[start:end].tobytes(), context[start:end].tobytes(), int(flags))
+		for start, end, flags in zip(bounds[:-1], bounds[1:], hits.flags)
+	]
+
+def decode_hits(match_version: str, records: Sequence[Tuple[bytes, bytes, int]]) -> PatternHits:
+	"""Join stored (pattern_ids, context_scores, flags) records back into PatternHits, one text per record."""
+	pattern_blobs = [record[0] for record in records]
+	lengths = np.array([len(blob) // PATTERN_ID_DTYPE.itemsize for blob in pattern_blobs], dtype=np.int64)
+	return PatternHits(
+		match_version=match_version,
+		flags=np.array([record[2] for record in records], dtype=np.uint8),
+		rows=np.repeat(np.arange(len(records), dtype=np.int64), lengths),
+		patterns=np.frombuffer(b"".join(pattern_blobs), dtype=PATTERN_ID_DTYPE).astype(np.int64),
+		context=np.frombuffer(b"".join(record[1] for record in records), dtype=CONTEXT_DTYPE).astype(np.float64)
+	)
+
+def record_pattern_hits(db_manager, transcription_ids: Sequence[int], texts: Sequence[str],
+						features: Optional[Sequence[Optional[UtteranceFeatures]]] = None,
+						classifier: Optional[AdvancedHopeSorrowClassifier] = None) -> PatternHits:
+	"""
+	Extract the pattern hits of transcriptions and store them for re-scoring.
+
+	Args:
+		db_manager: DatabaseManager of the corpus
+		transcription_ids: Transcription id per text
+		texts: Transcription texts
+		features: Optional precomputed UtteranceFeatures per text (their cached hits are reused)
+		classifier: Classifier whose patterns to run (defaults to a shared one)
+
+	Returns:
+		The stored PatternHits
+	"""
+	if len(transcription_ids) != len(texts):
+		raise ValueError(f"Expected {len(texts)} transcription ids, got {len(transcription_ids)}")
+	classifier = classifier or _get_classifier()
+	hits = classifier.extract_hits(list(texts), features)
+	db_manager.save_pattern_hits(
+		hits.match_version,
+		[(transcription_id, *record) for transcription_id, record in zip(transcription_ids, encode_hits(hits))]
+	)
+	return hits
+
+def backfill_pattern_hits(db_manager, classifier: Optional[AdvancedHopeSorrowClassifier] = None,
+						  chunk_size: int = 1000) -> int:
+	"""Store pattern hits for every transcription that has none for the classifier's match_version; returns the count."""
+	classifier = classifier or _get_classifier()
+	total = 0
+	while True:
+		rows = db_manager.get_transcriptions_without_pattern_hits(classifier.match_version, limit=chunk_size)
+		if not rows:
+			return total
+		record_pattern_hits(db_manager, [row[0] for row in rows], [row[1] for row in rows], classifier=classifier)
+		total += len(rows)
+
+def rescore_corpus(db_manager, parameters: Optional[ScoringParameters] = None,
+				   classifier: Optional[AdvancedHopeSorrowClassifier] = None, write: bool = False) -> Dict:
+	"""
+	Re-classify every stored sentiment analysis from its transcription's stored pattern hits.
+
+	Each analysis is scored from its stored sentiment score, without speaker
+	calibration, under both parameters and the classifier's own parameters
+	(the baseline). An analysis changes when the two categories differ and
+	its stored category is the baseline one; analyses whose stored category
+	did not come from the classifier this way (combined, fast-path or fallback
+	results) are counted as skipped and never changed. Transcriptions without
+	hits for the classifier's match_version are left out (see
+	backfill_pattern_hits).
+
+	Args:
+		db_manager: DatabaseManager of the corpus
+		parameters: Weights and boosts to score with (defaults to the classifier's own)
+		classifier: Classifier whose pattern set the hits belong to (defaults to a shared one)
+		write: Store the new categories of changed analyses in one bulk update
+
+	Returns:
+		dict: Analysis, change and skip counts, category transitions, the new categories
+			of changed analyses by analysis id, and load/score timings
+	"""
+	classifier = classifier or _get_classifier()
+	started = time.perf_counter()
+	rows = list(db_manager.iter_scored_pattern_hits(classifier.match_version))
+	hits = decode_hits(classifier.match_version, [row[3:] for row in rows])
+	loaded = time.perf_counter()
+
+	scores = [row[2] for row in rows]
+	baseline = classifier.score_hits(hits, scores)
+	result = classifier.score_hits(hits, scores, parameters=parameters) if parameters is not None else baseline
+	scored = time.perf_counter()
+
+	changes = {}
+	skipped = 0
+	transitions = Counter()
+	for (analysis_id, old_category, *_), base, category in zip(rows, baseline.categories, result.categories):
+		if base.value != old_category:
+			skipped += 1
+		elif category != base:
+			changes[analysis_id] = category.value
+			transitions[(old_category, category.value)] += 1
+	if write:
+		db_manager.update_analysis_categories(changes)
+
+	return {
+		"match_version": classifier.match_version,
+		"analyses": len(rows),
+		"changed": len(changes),
+		"skipped": skipped,
+		"transitions": dict(transitions),
+		"changes": changes,
+		"written": write,
+		"load_seconds": loaded - started,
+		"score_seconds": scored - loaded,
+	}
+
+# Singleton pattern for efficient reuse
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def _get_classifier() -> AdvancedHopeSorrowClassifier:
+	"""Classifier used when callers don't pass one."""
+	global _classifier
+	if _classifier is None:
+		with _classifier_lock:
+			if _classifier is None:
+				_classifier = AdvancedHopeSorrowClassifier()
+	return _classifier
@@ -0,0 +1,231 @@
+"""
+Persistent, content-addressed cache for sentiment analysis results.
+
+Results are keyed by a hash of the input text together with the model,
+the classifier pattern-set version and the analyzer type. Lookups go to
+an in-memory LRU first and to a SQLite store behind it. Entries written
+by a different model or pattern set are purged the first time the new
+combination is used.
+"""
+
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from ...core.config import get_config
+
+class ResultCache:
+	"""Two-level (memory LRU + SQLite) cache of analysis result dicts."""
+
+	def __init__(self, db_path, memory_size: int = 1024, max_entries: int = 50000):
+		"""
+		Open (or create) the cache database.
+
+		Args:
+			db_path: Path of the SQLite file
+			memory_size: Number of entries kept in the in-memory LRU
+			max_entries: Maximum number of rows kept on disk before the least recently used are evicted
+		"""
+		self.db_path = Path(db_path)
+		self.memory_size = memory_size
+		self.max_entries = max_entries
+
+		self.memory_hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+		self._memory = OrderedDict()
+		self._lock = threading.Lock()
+		self._current_versions = set()
+
+		self.db_path.parent.mkdir(parents=True, exist_ok=True)
+		self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+		self._conn.execute("""
+			CREATE TABLE IF NOT EXISTS result_cache (
+				key TEXT PRIMARY KEY,
+				analyzer_type TEXT NOT NULL,
+				model_name TEXT NOT NULL,
+				pattern_version TEXT NOT NULL,
+				result TEXT NOT NULL,
+				last_used REAL NOT NULL
+			)
+		""")
+		self._conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_last_used ON result_cache (last_used)")
+		self._conn.commit()
+		self._size = self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+
+	@staticmethod
+	def make_key(text: str, analyzer_type: str, model_name: str, pattern_version: str) -> str:
+		"""
+		Build the cache key for a text.
+
+		The text is normalized to Unicode NFC. Case and whitespace are kept
+		because both change the transformer's tokens and therefore its output.
+		"""
+		normalized = unicodedata.normalize("NFC", text)
+		digest = hashlib.sha256()
+		for part in (analyzer_type, model_name, pattern_version, normalized):
+			digest.update(part.encode("utf-8"))
+			digest.update(b"\x00")
+		return digest.hexdigest()
+
+	def ensure_current(self, analyzer_type: str, model_name: str, pattern_version: str):
+		"""Drop entries of this analyzer type written by another model or pattern set."""
+		identity = (analyzer_type, model_name, pattern_version)
+		if identity in self._current_versions:
+			return
+
+		with self._lock:
+			cursor = self._conn.execute(
+				"DELETE FROM result_cache WHERE analyzer_type = ? AND (model_name != ? OR pattern_version != ?)",
+				identity
+			)
+			self._conn.commit()
+			if cursor.rowcount:
+				self._size -= cursor.rowcount
+				self._memory.clear()
+				print(f"Result cache: invalidated {cursor.rowcount} stale '{analyzer_type}' entries")
+			self._current_versions.add(identity)
+
+	def get(self, key: str) -> Optional[Dict]:
+		"""Return a fresh copy of the cached result, or None on a miss."""
+		with self._lock:
+			payload = self._memory.get(key)
+			if payload is not None:
+				self._memory.move_to_end(key)
+				self.memory_hits += 1
+				return json.loads(payload)
+
+			row = self._conn.execute("SELECT result FROM result_cache WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+
+			self._conn.execute("UPDATE result_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+			self._conn.commit()
+			self._remember(key, row[0])
+			self.disk_hits += 1
+			return json.loads(row[0])
+
+	def put(self, key: str, result: Dict, analyzer_type: str, model_name: str, pattern_version: str):
+		"""Store a result in memory and on disk, evicting old rows if the store is full."""
+		payload = json.dumps(result, default=_to_json)
+		with self._lock:
+			existed = self._conn.execute("SELECT 1 FROM result_cache WHERE key = ?", (key,)).fetchone() is not None
+			self._conn.execute(
+				"""INSERT OR REPLACE INTO result_cache
+				   (key, analyzer_type, model_name, pattern_version, result, last_used)
+				   VALUES (?, ?, ?, ?, ?, ?)""",
+				(key, analyzer_type, model_name, pattern_version, payload, time.time())
+			)
+			if not existed:
+				self._size += 1
+			if self._size > self.max_entries:
+				self._evict()
+			self._conn.commit()
+			self._remember(key, payload)
+
+	def clear(self):
+		"""Remove every cached result."""
+		with self._lock:
+			self._conn.execute("DELETE FROM result_cache")
+			self._conn.commit()
+			self._memory.clear()
+			self._size = 0
+
+	def stats(self) -> Dict:
+		"""Hit/miss counters and current sizes."""
+		hits = self.memory_hits + self.disk_hits
+		lookups = hits + self.misses
+		return {
+			'hits': hits,
+			'memory_hits': self.memory_hits,
+			'disk_hits': self.disk_hits,
+			'misses': self.misses,
+			'hit_rate': hits / lookups if lookups else 0.0,
+			'evictions': self.evictions,
+			'memory_entries': len(self._memory),
+			'disk_entries': self._size,
+		}
+
+	def _remember(self, key: str, payload: str):
+		"""Insert into the memory LRU (caller holds the lock)."""
+		self._memory[key] = payload
+		self._memory.move_to_end(key)
+		while len(self._memory) > self.memory_size:
+			self._memory.popitem(last=False)
+
+	def _evict(self):
+		"""Delete the least recently used rows down to 90% of max_entries (caller holds the lock)."""
+		excess = self._size - int(self.max_entries * 0.9)
+		cursor = self._conn.execute(
+			"DELETE FROM result_cache WHERE key IN (SELECT key FROM result_cache ORDER BY last_used LIMIT ?)",
+			(excess,)
+		)
+		self._size -= cursor.rowcount
+		self.evictions += cursor.rowcount
+		self._memory.clear()
+
+def _to_json(value):
+	"""JSON fallback for numpy scalars and arrays in result dicts."""
+	if hasattr(value, "tolist"):
+		return value.tolist()
+	raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+# Singleton pattern for efficient reuse
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache() -> Optional[ResultCache]:
+	"""Get the shared result cache, or None when RESULT_CACHE_ENABLED is off."""
+	global _result_cache
+	config = get_config()
+	if not config.get('RESULT_CACHE_ENABLED'):
+		return None
+	if _result_cache is None:
+		with _result_cache_lock:
+			if _result_cache is None:
+				_result_cache = ResultCache(
+					config.get('RESULT_CACHE_PATH'),
+					memory_size=config.get('RESULT_CACHE_MEMORY_SIZE'),
+					max_entries=config.get('RESULT_CACHE_MAX_ENTRIES')
+				)
+	return _result_cache
+
+def cached_analysis(text: str, analyzer_type: str, model_name: str, pattern_version: str,
+					compute: Callable[[], Dict], should_store: Optional[Callable[[Dict], bool]] = None) -> Dict:
+	"""
+	Return the cached result for text, computing and storing it on a miss.
+
+	Args:
+		text: The analyzed text
+		analyzer_type: Which pipeline produced the result (e.g. 'transformer', 'llm')
+		model_name: Model identity; a change invalidates older entries
+		pattern_version: Classifier pattern-set version; a change invalidates older entries
+		compute: Runs the analysis on a miss
+		should_store: Optional predicate deciding whether a fresh result may be cached
+
+	Returns:
+		dict: The analysis result
+	"""
+	cache = get_result_cache()
+	if cache is None:
+		return compute()
+
+	cache.ensure_current(analyzer_type, model_name, pattern_version)
+	key = cache.make_key(text, analyzer_type, model_name, pattern_version)
+	cached = cache.get(key)
+	if cached is not None:
+		return cached
+
+	result = compute()
+	if should_store is None or should_store(result):
+		cache.put(key, result, analyzer_type, model_name, pattern_version)
+	return result
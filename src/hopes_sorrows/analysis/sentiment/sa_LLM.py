@@ -5,7 +5,9 @@ from dotenv import load_dotenv
 from enum import Enum
 from typing import Dict, Optional, List
 from .advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory, ClassificationResult
+from .utterance_features import UtteranceFeatures
 from .cli_formatter import format_sentiment_result, format_error
+from .result_cache import cached_analysis
 
 # Load environment variables using centralized config
 from ...core.config import get_config
@@ -73,7 +75,8 @@ class LLMSentimentAnalyzer:
 		else:
 			return SentimentCategory.NEUTRAL.value
 		
-	def analyze(self, text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None) -> Dict:
+	def analyze(self, text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None,
+				features: Optional[UtteranceFeatures] = None) -> Dict:
 		"""
 		Analyze the sentiment of the given text using an LLM with enhanced scoring and classification.
 
@@ -81,6 +84,7 @@ class LLMSentimentAnalyzer:
 			text: The text to analyze
 			speaker_id: Optional speaker identifier for personalized analysis
 			context_window: Optional list of previous utterances for context
+			features: Precomputed UtteranceFeatures of text, passed on to the classifier
 
 		Returns:
 			dict: A dictionary containing sentiment analysis results
@@ -137,21 +141,12 @@ class LLMSentimentAnalyzer:
 				text=text,
 				sentiment_score=result["score"],
 				speaker_id=speaker_id or "unknown",
-				context_window=context_window
+				context_window=context_window,
+				features=features
 			)
 			
 			# Add classification results
-			result["category"] = classification.category.value
-			result["classification_confidence"] = classification.confidence
-			result["matched_patterns"] = [
-				{
-					"pattern": pattern.description,
-					"weight": weight,
-					"category": pattern.category.value
-				}
-				for pattern, weight in classification.matched_patterns
-			]
-			result["explanation"] = classification.explanation
+			result.update(classification.to_dict())
 			
 			return result
 			
@@ -163,7 +158,8 @@ class LLMSentimentAnalyzer:
 				"category": EmotionCategory.REFLECTIVE_NEUTRAL.value,
 				"intensity": 0.0,
 				"confidence": 0.0,
-				"explanation": f"Analysis failed due to error: {str(e)}"
+				"explanation": f"Analysis failed due to error: {str(e)}",
+				"error": str(e)
 			}
 	
 	def _validate_and_normalize_result(self, result: Dict) -> Dict:
@@ -214,7 +210,8 @@ def get_analyzer(api_key=None):
 		_llm_sentiment_analyzer = LLMSentimentAnalyzer(api_key=api_key)
 	return _llm_sentiment_analyzer
 
-def analyze_sentiment(text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None, api_key: Optional[str] = None, verbose: bool = True) -> Dict:
+def analyze_sentiment(text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None, api_key: Optional[str] = None, verbose: bool = True,
+					  features: Optional[UtteranceFeatures] = None) -> Dict:
 	"""
 	Analyze the sentiment of the given text using the singleton LLM analyzer.
 	
@@ -224,13 +221,25 @@ def analyze_sentiment(text: str, speaker_id: Optional[str] = None, context_windo
 		context_window: Optional list of previous utterances for context
 		api_key: Optional OpenAI API key
 		verbose: Whether to print formatted output (default: True)
+		features: Precomputed UtteranceFeatures of text, passed on to the classifier
+	
+	Results without a context window are served from the result cache
+	when RESULT_CACHE_ENABLED is set.
 	
 	Returns:
 		dict: Analysis results
 	"""
 	try:
 		analyzer = get_analyzer(api_key=api_key)
-		result = analyzer.analyze(text, speaker_id, context_window)
+		if context_window:
+			result = analyzer.analyze(text, speaker_id, context_window, features=features)
+		else:
+			# Failed API calls are transient, so only successful results are cached
+			result = cached_analysis(
+				text, 'llm', analyzer.model_name, analyzer.advanced_classifier.pattern_set_version,
+				lambda: analyzer.analyze(text, speaker_id, features=features),
+				should_store=lambda r: 'error' not in r
+			)
 		
 		if verbose:
 			format_sentiment_result(result)
@@ -1,9 +1,18 @@
+import time
+import threading
 import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+import numpy as np
+from transformers import AutoTokenizer
 from enum import Enum
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
 from .advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory, ClassificationResult
+from .utterance_features import UtteranceFeatures
 from .cli_formatter import format_sentiment_result, format_error
+from .micro_batcher import MicroBatcher, MicroBatcherClosed
+from .backends import create_backend, backend_name
+from .result_cache import cached_analysis
+from ...core.config import get_config
 
 class SentimentLabel(Enum):
 	VERY_POSITIVE = "very_positive"
@@ -17,6 +26,19 @@ class SentimentCategory(Enum):
 	SORROW = "sorrow"
 	NEUTRAL = "neutral"
 
+class ModelState(Enum):
+	"""Lifecycle of the shared transformer analyzer"""
+	NOT_LOADED = "not_loaded"
+	LOADING = "loading"
+	WARMING = "warming"
+	READY = "ready"
+	FAILED = "failed"
+
+class WindowStrategy(Enum):
+	"""How per-window emotion probabilities of a long text are combined"""
+	LENGTH_WEIGHTED = "length_weighted"  # Mean weighted by window token count
+	MAX_INTENSITY = "max_intensity"      # The window with the strongest sentiment wins
+
 class Config:
 	# Model configuration
 	SENTIMENT_MODEL = "j-hartmann/emotion-english-distilroberta-base" # Emotion model - CORRECT for this use case
@@ -29,53 +51,159 @@ class Config:
 	SENTIMENT_THRESHOLD_HOPE = 0.2      # Lowered from 0.3
 	SENTIMENT_THRESHOLD_SORROW = -0.1   # Raised from -0.2
 	
-	# Updated scoring thresholds for more nuanced sentiment analysis
-	THRESHOLDS = {
-		SentimentLabel.VERY_POSITIVE: 0.6,   # Lowered from 0.8
-		SentimentLabel.POSITIVE: 0.2,        # Lowered from 0.3
-		SentimentLabel.NEUTRAL: -0.1,        # Raised from -0.2
-		SentimentLabel.NEGATIVE: -0.3,       # Raised from -0.5
-		SentimentLabel.VERY_NEGATIVE: -0.6   # Raised from -0.8
-	}
+	# Output order of j-hartmann/emotion-english-distilroberta-base
+	EMOTION_LABELS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+	
+	# Contribution of each emotion to the sentiment score: positive emotions lean
+	# toward hope, negative ones toward sorrow, surprise can go either way
+	EMOTION_WEIGHTS = np.array([-1.0, -1.0, -1.0, 1.0, 0.0, -1.0, 0.5], dtype=np.float32)
+	
+	# Updated scoring thresholds for more nuanced sentiment analysis:
+	# inclusive upper bound of each label's score range, scores above the last are very positive
+	# (float64, so round scores such as -0.6 land on the same side as with a plain <= comparison)
+	THRESHOLDS = np.array([
+		-0.6,  # very_negative (raised from -0.8)
+		-0.3,  # negative (raised from -0.5)
+		-0.1,  # neutral (raised from -0.2)
+		0.2,   # positive (lowered from 0.3)
+	], dtype=np.float64)
+	THRESHOLD_LABELS = [
+		SentimentLabel.VERY_NEGATIVE.value,
+		SentimentLabel.NEGATIVE.value,
+		SentimentLabel.NEUTRAL.value,
+		SentimentLabel.POSITIVE.value,
+		SentimentLabel.VERY_POSITIVE.value,
+	]
 	
 	# Confidence thresholds
 	HIGH_CONFIDENCE = 0.8
 	MEDIUM_CONFIDENCE = 0.6
 	LOW_CONFIDENCE = 0.4
+	
+	# Inference settings
+	MAX_LENGTH = 512   # Model context size in tokens
+	BATCH_SIZE = 16    # Max texts per forward pass in analyze_batch
+	WINDOW_STRIDE = 128  # Tokens shared by consecutive windows of a long text
+	WINDOW_STRATEGY = WindowStrategy.LENGTH_WEIGHTED
+
+@dataclass
+class EmotionMapping:
+	"""
+	Vectorized mapping from emotion probabilities to sentiment score, confidence and label.
+	
+	Works on whole (N, num_emotions) matrices, so a different mapping can be
+	re-applied to stored probabilities without running the model again.
+	"""
+	emotion_weights: np.ndarray = field(default_factory=lambda: Config.EMOTION_WEIGHTS.copy())
+	thresholds: np.ndarray = field(default_factory=lambda: Config.THRESHOLDS.copy())
+	labels: List[str] = field(default_factory=lambda: list(Config.THRESHOLD_LABELS))
+	low_confidence: float = Config.LOW_CONFIDENCE
+	neutral_index: int = Config.EMOTION_LABELS.index("neutral")
+	
+	def __post_init__(self):
+		if len(self.labels) != len(self.thresholds) + 1:
+			raise ValueError("labels needs exactly one more entry than thresholds")
+		self._emotional_weights = np.abs(self.emotion_weights)
+		self._decisive = np.ones(len(self.emotion_weights), dtype=bool)
+		self._decisive[self.neutral_index] = False
+		self._label_array = np.array(self.labels)
+	
+	def scores(self, probs: np.ndarray) -> np.ndarray:
+		"""Signed emotional mass over total mass (neutral included), 0 when nothing but neutral fires."""
+		probs = np.atleast_2d(probs)
+		signed = probs @ self.emotion_weights
+		emotional = probs @ self._emotional_weights
+		total = emotional + probs[:, self.neutral_index]
+		return np.where(emotional > 0, signed / np.where(total > 0, total, 1.0), 0.0).astype(np.float32)
+	
+	def confidences(self, probs: np.ndarray) -> np.ndarray:
+		"""Largest non-neutral emotion probability per row."""
+		return np.atleast_2d(probs)[:, self._decisive].max(axis=1)
+	
+	def label_for(self, scores: np.ndarray, confidences: np.ndarray) -> np.ndarray:
+		"""Bin scores by the thresholds (score <= threshold, compared in float64); low-confidence rows are neutral."""
+		scores = np.asarray(scores, dtype=np.float64)
+		labels = self._label_array[np.searchsorted(np.asarray(self.thresholds, dtype=np.float64), scores, side="left")]
+		return np.where(np.asarray(confidences) < self.low_confidence, SentimentLabel.NEUTRAL.value, labels)
+	
+	def apply(self, probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""Return (scores, confidences, labels) arrays for an (N, num_emotions) probability matrix."""
+		scores = self.scores(probs)
+		confidences = self.confidences(probs)
+		return scores, confidences, self.label_for(scores, confidences)
 
 class SentimentAnalyzer:
 	"""Enhanced class for analyzing sentiment in text."""
 		
-	def __init__(self, model_name=None):
-		"""Initialize the sentiment analyzer with a pre-trained model."""
+	def __init__(self, model_name=None, backend=None, quantize=None, mapping: Optional[EmotionMapping] = None):
+		"""
+		Initialize the sentiment analyzer with a pre-trained model.
+		
+		Args:
+			model_name: Hugging Face model identifier (defaults to Config.SENTIMENT_MODEL)
+			backend: Inference backend, 'torch', 'torchscript' or 'onnx' (defaults to the SENTIMENT_BACKEND setting)
+			quantize: Use int8 dynamic quantization of the linear layers (defaults to the SENTIMENT_QUANTIZE setting)
+			mapping: Emotion-to-sentiment mapping (defaults to the Config weights and thresholds)
+		"""
+		config = get_config()
 		self.model_name = model_name or Config.SENTIMENT_MODEL
 		self.device = "cuda" if torch.cuda.is_available() else "cpu"
 		
 		print(f"Loading sentiment model: {self.model_name}")
 		self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-		self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
-		self.model.to(self.device)
-		print(f"Model loaded successfully on {self.device}")
+		backend = (backend or config.get('SENTIMENT_BACKEND') or "torch").lower()
+		self.backend = create_backend(
+			backend,
+			self.model_name,
+			self.tokenizer,
+			self.device,
+			cache_dir=config.get('TORCHSCRIPT_CACHE_DIR') if backend == "torchscript" else config.get('ONNX_CACHE_DIR'),
+			quantize=config.get('SENTIMENT_QUANTIZE') if quantize is None else quantize
+		)
+		print(f"Model loaded successfully ({self.backend.name} backend)")
+		
+		self.mapping = mapping or EmotionMapping()
 		
 		# Initialize advanced classifier
 		self.advanced_classifier = AdvancedHopeSorrowClassifier()
 		
+		# Optional request coalescing for concurrent analyze() calls
+		self._batcher = None
+		
+	@property
+	def model_identity(self) -> str:
+		"""Model and backend name; results from different identities may differ."""
+		return f"{self.model_name}@{self.backend.name}"
+	
+	@property
+	def pattern_set_version(self) -> str:
+		"""Version of the classifier patterns applied on top of the model."""
+		return self.advanced_classifier.pattern_set_version
+		
+	def enable_micro_batching(self, max_batch_size: int = 16, max_wait_ms: float = 10.0):
+		"""
+		Route the forward pass of analyze() through a shared micro-batcher.
+		
+		Concurrent analyze() calls are collected for up to max_wait_ms (or until
+		max_batch_size texts are waiting) and run as one forward pass.
+		"""
+		self.disable_micro_batching()
+		self._batcher = MicroBatcher(
+			lambda texts: self._predict_emotions(texts, batch_size=len(texts)),
+			max_batch_size=max_batch_size,
+			max_wait_ms=max_wait_ms,
+			name="sentiment-micro-batcher"
+		)
+		
+	def disable_micro_batching(self):
+		"""Stop the micro-batcher and go back to one forward pass per analyze() call."""
+		if self._batcher is not None:
+			self._batcher.close()
+			self._batcher = None
+		
 	def get_sentiment_label(self, score: float, confidence: float) -> str:
 		"""Get sentiment label based on score and confidence."""
-		if confidence < Config.LOW_CONFIDENCE:
-			return SentimentLabel.NEUTRAL.value
-			
-		# Updated logic to better handle negative sentiments
-		if score <= Config.THRESHOLDS[SentimentLabel.VERY_NEGATIVE]:
-			return SentimentLabel.VERY_NEGATIVE.value
-		elif score <= Config.THRESHOLDS[SentimentLabel.NEGATIVE]:
-			return SentimentLabel.NEGATIVE.value
-		elif score <= Config.THRESHOLDS[SentimentLabel.NEUTRAL]:
-			return SentimentLabel.NEUTRAL.value
-		elif score <= Config.THRESHOLDS[SentimentLabel.POSITIVE]:
-			return SentimentLabel.POSITIVE.value
-		else:
-			return SentimentLabel.VERY_POSITIVE.value
+		return str(self.mapping.label_for(np.array([score]), np.array([confidence]))[0])
 		
 	def get_sentiment_category(self, score):
 		"""Map detailed sentiment to hope/sorrow category."""
@@ -86,7 +214,8 @@ class SentimentAnalyzer:
 		else:
 			return SentimentCategory.NEUTRAL.value
 		
-	def analyze(self, text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None) -> Dict:
+	def analyze(self, text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None,
+				return_embedding: bool = False, features: Optional[UtteranceFeatures] = None) -> Dict:
 		"""
 		Analyze the sentiment of the given text with enhanced scoring and classification.
 		
@@ -94,118 +223,405 @@ class SentimentAnalyzer:
 			text: The text to analyze
 			speaker_id: Optional speaker identifier for personalized analysis
 			context_window: Optional list of previous utterances for context
+			return_embedding: Also return the pooled final hidden state as 'embedding'
+			features: Precomputed UtteranceFeatures of text, passed on to the classifier
 			
 		Returns:
 			dict: A dictionary containing sentiment analysis results
 		"""
 		# Handle empty text
 		if not text or text.strip() == "":
-			return {
-				"score": 0.0,
-				"label": SentimentLabel.NEUTRAL.value,
-				"category": EmotionCategory.REFLECTIVE_NEUTRAL.value,
-				"intensity": 0.0,
-				"confidence": 0.0,
-				"explanation": "Empty text provided."
-			}
-		
-		# Prepare the text for the model
-		inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-		inputs = {key: val.to(self.device) for key, val in inputs.items()}
-		
-		# Get model prediction
-		with torch.no_grad():
-			outputs = self.model(**inputs)
+			return self._empty_result(return_embedding)
+		
+		if self._is_long(text):
+			return self.analyze_long(text, speaker_id, context_window, return_embedding=return_embedding, features=features)
+		
+		embeddings = None
+		probs = None
+		batcher = self._batcher  # Read once: disable_micro_batching() may reset it concurrently
+		if return_embedding:
+			probs, embeddings = self._predict_emotions([text], with_embeddings=True)
+			probs = probs[0]
+		elif batcher is not None:
+			try:
+				probs = batcher.submit(text).result()
+			except MicroBatcherClosed:
+				pass  # Closed under us: run the forward pass directly
+		if probs is None:
+			probs = self._predict_emotions([text])[0]
+		return self._build_results([text], probs[None, :], [speaker_id], context_window, embeddings, [features])[0]
+	
+	def analyze_batch(self, texts: List[str], speaker_ids: Optional[List[Optional[str]]] = None,
+					  batch_size: Optional[int] = None, return_embeddings: bool = False) -> List[Dict]:
+		"""
+		Analyze many texts with as few forward passes as possible.
+		
+		Texts are bucketed by token length so each forward pass only pads to the
+		longest text in its own bucket. Results match analyze() for every text and
+		are returned in the original order.
+		
+		Args:
+			texts: The texts to analyze
+			speaker_ids: Optional speaker identifier per text
+			batch_size: Max texts per forward pass (defaults to Config.BATCH_SIZE)
+			return_embeddings: Also return each text's pooled final hidden state as 'embedding'
 			
-		# Convert logits to probabilities
-		probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-		probs = probs.cpu().numpy()[0]
-		
-		# For j-hartmann/emotion-english-distilroberta-base:
-		# The model outputs 7 emotions: [anger, disgust, fear, joy, neutral, sadness, surprise]
-		# We need to map these to a sentiment score for hope/sorrow classification
-
-		# Get emotion probabilities (indices based on model output)
-		emotions = {
-			'anger': probs[0],      # Index 0
-			'disgust': probs[1],    # Index 1  
-			'fear': probs[2],       # Index 2
-			'joy': probs[3],        # Index 3
-			'neutral': probs[4],    # Index 4
-			'sadness': probs[5],    # Index 5
-			'surprise': probs[6]    # Index 6
-		}
-
-		# Map emotions to sentiment score (-1 to 1 scale)
-		# Positive emotions (lean toward hope): joy, surprise
-		# Negative emotions (lean toward sorrow): anger, disgust, fear, sadness
-		# Neutral: neutral
-
-		positive_emotions = emotions['joy'] + emotions['surprise'] * 0.5  # Surprise can be positive or negative
-		negative_emotions = emotions['anger'] + emotions['disgust'] + emotions['fear'] + emotions['sadness']
-		neutral_emotion = emotions['neutral']
-
-		# Calculate sentiment score: positive emotions minus negative emotions
-		# Scale to -1 to 1 range considering neutral as baseline
-		total_emotional = positive_emotions + negative_emotions
-		if total_emotional > 0:
-			score = (positive_emotions - negative_emotions) / (total_emotional + neutral_emotion)
+		Returns:
+			list: One analysis result dict per input text
+		"""
+		if speaker_ids is None:
+			speaker_ids = [None] * len(texts)
+		elif len(speaker_ids) != len(texts):
+			raise ValueError("speaker_ids must have the same length as texts")
+		
+		# Empty texts never reach the model; texts longer than the model context go through analyze_long()
+		model_indices = [i for i, text in enumerate(texts) if text and text.strip() != "" and not self._is_long(text)]
+		model_texts = [texts[i] for i in model_indices]
+		embeddings = None
+		if return_embeddings:
+			probs, embeddings = self._predict_emotions(model_texts, batch_size, with_embeddings=True)
 		else:
-			score = 0.0  # Pure neutral case
-
-		# Calculate confidence as the maximum emotion probability (excluding neutral for more decisive classification)
-		non_neutral_probs = [emotions[key] for key in emotions if key != 'neutral']
-		confidence = float(max(non_neutral_probs) if non_neutral_probs else emotions['neutral'])
+			probs = self._predict_emotions(model_texts, batch_size)
+		model_results = self._build_results(model_texts, probs, [speaker_ids[i] for i in model_indices], embeddings=embeddings)
+		results_by_index = dict(zip(model_indices, model_results))
+		
+		results = []
+		for i, text in enumerate(texts):
+			if i in results_by_index:
+				results.append(results_by_index[i])
+			elif text and text.strip() != "":
+				results.append(self.analyze_long(text, speaker_ids[i], return_embedding=return_embeddings))
+			else:
+				results.append(self._empty_result(return_embeddings))
+		return results
+	
+	def analyze_long(self, text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None,
+					 strategy: Optional[WindowStrategy] = None, return_embedding: bool = False,
+					 features: Optional[UtteranceFeatures] = None) -> Dict:
+		"""
+		Analyze a text of any length with overlapping token windows.
+		
+		The text is split into windows of Config.MAX_LENGTH tokens that overlap
+		by Config.WINDOW_STRIDE tokens. All windows go through the same padded
+		batches as analyze_batch(), and their emotion probabilities are combined
+		with the chosen strategy. Texts that fit in one window give the same
+		result as analyze().
 		
-		# Get sentiment label
-		label = self.get_sentiment_label(score, confidence)
+		Args:
+			text: The text to analyze
+			speaker_id: Optional speaker identifier for personalized analysis
+			context_window: Optional list of previous utterances for context
+			strategy: How to combine windows (defaults to Config.WINDOW_STRATEGY)
+			return_embedding: Also return the length-weighted mean of the window embeddings as 'embedding'
+			features: Precomputed UtteranceFeatures of text, passed on to the classifier
+			
+		Returns:
+			dict: Analysis result plus 'window_strategy' and per-window 'window_scores'
+		"""
+		if not text or text.strip() == "":
+			return self._empty_result(return_embedding)
+		
+		strategy = WindowStrategy(strategy or Config.WINDOW_STRATEGY)
+		encodings, window_features = self._window_features(text)
+		window_count = len(window_features)
+		embeddings = None
+		if return_embedding:
+			window_probs, window_embeddings = self._forward(window_features, with_embeddings=True)
+		else:
+			window_probs = self._forward(window_features)
+		lengths = np.array([len(ids) for ids in encodings["input_ids"]], dtype=np.float32)
+		if return_embedding:
+			embeddings = ((window_embeddings * lengths[:, None]).sum(axis=0) / lengths.sum())[None, :]
+		scores = self.mapping.scores(window_probs)
+		confidences = self.mapping.confidences(window_probs)
+		
+		if strategy == WindowStrategy.MAX_INTENSITY:
+			probs = window_probs[int(np.argmax(np.abs(scores)))]
+		else:
+			probs = (window_probs * lengths[:, None]).sum(axis=0) / lengths.sum()
 		
-		# Get advanced emotion classification
-		classification = self.advanced_classifier.classify_emotion(
-			text=text,
-			sentiment_score=score,
-			speaker_id=speaker_id or "unknown",
-			context_window=context_window
+		result = self._build_results([text], probs[None, :], [speaker_id], context_window, embeddings, [features])[0]
+		if window_count > 1:
+			result["window_strategy"] = strategy.value
+			result["window_scores"] = []
+			for i in range(window_count):
+				window = {"index": i, "tokens": int(lengths[i]), "score": float(scores[i]), "confidence": float(confidences[i])}
+				if "offset_mapping" in encodings:
+					# Special tokens map to (0, 0); take the span of the real tokens
+					spans = [span for span in encodings["offset_mapping"][i] if span[1] > span[0]]
+					window["char_start"], window["char_end"] = spans[0][0], spans[-1][1]
+				result["window_scores"].append(window)
+		return result
+	
+	def _window_features(self, text: str):
+		"""Tokenize text into overlapping model windows; returns (encodings, per-window features)."""
+		encodings = self.tokenizer(
+			[text],
+			truncation=True,
+			max_length=Config.MAX_LENGTH,
+			stride=Config.WINDOW_STRIDE,
+			return_overflowing_tokens=True,
+			return_offsets_mapping=self.tokenizer.is_fast
 		)
+		features = [
+			{key: encodings[key][i] for key in ("input_ids", "attention_mask")}
+			for i in range(len(encodings["input_ids"]))
+		]
+		return encodings, features
+	
+	def _is_long(self, text: str) -> bool:
+		"""True if text needs more than one model window."""
+		# Every token covers at least one character, so short strings can skip tokenization
+		if len(text) <= Config.MAX_LENGTH - 2:
+			return False
+		return len(self.tokenizer(text, verbose=False)["input_ids"]) > Config.MAX_LENGTH
+	
+	def embed(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+		"""
+		Return an (N, hidden_size) float32 matrix of pooled final hidden states.
+		
+		These are the same embeddings analyze(..., return_embedding=True) reports,
+		without running the classifier. Empty texts get a zero vector.
+		"""
+		embeddings = np.zeros((len(texts), self.backend.hidden_size), dtype=np.float32)
+		short_indices, long_indices = [], []
+		for i, text in enumerate(texts):
+			if text and text.strip() != "":
+				(long_indices if self._is_long(text) else short_indices).append(i)
+		
+		if short_indices:
+			_, embeddings[short_indices] = self._predict_emotions([texts[i] for i in short_indices], batch_size, with_embeddings=True)
+		for i in long_indices:
+			encodings, features = self._window_features(texts[i])
+			_, window_embeddings = self._forward(features, batch_size, with_embeddings=True)
+			lengths = np.array([len(ids) for ids in encodings["input_ids"]], dtype=np.float32)
+			embeddings[i] = (window_embeddings * lengths[:, None]).sum(axis=0) / lengths.sum()
+		return embeddings
+	
+	def _predict_emotions(self, texts: List[str], batch_size: Optional[int] = None, with_embeddings: bool = False):
+		"""
+		Run the emotion model and return an (N, 7) matrix of emotion probabilities.
+		
+		Inputs are sorted by token length and split into buckets of at most
+		batch_size texts; each bucket is padded to its own max length and run
+		in a single forward pass. With with_embeddings, returns a
+		(probabilities, pooled hidden states) pair instead.
+		"""
+		if not texts:
+			probabilities = np.zeros((0, self.backend.num_labels), dtype=np.float32)
+			if with_embeddings:
+				return probabilities, np.zeros((0, self.backend.hidden_size), dtype=np.float32)
+			return probabilities
+		
+		encodings = self.tokenizer(texts, truncation=True, max_length=Config.MAX_LENGTH)
+		features = [{key: encodings[key][i] for key in encodings.keys()} for i in range(len(texts))]
+		return self._forward(features, batch_size, with_embeddings)
+	
+	def _forward(self, features: List[Dict], batch_size: Optional[int] = None, with_embeddings: bool = False):
+		"""Run tokenized features through the model in length-sorted, padded buckets."""
+		probabilities = np.zeros((len(features), self.backend.num_labels), dtype=np.float32)
+		embeddings = np.zeros((len(features), self.backend.hidden_size), dtype=np.float32) if with_embeddings else None
+		batch_size = batch_size or Config.BATCH_SIZE
+		order = sorted(range(len(features)), key=lambda i: len(features[i]["input_ids"]))
+		
+		for start in range(0, len(order), batch_size):
+			bucket = order[start:start + batch_size]
+			inputs = self.tokenizer.pad([features[i] for i in bucket], return_tensors=self.backend.tensor_type)
+			if with_embeddings:
+				probabilities[bucket], embeddings[bucket] = self.backend.predict_with_embeddings(inputs)
+			else:
+				probabilities[bucket] = self.backend.predict_probabilities(inputs)
 		
-		# Calculate intensity (how strong the sentiment is)
-		intensity = abs(score)
-		
-		# Return the analysis results
-		return {
-			"score": score,
-			"label": label,
-			"category": classification.category.value,
-			"intensity": intensity,
-			"confidence": confidence,
-			"classification_confidence": classification.confidence,
-			"matched_patterns": [
-				{
-					"pattern": pattern.description,
-					"weight": weight,
-					"category": pattern.category.value
-				}
-				for pattern, weight in classification.matched_patterns
-			],
-			"explanation": classification.explanation
+		if with_embeddings:
+			return probabilities, embeddings
+		return probabilities
+	
+	def _empty_result(self, with_embedding: bool = False) -> Dict:
+		"""Result returned for empty input without running the model."""
+		result = {
+			"score": 0.0,
+			"label": SentimentLabel.NEUTRAL.value,
+			"category": EmotionCategory.REFLECTIVE_NEUTRAL.value,
+			"intensity": 0.0,
+			"confidence": 0.0,
+			"explanation": "Empty text provided."
 		}
+		if with_embedding:
+			result["embedding"] = np.zeros(self.backend.hidden_size, dtype=np.float32)
+		return result
+	
+	def _build_results(self, texts: List[str], probs: np.ndarray, speaker_ids: List[Optional[str]],
+					   context_window: Optional[List[str]] = None, embeddings: Optional[np.ndarray] = None,
+					   features: Optional[List[Optional[UtteranceFeatures]]] = None) -> List[Dict]:
+		"""Turn an (N, 7) emotion probability matrix into full analysis results, in input order."""
+		# Score, confidence and label for every row in one vectorized pass
+		scores, confidences, labels = self.mapping.apply(probs)
+		
+		# Classify in input order so per-speaker state evolves exactly as with analyze()
+		results = []
+		features = features or [None] * len(texts)
+		for text, row, score, confidence, label, speaker_id, text_features in zip(texts, probs, scores, confidences, labels, speaker_ids, features):
+			classification = self.advanced_classifier.classify_emotion(
+				text=text,
+				sentiment_score=score,
+				speaker_id=speaker_id or "unknown",
+				context_window=context_window,
+				features=text_features
+			)
+			
+			results.append({
+				"score": score,
+				"label": str(label),
+				"category": classification.category.value,
+				"intensity": abs(score),
+				"confidence": float(confidence),
+				"classification_confidence": classification.confidence,
+				"emotion_probabilities": dict(zip(Config.EMOTION_LABELS, row.tolist())),
+				"matched_patterns": classification.pattern_dicts,
+				"explanation": classification.explanation
+			})
+			if embeddings is not None:
+				results[-1]["embedding"] = embeddings[len(results) - 1]
+		return results
 
 # Singleton pattern for efficient reuse
 _sentiment_analyzer = None
+_analyzer_lock = threading.Lock()
+
+# Readiness of the singleton, driven by start_background_warmup()
+_model_status = {"state": ModelState.NOT_LOADED, "error": None, "load_seconds": None, "warmup_seconds": None}
+_ready_event = threading.Event()
+_warmup_thread = None
+
+# Dummy inputs of different lengths so warm-up touches several padded shapes
+_WARMUP_TEXTS = [
+	"Hello",
+	"I will achieve my dreams and make a better future for myself.",
+	"I lost everything I worked for and it's all gone now, and I keep wondering whether things will ever feel normal again.",
+	"I'm excited about the future but scared of what might happen. " * 8,
+]
+
+def create_local_analyzer() -> SentimentAnalyzer:
+	"""Load the model in this process, with micro-batching if configured."""
+	analyzer = SentimentAnalyzer()
+	config = get_config()
+	if config.get('MICRO_BATCHING_ENABLED'):
+		analyzer.enable_micro_batching(
+			max_batch_size=config.get('MICRO_BATCH_MAX_SIZE'),
+			max_wait_ms=config.get('MICRO_BATCH_MAX_WAIT_MS')
+		)
+	return analyzer
 
 def get_analyzer():
-	"""Get or create a singleton instance of the sentiment analyzer."""
+	"""
+	Get or create a singleton instance of the sentiment analyzer.
+	
+	When INFERENCE_URL is set this is a client for a shared inference server
+	instead of a local model.
+	"""
 	global _sentiment_analyzer
 	if _sentiment_analyzer is None:
-		_sentiment_analyzer = SentimentAnalyzer()
+		# Concurrent first callers wait here instead of each loading the model
+		with _analyzer_lock:
+			if _sentiment_analyzer is None:
+				config = get_config()
+				if config.get('INFERENCE_URL'):
+					from .inference_client import RemoteSentimentAnalyzer
+					_sentiment_analyzer = RemoteSentimentAnalyzer(config.get('INFERENCE_URL'), timeout=config.get('INFERENCE_TIMEOUT'))
+				else:
+					_sentiment_analyzer = create_local_analyzer()
 	return _sentiment_analyzer
 
+def configured_model_identity() -> str:
+	"""
+	model_identity of the shared analyzer, without loading the model.
+	
+	Read from the analyzer once it exists, otherwise derived from the
+	SENTIMENT_BACKEND and SENTIMENT_QUANTIZE settings, so callers can build
+	cache keys before (or without) the model loading.
+	"""
+	if _sentiment_analyzer is not None:
+		return _sentiment_analyzer.model_identity
+	config = get_config()
+	if config.get('INFERENCE_URL'):
+		return get_analyzer().model_identity
+	return f"{Config.SENTIMENT_MODEL}@{backend_name(config.get('SENTIMENT_BACKEND'), config.get('SENTIMENT_QUANTIZE'))}"
+
 def reset_analyzer():
 	"""Reset the singleton analyzer (useful for testing or model changes)."""
-	global _sentiment_analyzer
-	_sentiment_analyzer = None
+	global _sentiment_analyzer, _warmup_thread
+	with _analyzer_lock:
+		if _sentiment_analyzer is not None:
+			_sentiment_analyzer.disable_micro_batching()
+		_sentiment_analyzer = None
+		_warmup_thread = None
+		_model_status.update(state=ModelState.NOT_LOADED, error=None, load_seconds=None, warmup_seconds=None)
+		_ready_event.clear()
+
+def warm_up_analyzer(rounds: int = 3, analyzer: Optional[SentimentAnalyzer] = None):
+	"""
+	Load the singleton analyzer and run a few dummy batches through it.
+	
+	The first forward passes pay for lazy allocations and kernel selection;
+	doing them here keeps that cost away from the first real request.
+	
+	Args:
+		rounds: Number of warm-up passes over the dummy texts
+		analyzer: Warm this analyzer instead of the singleton
+	"""
+	try:
+		_model_status["state"] = ModelState.LOADING
+		start = time.perf_counter()
+		analyzer = analyzer or get_analyzer()
+		_model_status["load_seconds"] = round(time.perf_counter() - start, 2)
+		
+		_model_status["state"] = ModelState.WARMING
+		start = time.perf_counter()
+		for _ in range(rounds):
+			analyzer.analyze_batch(_WARMUP_TEXTS)
+			analyzer.analyze(_WARMUP_TEXTS[1])
+		_model_status["warmup_seconds"] = round(time.perf_counter() - start, 2)
+		
+		_model_status["state"] = ModelState.READY
+		print(f"Sentiment model ready (load {_model_status['load_seconds']}s, warm-up {_model_status['warmup_seconds']}s)")
+	except Exception as e:
+		_model_status["state"] = ModelState.FAILED
+		_model_status["error"] = str(e)
+		format_error(f"Sentiment model warm-up failed: {str(e)}")
+	finally:
+		# Waiters are released either way; after a failure they fall back to lazy loading
+		_ready_event.set()
+
+def start_background_warmup(rounds: int = 3) -> threading.Thread:
+	"""Start warm_up_analyzer() on a daemon thread (only once per process)."""
+	global _warmup_thread
+	with _analyzer_lock:
+		if _warmup_thread is None:
+			_model_status["state"] = ModelState.LOADING
+			_warmup_thread = threading.Thread(target=warm_up_analyzer, args=(rounds,), name="sentiment-warmup", daemon=True)
+			_warmup_thread.start()
+	return _warmup_thread
+
+def wait_for_analyzer(timeout: Optional[float] = None) -> bool:
+	"""
+	Block until a started warm-up has finished.
+	
+	Returns:
+		bool: False if the timeout expired while the model was still loading or warming
+	"""
+	if _model_status["state"] == ModelState.NOT_LOADED:
+		return True
+	return _ready_event.wait(timeout)
+
+def get_model_status() -> Dict:
+	"""Current readiness of the shared analyzer."""
+	status = dict(_model_status)
+	status["state"] = status["state"].value
+	status["ready"] = _model_status["state"] == ModelState.READY
+	return status
 
-def analyze_sentiment(text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None, verbose: bool = True) -> Dict:
+def analyze_sentiment(text: str, speaker_id: Optional[str] = None, context_window: Optional[List[str]] = None, verbose: bool = True,
+                      features: Optional[UtteranceFeatures] = None) -> Dict:
     """
     Analyze the sentiment of the given text using the singleton analyzer.
     
@@ -214,13 +630,24 @@ def analyze_sentiment(text: str, speaker_id: Optional[str] = None, context_windo
         speaker_id: Optional speaker identifier for personalized analysis
         context_window: Optional list of previous utterances for context
         verbose: Whether to print formatted output (default: True)
+        features: Precomputed UtteranceFeatures of text, passed on to the classifier
+    
+    Results without a context window are served from the result cache
+    when RESULT_CACHE_ENABLED is set.
     
     Returns:
         dict: Analysis results
     """
     try:
         analyzer = get_analyzer()
-        result = analyzer.analyze(text, speaker_id, context_window)
+        if context_window:
+            # Narrative context makes the result depend on more than the text itself
+            result = analyzer.analyze(text, speaker_id, context_window, features=features)
+        else:
+            result = cached_analysis(
+                text, 'transformer', analyzer.model_identity, analyzer.pattern_set_version,
+                lambda: analyzer.analyze(text, speaker_id, features=features)
+            )
         
         if verbose:
             format_sentiment_result(result)
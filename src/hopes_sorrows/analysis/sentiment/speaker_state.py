@@ -0,0 +1,266 @@
+"""
+Bounded, persistent per-speaker state for the pattern classifier.
+
+The classifier keeps calibration factors and a short narrative arc (the
+most recent categories) for every speaker. SpeakerStateStore holds them in
+an LRU of at most max_speakers speakers, each with a fixed-size ring buffer
+of categories, so memory stays flat however many speakers an installation
+sees. With a database path (SPEAKER_STATE_PERSIST, off by default) changes
+are written behind to the speaker_profiles / narrative_arcs tables of
+DatabaseSchema by a background thread, which keeps history_size arc entries
+per speaker there too, and a speaker evicted from memory (or seen after a
+restart) is reloaded from there. All classifiers share one store through
+get_speaker_state_store().
+
+Every speaker has its own lock, and the store lock is only held to look a
+speaker up or to append to the pending-write log, so requests for different
+speakers never wait on each other. locked() holds one speaker's lock across
+several calls, which makes a whole classification atomic for that speaker.
+"""
+
+import atexit
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ...core.config import get_config
+from ...data.schema import DatabaseSchema
+
+class _SpeakerState:
+	"""Calibration factors and recent categories of one speaker, guarded by its own lock."""
+
+	__slots__ = ("lock", "loaded", "users", "calibration", "history", "sequence")
+
+	def __init__(self):
+		self.lock = threading.RLock()
+		self.loaded = False
+		self.users = 0  # Callers holding or waiting for the state; a speaker in use is never evicted
+		self.calibration: Dict[str, float] = {}
+		self.history = deque()
+		self.sequence = 0  # Sequence number of the latest narrative arc entry
+
+class SpeakerStateStore:
+	"""LRU of per-speaker calibration factors and narrative-arc ring buffers with write-behind persistence."""
+
+	def __init__(self, categories: Iterable[str], max_speakers: int = 1000, history_size: int = 5,
+				 db_path: Optional[Union[str, Path]] = None, flush_interval: float = 5.0):
+		"""
+		Create the store.
+
+		Args:
+			categories: Category names; new speakers start with a factor of 1.0 for each
+			max_speakers: Speakers kept in memory before the least recently used are evicted
+			history_size: Categories kept per speaker (the narrative arc window)
+			db_path: SQLite file for persistence (None keeps state in memory only)
+			flush_interval: Seconds between background writes of pending changes
+		"""
+		if max_speakers < 1:
+			raise ValueError("max_speakers must be at least 1")
+		if history_size < 1:
+			raise ValueError("history_size must be at least 1")
+
+		self.categories = list(categories)
+		self.max_speakers = max_speakers
+		self.history_size = history_size
+		self.flush_interval = flush_interval
+		self.evictions = 0
+
+		# The store lock guards the LRU and the pending-write log; each speaker's state has its own lock
+		self._speakers: "OrderedDict[str, _SpeakerState]" = OrderedDict()
+		self._lock = threading.Lock()
+		# Changes not yet written: speaker -> calibration factors, and (speaker, sequence, category) rows
+		self._dirty_profiles: Dict[str, Dict[str, float]] = {}
+		self._pending_arcs: List[Tuple[str, int, str]] = []
+		self._pending_speakers = set()
+		# Held while writing, so a speaker is never loaded from the database halfway through a flush
+		self._write_lock = threading.Lock()
+
+		self._schema = None
+		self._closed = threading.Event()
+		self._thread = None
+		if db_path is not None:
+			Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+			self._schema = DatabaseSchema(str(db_path))
+			self._thread = threading.Thread(target=self._run, name="speaker-state-writer", daemon=True)
+			self._thread.start()
+
+	def __len__(self) -> int:
+		return len(self._speakers)
+
+	def __contains__(self, speaker_id: str) -> bool:
+		return speaker_id in self._speakers
+
+	@contextmanager
+	def locked(self, speaker_id: str) -> Iterator[None]:
+		"""Hold the speaker's lock, making the store calls made inside atomic for that speaker."""
+		with self._speaker(speaker_id):
+			yield
+
+	def calibration(self, speaker_id: str) -> Dict[str, float]:
+		"""Copy of the speaker's calibration factors by category name."""
+		with self._speaker(speaker_id) as state:
+			return dict(state.calibration)
+
+	def scale_calibration(self, speaker_id: str, category: str, factor: float) -> float:
+		"""Multiply one calibration factor of the speaker by factor and return the new value."""
+		with self._speaker(speaker_id) as state:
+			state.calibration[category] *= factor
+			if self._schema is not None:
+				with self._lock:
+					self._dirty_profiles[speaker_id] = dict(state.calibration)
+					self._pending_speakers.add(speaker_id)
+			return state.calibration[category]
+
+	def append_category(self, speaker_id: str, category: str) -> List[str]:
+		"""Record a category in the speaker's narrative arc and return the recent categories, oldest first."""
+		with self._speaker(speaker_id) as state:
+			state.history.append(category)
+			state.sequence += 1
+			if self._schema is not None:
+				with self._lock:
+					self._pending_arcs.append((speaker_id, state.sequence, category))
+					self._pending_speakers.add(speaker_id)
+			return list(state.history)
+
+	def history(self, speaker_id: str) -> List[str]:
+		"""Recent categories of the speaker, oldest first."""
+		with self._speaker(speaker_id) as state:
+			return list(state.history)
+
+	def flush(self):
+		"""Write pending profile and narrative arc changes in one transaction."""
+		if self._schema is None:
+			return
+		with self._write_lock:
+			self._flush_pending()
+
+	def close(self):
+		"""Stop the background writer and write what is pending."""
+		if not self._closed.is_set():
+			self._closed.set()
+			if self._thread is not None:
+				self._thread.join()
+			self.flush()
+
+	def stats(self) -> Dict:
+		"""Memory and persistence counters."""
+		with self._lock:
+			return {
+				"speakers": len(self._speakers),
+				"max_speakers": self.max_speakers,
+				"history_size": self.history_size,
+				"evictions": self.evictions,
+				"pending_profiles": len(self._dirty_profiles),
+				"pending_arcs": len(self._pending_arcs),
+				"persistent": self._schema is not None,
+			}
+
+	@contextmanager
+	def _speaker(self, speaker_id: str) -> Iterator[_SpeakerState]:
+		"""Yield the speaker's state with its lock held, loading it on first use."""
+		with self._lock:
+			state = self._speakers.get(speaker_id)
+			if state is None:
+				state = self._speakers[speaker_id] = _SpeakerState()
+			else:
+				self._speakers.move_to_end(speaker_id)
+			state.users += 1
+			self._evict()
+		try:
+			with state.lock:
+				if not state.loaded:
+					self._load(speaker_id, state)
+				yield state
+		finally:
+			with self._lock:
+				state.users -= 1
+
+	def _evict(self):
+		"""Drop least recently used speakers that nobody is using. Caller holds the store lock."""
+		excess = len(self._speakers) - self.max_speakers
+		if excess <= 0:
+			return
+		idle = list(islice((speaker_id for speaker_id, state in self._speakers.items() if state.users == 0), excess))
+		for speaker_id in idle:
+			del self._speakers[speaker_id]
+		self.evictions += len(idle)
+
+	def _load(self, speaker_id: str, state: _SpeakerState):
+		"""Fill a new state from the database, or with defaults. Caller holds the speaker's lock."""
+		state.calibration = {category: 1.0 for category in self.categories}
+		state.history = deque(maxlen=self.history_size)
+		state.sequence = 0
+		if self._schema is not None:
+			with self._write_lock:
+				# Changes of an evicted speaker may still be pending; they must be on disk first
+				if speaker_id in self._pending_speakers:
+					self._flush_pending()
+				stored = self._schema.get_speaker_profile(speaker_id)
+				entries = self._schema.get_narrative_arc(speaker_id, limit=self.history_size)
+			if stored:
+				state.calibration.update(stored)
+			else:
+				with self._lock:
+					self._dirty_profiles.setdefault(speaker_id, dict(state.calibration))
+					self._pending_speakers.add(speaker_id)
+			if entries:
+				state.sequence = entries[0]["sequence_number"]
+				state.history.extend(entry["category"] for entry in reversed(entries))
+		state.loaded = True
+
+	def _flush_pending(self):
+		"""Take the pending-write log and write it. Caller holds the write lock."""
+		with self._lock:
+			if not self._dirty_profiles and not self._pending_arcs:
+				return
+			profiles, arcs = self._dirty_profiles, self._pending_arcs
+			self._dirty_profiles, self._pending_arcs, self._pending_speakers = {}, [], set()
+		try:
+			self._schema.save_speaker_states(profiles, arcs, keep_arcs=self.history_size)
+		except Exception:
+			# Keep the changes for the next attempt; newer profile values win
+			with self._lock:
+				profiles.update(self._dirty_profiles)
+				self._dirty_profiles = profiles
+				self._pending_arcs = arcs + self._pending_arcs
+				self._pending_speakers.update(profiles)
+				self._pending_speakers.update(row[0] for row in arcs)
+			raise
+
+	def _run(self):
+		"""Background writer: flush pending changes every flush_interval seconds until closed."""
+		while not self._closed.wait(self.flush_interval):
+			try:
+				self.flush()
+			except Exception as e:
+				print(f"Speaker state: write failed, will retry ({e})")
+
+# Singleton pattern for efficient reuse
+_speaker_state_store = None
+_speaker_state_lock = threading.Lock()
+
+def get_speaker_state_store(categories: Iterable[str]) -> SpeakerStateStore:
+	"""
+	Get the speaker state store shared by every classifier.
+
+	Kept in memory only unless SPEAKER_STATE_PERSIST is on, in which case it is
+	persisted to SPEAKER_STATE_PATH and pending changes are written at
+	interpreter exit.
+	"""
+	global _speaker_state_store
+	if _speaker_state_store is None:
+		with _speaker_state_lock:
+			if _speaker_state_store is None:
+				config = get_config()
+				_speaker_state_store = SpeakerStateStore(
+					categories,
+					max_speakers=config.get('SPEAKER_STATE_MAX_SPEAKERS'),
+					history_size=config.get('SPEAKER_STATE_HISTORY'),
+					db_path=config.get('SPEAKER_STATE_PATH') if config.get('SPEAKER_STATE_PERSIST') else None,
+					flush_interval=config.get('SPEAKER_STATE_FLUSH_SECONDS')
+				)
+				atexit.register(_speaker_state_store.close)
+	return _speaker_state_store
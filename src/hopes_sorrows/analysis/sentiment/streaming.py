@@ -0,0 +1,121 @@
+"""
+Streaming analysis for corpus-scale jobs.
+
+analyze_stream() pulls (id, text, speaker_id) records lazily from any
+iterable - a JSONL file, a database query, a generator - analyzes them in
+fixed-size batches and yields results in input order. At most one batch of
+records and results is held in memory at a time. Given an EmbeddingStore,
+the pooled hidden states of the same forward passes are persisted by
+record id as the stream goes.
+"""
+
+import json
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .sa_transformers import get_analyzer
+from .combined_analyzer import analyze_sentiment_combined
+from ...core.config import get_config
+from ...data.embedding_store import EmbeddingStore
+
+Record = Tuple  # (record_id, text) or (record_id, text, speaker_id)
+
+def _unpack_record(record: Record) -> Tuple:
+	"""Normalize a record to (record_id, text, speaker_id)."""
+	if len(record) == 2:
+		record_id, text = record
+		return record_id, text, None
+	if len(record) == 3:
+		return tuple(record)
+	raise ValueError(f"Records must be (id, text) or (id, text, speaker_id) tuples, got {len(record)} fields")
+
+def analyze_stream(records: Iterable[Record], batch_size: int = 64, analyzer=None,
+				   combined: bool = False, use_llm: bool = False,
+				   embedding_store=None) -> Iterator[Tuple[object, Dict]]:
+	"""
+	Analyze a stream of records, yielding (record_id, result) in input order.
+
+	Args:
+		records: Iterable of (id, text) or (id, text, speaker_id) tuples, consumed lazily
+		batch_size: Records pulled from the input and analyzed together
+		analyzer: Object with analyze_batch(texts, speaker_ids) (defaults to the transformer singleton)
+		combined: Use analyze_sentiment_combined per record instead of the batched transformer
+		use_llm: Include the LLM in combined mode
+		embedding_store: Optional EmbeddingStore receiving each record's embedding under its id
+
+	Yields:
+		tuple: (record_id, analysis result dict)
+	"""
+	if batch_size < 1:
+		raise ValueError("batch_size must be at least 1")
+
+	iterator = iter(records)
+	if not combined or embedding_store is not None:
+		analyzer = analyzer or get_analyzer()
+
+	while True:
+		batch = [_unpack_record(record) for record in islice(iterator, batch_size)]
+		if not batch:
+			return
+
+		ids, texts, speaker_ids = zip(*batch)
+		if combined:
+			results = [
+				analyze_sentiment_combined(text, speaker_id, use_llm=use_llm, verbose=False)
+				for text, speaker_id in zip(texts, speaker_ids)
+			]
+			if embedding_store is not None:
+				embedding_store.add(ids, analyzer.embed(list(texts)))
+		elif embedding_store is not None:
+			results = analyzer.analyze_batch(list(texts), list(speaker_ids), return_embeddings=True)
+			embedding_store.add(ids, [result.pop("embedding") for result in results])
+		else:
+			results = analyzer.analyze_batch(list(texts), list(speaker_ids))
+
+		yield from zip(ids, results)
+
+def open_embedding_store(analyzer=None, directory: Optional[Union[str, Path]] = None) -> EmbeddingStore:
+	"""
+	Open (or create) the embedding store for the analyzer's model.
+
+	Args:
+		analyzer: Analyzer whose embeddings go into the store (defaults to the transformer singleton)
+		directory: Store directory (defaults to EMBEDDING_STORE_DIR)
+	"""
+	analyzer = analyzer or get_analyzer()
+	dim = analyzer.embed(["Hello"]).shape[1]
+	return EmbeddingStore(directory or get_config().get('EMBEDDING_STORE_DIR'), dim=dim, model_identity=analyzer.model_name)
+
+def read_jsonl_records(path: Union[str, Path], id_field: str = "id", text_field: str = "text",
+					   speaker_field: Optional[str] = "speaker_id") -> Iterator[Record]:
+	"""
+	Lazily read (id, text, speaker_id) records from a JSONL file.
+
+	Blank lines are skipped. Lines without an id field use their line number.
+
+	Args:
+		path: JSONL file with one object per line
+		id_field: Key holding the record id
+		text_field: Key holding the text
+		speaker_field: Key holding the speaker id (None to ignore speakers)
+	"""
+	with open(path, "r", encoding="utf-8") as f:
+		for line_number, line in enumerate(f, 1):
+			if not line.strip():
+				continue
+			try:
+				row = json.loads(line)
+			except json.JSONDecodeError as e:
+				raise ValueError(f"{path}:{line_number}: invalid JSON ({e})")
+			speaker_id = row.get(speaker_field) if speaker_field else None
+			yield row.get(id_field, line_number), row[text_field], speaker_id
+
+def json_default(value):
+	"""json.dumps default= for result dicts: numpy scalars and arrays become lists/numbers, enums their values."""
+	if isinstance(value, Enum):
+		return value.value
+	if hasattr(value, "tolist"):
+		return value.tolist()
+	raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,84 @@
+"""
+Single-pass text normalization for the pattern classifier.
+
+The classifier lowercases text, fixes common transcription errors, maps a
+few past-tense verbs to their present form and collapses whitespace before
+matching patterns. TextNormalizer compiles every replacement into one
+alternation with a lookup table, so all of that happens in one scan of the
+text. Replacement tables are plain data: adding a fix is one more entry,
+not one more pass.
+"""
+
+import re
+from typing import Dict, Iterable, Mapping, Optional
+
+# Common speech-to-text errors: phrase -> replacement
+TRANSCRIPTION_FIXES: Dict[str, str] = {
+	"of the past": "over the past",
+	"of my": "over my",
+	"of time": "over time",
+	"thru": "through",
+	"u": "you",
+	"ur": "your",
+	"cuz": "because",
+}
+
+# Past tense of key reflective verbs -> present tense
+TENSE_NORMALIZATIONS: Dict[str, str] = {
+	"realized": "realize",
+	"learned": "learn",
+	"understood": "understand",
+	"recognized": "recognize",
+	"discovered": "discover",
+	"found": "find",
+	"thought": "think",
+	"felt": "feel",
+	"saw": "see",
+	"knew": "know",
+}
+
+class TextNormalizer:
+	"""Lowercases, applies whole-word replacement tables and collapses whitespace in one scan."""
+
+	def __init__(self, tables: Optional[Iterable[Mapping[str, str]]] = None):
+		"""
+		Compile the replacement tables.
+
+		Args:
+			tables: Mappings of lowercase whole-word phrases to replacements
+				(defaults to TRANSCRIPTION_FIXES and TENSE_NORMALIZATIONS)
+
+		Every phrase is matched against the original text, so a replacement is
+		never rewritten again. A replacement that another phrase would match is
+		rejected, since applying the tables one after the other would give a
+		different result.
+		"""
+		if tables is None:
+			tables = (TRANSCRIPTION_FIXES, TENSE_NORMALIZATIONS)
+		self.replacements: Dict[str, str] = {}
+		for table in tables:
+			for phrase, replacement in table.items():
+				if phrase != phrase.lower():
+					raise ValueError(f"Normalization phrases must be lowercase: {phrase!r}")
+				# First table wins, as the first of the sequential passes did
+				self.replacements.setdefault(phrase, replacement)
+
+		# Longest first so a phrase is never cut short by one of its prefixes
+		phrases = sorted(self.replacements, key=len, reverse=True)
+		self._phrases = re.compile(r"\b(?:" + "|".join(re.escape(phrase) for phrase in phrases) + r")\b") if phrases else None
+		if self._phrases is not None:
+			for phrase, replacement in self.replacements.items():
+				if self._phrases.search(replacement):
+					raise ValueError(f"Replacement {replacement!r} for {phrase!r} would be rewritten again")
+
+		# One alternation: group 1 is a phrase, otherwise a whitespace run
+		pattern = r"\s+" if self._phrases is None else f"({self._phrases.pattern})|\\s+"
+		self._scanner = re.compile(pattern)
+
+	def normalize(self, text: str) -> str:
+		"""Return the lowercased, rewritten, whitespace-collapsed text."""
+		replacements = self.replacements
+		return self._scanner.sub(
+			lambda match: replacements[match.group(1)] if match.group(1) else " ",
+			text.lower()
+		).strip()
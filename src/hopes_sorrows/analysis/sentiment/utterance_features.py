@@ -0,0 +1,113 @@
+"""
+Per-utterance text features shared by every pipeline stage.
+
+Ingest, the combined analyzer, the transformer and LLM analyzers and the
+pattern classifier all need the same derivations of an utterance: its
+stripped and lowercased text, its tokens, the nonsense check, the
+classifier's normalized text and pattern hits. UtteranceFeatures computes
+each of them on first use and keeps it, so passing one object through
+analyze_audio -> combined analyzer -> classifier runs every derivation once
+per utterance however many stages ask for it.
+"""
+
+import re
+from collections import Counter
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+# Short words that are real speech on their own
+COMMON_SHORT_WORDS = frozenset(['yes', 'no', 'ok', 'hi', 'bye', 'wow', 'oh', 'ah', 'um', 'uh', 'you'])
+
+# Shapes of noise and transcription errors
+NONSENSE_PATTERNS = [
+	re.compile(r'^[a-z]{1,3}\.{3,}$'),  # Single letters with dots like "a..."
+	re.compile(r'^[a-z\s]{1,10}\.$'),   # Very short with just a period
+	re.compile(r'^[^a-zA-Z\s]*$'),      # No letters at all (symbols only)
+	re.compile(r'^[a-z]\s[a-z]\s[a-z](\s[a-z])*$'),  # Only single letters separated by spaces (like "a b c d")
+]
+
+class UtteranceFeatures:
+	"""Lazily computed, cached text features of one utterance."""
+
+	def __init__(self, text: str):
+		"""
+		Args:
+			text: The utterance text as transcribed
+		"""
+		self.text = text or ""
+		# Classifier derivations, keyed by the normalizer / pattern set version that produced them
+		self._normalized: Dict[object, str] = {}
+		self._pattern_hits: Dict[str, List[Tuple[int, float]]] = {}
+
+	@classmethod
+	def of(cls, text: str, features: "UtteranceFeatures" = None) -> "UtteranceFeatures":
+		"""Return features when they were built for the same (stripped) text, otherwise build them."""
+		if features is not None and features.text_clean == (text or "").strip():
+			return features
+		return cls(text)
+
+	@cached_property
+	def text_clean(self) -> str:
+		"""Text without surrounding whitespace."""
+		return self.text.strip()
+
+	@cached_property
+	def text_lower(self) -> str:
+		"""Stripped, lowercased text."""
+		return self.text_clean.lower()
+
+	@cached_property
+	def tokens(self) -> List[str]:
+		"""Whitespace-separated lowercase words."""
+		return self.text_lower.split()
+
+	@cached_property
+	def word_counts(self) -> Counter:
+		"""Occurrences of every token."""
+		return Counter(self.tokens)
+
+	@cached_property
+	def non_alpha_ratio(self) -> float:
+		"""Share of the stripped text's characters that are neither letters nor whitespace."""
+		if not self.text_clean:
+			return 0.0
+		non_alpha_count = sum(1 for char in self.text_clean if not char.isalpha() and not char.isspace())
+		return non_alpha_count / len(self.text_clean)
+
+	@cached_property
+	def is_nonsensical(self) -> bool:
+		"""Whether the text looks like noise or a transcription error."""
+		words = self.tokens
+
+		# Very short single words that aren't common speech
+		if len(words) == 1 and len(self.text_lower) < 4 and self.text_lower not in COMMON_SHORT_WORDS:
+			return True
+
+		# Repetitive patterns (like "la la la", "tick tock tick tock")
+		if len(words) >= 3:
+			unique_words = len(self.word_counts)
+			# Very few unique words repeated many times (like "la la la la")
+			if unique_words <= 2 and len(words) >= 4:
+				return True
+			# Moderate repetition with simple words: any word 3+ times (like "tick tock tick tock la la la")
+			if unique_words <= 3 and len(words) >= 6 and max(self.word_counts.values()) >= 3:
+				return True
+
+		if any(pattern.match(self.text_lower) for pattern in NONSENSE_PATTERNS):
+			return True
+
+		# More than 50% non-alphabetic
+		return self.non_alpha_ratio > 0.5
+
+	def normalized(self, normalizer) -> str:
+		"""Classification text produced by a TextNormalizer, computed once per normalizer."""
+		if normalizer not in self._normalized:
+			self._normalized[normalizer] = normalizer.normalize(self.text_clean)
+		return self._normalized[normalizer]
+
+	def pattern_hits(self, classifier) -> List[Tuple[int, float]]:
+		"""(pattern index, context multiplier) hits of the classifier's patterns on the normalized text, once per pattern set."""
+		version = classifier.pattern_set_version
+		if version not in self._pattern_hits:
+			self._pattern_hits[version] = classifier._pattern_hits(self.normalized(classifier.text_normalizer))
+		return self._pattern_hits[version]
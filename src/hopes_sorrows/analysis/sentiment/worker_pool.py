@@ -0,0 +1,128 @@
+"""
+Multi-process worker pool for bulk transformer analysis.
+
+The model is loaded once in the parent process. Worker processes are forked
+from it and inherit the weights copy-on-write, so N workers cost roughly one
+copy of the model in memory. Each worker limits its own torch thread count
+so the pool as a whole does not oversubscribe the cores.
+"""
+
+import gc
+import os
+import multiprocessing
+from typing import Dict, List, Optional
+
+import torch
+
+from .sa_transformers import get_analyzer, SentimentAnalyzer
+from ...core.config import get_config
+from ...core.exceptions import ConfigurationError
+
+# Analyzer inherited by forked workers (set in the parent right before forking)
+_pool_analyzer = None
+
+def _init_worker(threads_per_worker: int):
+	"""Limit intra-op parallelism inside each worker."""
+	os.environ["TOKENIZERS_PARALLELISM"] = "false"
+	torch.set_num_threads(threads_per_worker)
+	try:
+		torch.set_num_interop_threads(1)
+	except RuntimeError:
+		# Already fixed once parallel work has run in the parent; the intra-op limit is what matters
+		pass
+
+def _analyze_chunk(chunk):
+	"""Analyze one chunk of (texts, speaker_ids) in a worker process."""
+	texts, speaker_ids = chunk
+	return _pool_analyzer.analyze_batch(texts, speaker_ids)
+
+class TransformerWorkerPool:
+	"""Spreads analyze_batch() work over forked processes sharing one loaded model."""
+
+	def __init__(self, analyzer=None, workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+				 chunk_size: int = 32):
+		"""
+		Fork the worker processes.
+
+		Args:
+			analyzer: Loaded SentimentAnalyzer to share (defaults to the singleton)
+			workers: Number of worker processes (defaults to SENTIMENT_WORKERS, or the CPU count)
+			threads_per_worker: Torch threads per worker (defaults to CPU count / workers)
+			chunk_size: Texts sent to a worker per task
+
+		Speaker-specific classifier state (calibration, narrative arcs) lives in
+		each worker's copy of the analyzer and is not merged back into the parent.
+		"""
+		global _pool_analyzer
+
+		if "fork" not in multiprocessing.get_all_start_methods():
+			raise ConfigurationError("The transformer worker pool requires the 'fork' start method")
+
+		analyzer = analyzer or get_analyzer()
+		if not isinstance(analyzer, SentimentAnalyzer):
+			raise ConfigurationError("The transformer worker pool needs a local model (unset INFERENCE_URL)")
+		if not analyzer.backend.name.startswith("torch"):
+			raise ConfigurationError(f"The transformer worker pool only supports the torch backend, not '{analyzer.backend.name}'")
+
+		cpu_count = os.cpu_count() or 1
+		self.workers = workers or get_config().get('SENTIMENT_WORKERS') or cpu_count
+		self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.workers)
+		self.chunk_size = max(1, chunk_size)
+
+		# The micro-batcher thread would not exist in the children
+		analyzer.disable_micro_batching()
+		_pool_analyzer = analyzer
+
+		# Move everything allocated so far out of the collector's reach so the
+		# children don't dirty the shared pages just by running a GC pass
+		gc.collect()
+		gc.freeze()
+		try:
+			context = multiprocessing.get_context("fork")
+			self._pool = context.Pool(
+				processes=self.workers,
+				initializer=_init_worker,
+				initargs=(self.threads_per_worker,)
+			)
+		finally:
+			gc.unfreeze()
+
+	def analyze(self, texts: List[str], speaker_ids: Optional[List[Optional[str]]] = None) -> List[Dict]:
+		"""
+		Analyze texts across the workers.
+
+		Args:
+			texts: The texts to analyze
+			speaker_ids: Optional speaker identifier per text
+
+		Returns:
+			list: One analysis result dict per input text, in input order
+		"""
+		if speaker_ids is None:
+			speaker_ids = [None] * len(texts)
+		elif len(speaker_ids) != len(texts):
+			raise ValueError("speaker_ids must have the same length as texts")
+
+		chunks = [
+			(texts[start:start + self.chunk_size], speaker_ids[start:start + self.chunk_size])
+			for start in range(0, len(texts), self.chunk_size)
+		]
+		results = []
+		for chunk_results in self._pool.imap(_analyze_chunk, chunks):
+			results.extend(chunk_results)
+		return results
+
+	def close(self):
+		"""Stop the worker processes."""
+		self._pool.close()
+		self._pool.join()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		if exc_type is None:
+			self.close()
+		else:
+			self._pool.terminate()
+			self._pool.join()
@@ -46,9 +46,45 @@ class Config:
             
             # Model Configuration
             'SENTIMENT_MODEL': os.getenv('SENTIMENT_MODEL', 'j-hartmann/emotion-english-distilroberta-base'),
+            'SENTIMENT_BACKEND': os.getenv('SENTIMENT_BACKEND', 'torch'),  # torch, torchscript or onnx
+            'SENTIMENT_QUANTIZE': os.getenv('SENTIMENT_QUANTIZE', 'false').lower() == 'true',  # int8 linear layers (torch, CPU)
             'LLM_MODEL': os.getenv('LLM_MODEL', 'gpt-4o-mini'),
             'TOKENIZERS_PARALLELISM': os.getenv('TOKENIZERS_PARALLELISM', 'false'),
             
+            # Shared inference server (clients use it instead of loading the model when INFERENCE_URL is set)
+            'INFERENCE_URL': os.getenv('INFERENCE_URL', ''),
+            'INFERENCE_TIMEOUT': float(os.getenv('INFERENCE_TIMEOUT', '30')),
+            'INFERENCE_HOST': os.getenv('INFERENCE_HOST', '127.0.0.1'),
+            'INFERENCE_PORT': int(os.getenv('INFERENCE_PORT', '5055')),
+            
+            # Inference Batching (coalesces concurrent transformer calls)
+            'MICRO_BATCHING_ENABLED': os.getenv('MICRO_BATCHING_ENABLED', 'true').lower() == 'true',
+            'MICRO_BATCH_MAX_SIZE': int(os.getenv('MICRO_BATCH_MAX_SIZE', '16')),
+            'MICRO_BATCH_MAX_WAIT_MS': float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', '10')),
+            'MODEL_WARMUP_ENABLED': os.getenv('MODEL_WARMUP_ENABLED', 'true').lower() == 'true',
+            'MODEL_READY_TIMEOUT': float(os.getenv('MODEL_READY_TIMEOUT', '120')),  # seconds an upload waits for warm-up
+            'SENTIMENT_WORKERS': int(os.getenv('SENTIMENT_WORKERS', '0')),  # bulk worker processes, 0 = CPU count
+            
+            # Lexical cascade (skip the models when the pattern classifier is decisive)
+            'CASCADE_ENABLED': os.getenv('CASCADE_ENABLED', 'false').lower() == 'true',
+            'CASCADE_MARGIN_THRESHOLD': float(os.getenv('CASCADE_MARGIN_THRESHOLD', '0.8')),
+            'CASCADE_AUDIT_RATE': float(os.getenv('CASCADE_AUDIT_RATE', '0.05')),  # share of fast-path hits re-run in full
+            
+            # Classifier pattern matching ('bounded' caps '.*' gaps at PATTERN_GAP_TOKENS tokens, 'exact' keeps them unbounded)
+            'PATTERN_MATCH_MODE': os.getenv('PATTERN_MATCH_MODE', 'bounded').lower(),
+            'PATTERN_GAP_TOKENS': int(os.getenv('PATTERN_GAP_TOKENS', '20')),
+            
+            # Speaker state shared by the classifiers (LRU of speakers, written behind to SQLite)
+            'SPEAKER_STATE_MAX_SPEAKERS': int(os.getenv('SPEAKER_STATE_MAX_SPEAKERS', '1000')),
+            'SPEAKER_STATE_HISTORY': int(os.getenv('SPEAKER_STATE_HISTORY', '5')),  # categories kept per speaker for the narrative arc
+            'SPEAKER_STATE_PERSIST': os.getenv('SPEAKER_STATE_PERSIST', 'false').lower() == 'true',  # opt-in: keep speaker state across restarts
+            'SPEAKER_STATE_FLUSH_SECONDS': float(os.getenv('SPEAKER_STATE_FLUSH_SECONDS', '5')),
+            
+            # Result Cache (memory LRU in front of a SQLite store)
+            'RESULT_CACHE_ENABLED': os.getenv('RESULT_CACHE_ENABLED', 'true').lower() == 'true',
+            'RESULT_CACHE_MEMORY_SIZE': int(os.getenv('RESULT_CACHE_MEMORY_SIZE', '1024')),
+            'RESULT_CACHE_MAX_ENTRIES': int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '50000')),
+            
             # Analysis Thresholds
             'SENTIMENT_THRESHOLD_HOPE': float(os.getenv('SENTIMENT_THRESHOLD_HOPE', '0.2')),
             'SENTIMENT_THRESHOLD_SORROW': float(os.getenv('SENTIMENT_THRESHOLD_SORROW', '-0.1')),
@@ -60,6 +96,11 @@ class Config:
             'DATA_DIR': Path('data'),
             'RECORDINGS_DIR': Path('data/recordings'),
             'DATABASES_DIR': Path('data/databases'),
+            'ONNX_CACHE_DIR': Path(os.getenv('ONNX_CACHE_DIR', 'data/models/onnx')),
+            'TORCHSCRIPT_CACHE_DIR': Path(os.environ['TORCHSCRIPT_CACHE_DIR']) if os.getenv('TORCHSCRIPT_CACHE_DIR') else None,  # None = next to the HF cache
+            'RESULT_CACHE_PATH': Path(os.getenv('RESULT_CACHE_PATH', 'data/databases/result_cache.db')),
+            'SPEAKER_STATE_PATH': Path(os.getenv('SPEAKER_STATE_PATH', 'data/databases/speaker_state.db')),
+            'EMBEDDING_STORE_DIR': Path(os.getenv('EMBEDDING_STORE_DIR', 'data/embeddings')),
         }
         
         # Set TOKENIZERS_PARALLELISM to avoid warnings
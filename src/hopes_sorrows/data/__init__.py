@@ -2,9 +2,10 @@
 Data management module for database operations and models.
 """
 
-from .models import Base, Speaker, Transcription, SentimentAnalysis, AnalyzerType
+from .models import Base, Speaker, Transcription, SentimentAnalysis, AnalyzerType, PatternHitRecord
 from .db_manager import DatabaseManager
 from .schema import DatabaseSchema
+from .embedding_store import EmbeddingStore
 
 __all__ = [
     'Base',
@@ -12,6 +13,8 @@ __all__ = [
     'Transcription',
     'SentimentAnalysis',
     'AnalyzerType',
+    'PatternHitRecord',
     'DatabaseManager',
-    'DatabaseSchema'
+    'DatabaseSchema',
+    'EmbeddingStore'
 ] 
\ No newline at end of file
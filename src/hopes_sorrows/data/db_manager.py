@@ -1,8 +1,8 @@
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import sessionmaker
-from .models import Base, RecordingSession, Speaker, Transcription, SentimentAnalysis, AnalyzerType
+from .models import Base, RecordingSession, Speaker, Transcription, SentimentAnalysis, AnalyzerType, PatternHitRecord
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 class DatabaseManager:
 	"""Manager class for database operations with global speaker numbering"""
@@ -158,6 +158,75 @@ class DatabaseManager:
 		"""Get all transcriptions for a specific speaker"""
 		return self.session.query(Transcription).filter_by(speaker_id=speaker_id).all()
 
+	def iter_transcription_records(self, chunk_size: int = 1000):
+		"""Stream (id, text, speaker_id) rows for all transcriptions without loading them all"""
+		query = (self.session.query(Transcription.id, Transcription.text, Transcription.speaker_id)
+				 .order_by(Transcription.id)
+				 .yield_per(chunk_size))
+		for row in query:
+			yield tuple(row)
+
+	def save_pattern_hits(self, match_version: str, records: Iterable[Tuple[int, bytes, bytes, int]]):
+		"""Store (transcription_id, pattern_ids, context_scores, flags) hit records in one transaction, replacing existing ones"""
+		rows = [
+			{
+				'transcription_id': transcription_id,
+				'match_version': match_version,
+				'pattern_ids': pattern_ids,
+				'context_scores': context_scores,
+				'flags': flags
+			}
+			for transcription_id, pattern_ids, context_scores, flags in records
+		]
+		if not rows:
+			return
+		try:
+			ids = [row['transcription_id'] for row in rows]
+			for start in range(0, len(ids), 500):
+				(self.session.query(PatternHitRecord)
+				 .filter(PatternHitRecord.match_version == match_version,
+						 PatternHitRecord.transcription_id.in_(ids[start:start + 500]))
+				 .delete(synchronize_session=False))
+			self.session.bulk_insert_mappings(PatternHitRecord, rows)
+			self.session.commit()
+		except Exception:
+			self.session.rollback()
+			raise
+
+	def get_transcriptions_without_pattern_hits(self, match_version: str, limit: int = 1000) -> List[Tuple[int, str]]:
+		"""Up to limit (id, text) rows of transcriptions with no pattern hits stored for match_version"""
+		stored = select(PatternHitRecord.transcription_id).where(PatternHitRecord.match_version == match_version)
+		query = (self.session.query(Transcription.id, Transcription.text)
+				 .filter(~Transcription.id.in_(stored))
+				 .order_by(Transcription.id)
+				 .limit(limit))
+		return [tuple(row) for row in query]
+
+	def iter_scored_pattern_hits(self, match_version: str, chunk_size: int = 1000):
+		"""Stream (analysis_id, category, score, pattern_ids, context_scores, flags) for every analysis with stored hits"""
+		query = (self.session.query(SentimentAnalysis.id, SentimentAnalysis.category, SentimentAnalysis.score,
+									PatternHitRecord.pattern_ids, PatternHitRecord.context_scores, PatternHitRecord.flags)
+				 .join(PatternHitRecord, PatternHitRecord.transcription_id == SentimentAnalysis.transcription_id)
+				 .filter(PatternHitRecord.match_version == match_version)
+				 .order_by(SentimentAnalysis.id)
+				 .yield_per(chunk_size))
+		for row in query:
+			yield tuple(row)
+
+	def update_analysis_categories(self, categories: Dict[int, str]):
+		"""Set the category of many sentiment analyses, by analysis id, in one transaction"""
+		if not categories:
+			return
+		try:
+			self.session.bulk_update_mappings(
+				SentimentAnalysis,
+				[{'id': analysis_id, 'category': category} for analysis_id, category in categories.items()]
+			)
+			self.session.commit()
+		except Exception:
+			self.session.rollback()
+			raise
+
 	def get_all_speakers(self):
 		"""Get all speakers ordered by global sequence"""
 		return self.session.query(Speaker).order_by(Speaker.global_sequence).all()
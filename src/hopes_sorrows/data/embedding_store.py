@@ -0,0 +1,184 @@
+"""
+Compact on-disk store for transcription embeddings.
+
+Vectors live in one memory-mapped float16 matrix (embeddings.f16) with a
+sidecar index (ids.jsonl) holding one id per row, and a small meta.json with
+the dimension and the model that produced them. Only the pages that are
+touched get read, so similarity search over a large corpus doesn't need the
+whole matrix in RAM.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..core.exceptions import ConfigurationError
+
+class EmbeddingStore:
+	"""float16 memory-mapped embedding matrix keyed by transcription id."""
+
+	VECTORS_FILE = "embeddings.f16"
+	IDS_FILE = "ids.jsonl"
+	META_FILE = "meta.json"
+
+	def __init__(self, directory: Union[str, Path], dim: Optional[int] = None, model_identity: Optional[str] = None,
+				 initial_capacity: int = 1024):
+		"""
+		Open or create a store.
+
+		Args:
+			directory: Directory holding the store files
+			dim: Embedding dimension (required when creating a new store)
+			model_identity: Model that produced the embeddings; opening a store
+				written by a different model raises ConfigurationError
+			initial_capacity: Rows allocated when the store is created
+		"""
+		self.directory = Path(directory)
+		self.directory.mkdir(parents=True, exist_ok=True)
+		self._lock = threading.Lock()
+
+		meta_path = self.directory / self.META_FILE
+		if meta_path.exists():
+			meta = json.loads(meta_path.read_text(encoding="utf-8"))
+			if dim is not None and dim != meta["dim"]:
+				raise ConfigurationError(f"Embedding store {self.directory} has dimension {meta['dim']}, not {dim}")
+			if model_identity is not None and meta.get("model_identity") not in (None, model_identity):
+				raise ConfigurationError(
+					f"Embedding store {self.directory} was built with {meta['model_identity']}, not {model_identity}"
+				)
+			self.dim = meta["dim"]
+			self.model_identity = meta.get("model_identity")
+		else:
+			if dim is None:
+				raise ConfigurationError(f"Creating embedding store {self.directory} requires its dimension")
+			self.dim = dim
+			self.model_identity = model_identity
+			meta_path.write_text(json.dumps({"dim": dim, "model_identity": model_identity}), encoding="utf-8")
+
+		# Rows are written before their id is appended, so every indexed id has its vector on disk
+		self._ids: List[Hashable] = []
+		self._rows: Dict[Hashable, int] = {}
+		ids_path = self.directory / self.IDS_FILE
+		if ids_path.exists():
+			with open(ids_path, "r", encoding="utf-8") as f:
+				for line in f:
+					try:
+						record_id = json.loads(line)
+					except json.JSONDecodeError:
+						# Partial line from an interrupted write
+						break
+					self._rows[record_id] = len(self._ids)
+					self._ids.append(record_id)
+
+		vectors_path = self.directory / self.VECTORS_FILE
+		row_bytes = self.dim * np.dtype(np.float16).itemsize
+		existing_rows = vectors_path.stat().st_size // row_bytes if vectors_path.exists() else 0
+		self._vectors = None
+		self._open_vectors(max(existing_rows, len(self._ids), initial_capacity))
+
+	def __len__(self) -> int:
+		return len(self._ids)
+
+	def __contains__(self, record_id: Hashable) -> bool:
+		return record_id in self._rows
+
+	@property
+	def ids(self) -> List[Hashable]:
+		"""Stored ids in row order."""
+		return list(self._ids)
+
+	@property
+	def vectors(self) -> np.memmap:
+		"""Read-only (len, dim) float16 view of the stored vectors, in row order."""
+		view = self._vectors[:len(self._ids)]
+		view.flags.writeable = False
+		return view
+
+	def add(self, ids: Iterable[Hashable], vectors: np.ndarray):
+		"""
+		Store vectors, replacing the vectors of ids that are already present.
+
+		Args:
+			ids: One JSON-serializable id per vector (e.g. transcription ids)
+			vectors: (N, dim) array of embeddings
+		"""
+		ids = list(ids)
+		vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+		if vectors.shape[1] != self.dim:
+			raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+		with self._lock:
+			new_rows = {}
+			rows = []
+			for record_id in ids:
+				row = self._rows.get(record_id, new_rows.get(record_id))
+				if row is None:
+					row = new_rows[record_id] = len(self._ids) + len(new_rows)
+				rows.append(row)
+			new_ids = list(new_rows)
+
+			needed = len(self._ids) + len(new_ids)
+			if needed > self._vectors.shape[0]:
+				self._open_vectors(max(needed, 2 * self._vectors.shape[0]))
+			self._vectors[rows] = vectors.astype(np.float16)
+			self._vectors.flush()
+
+			if new_ids:
+				with open(self.directory / self.IDS_FILE, "a", encoding="utf-8") as f:
+					f.write("".join(json.dumps(record_id) + "\n" for record_id in new_ids))
+				self._ids.extend(new_ids)
+				self._rows.update(new_rows)
+
+	def get(self, record_id: Hashable) -> Optional[np.ndarray]:
+		"""float32 copy of the vector stored for an id, or None."""
+		row = self._rows.get(record_id)
+		if row is None:
+			return None
+		return np.asarray(self._vectors[row], dtype=np.float32)
+
+	def most_similar(self, query: np.ndarray, k: int = 10, chunk_size: int = 65536) -> List[Tuple[Hashable, float]]:
+		"""
+		Ids of the k stored vectors with the highest cosine similarity to query.
+
+		The matrix is scanned in chunks, so memory use is bounded by chunk_size
+		rows regardless of the store size.
+		"""
+		query = np.asarray(query, dtype=np.float32).ravel()
+		query = query / max(float(np.linalg.norm(query)), 1e-12)
+		count = len(self._ids)
+		if count == 0 or k <= 0:
+			return []
+
+		best_rows = np.empty(0, dtype=np.int64)
+		best_scores = np.empty(0, dtype=np.float32)
+		for start in range(0, count, chunk_size):
+			chunk = np.asarray(self._vectors[start:min(start + chunk_size, count)], dtype=np.float32)
+			norms = np.maximum(np.linalg.norm(chunk, axis=1), 1e-12)
+			scores = chunk @ query / norms
+			best_rows = np.concatenate([best_rows, np.arange(start, start + len(chunk))])
+			best_scores = np.concatenate([best_scores, scores])
+			if len(best_scores) > k:
+				keep = np.argpartition(-best_scores, k)[:k]
+				best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+		order = np.argsort(-best_scores)
+		return [(self._ids[best_rows[i]], float(best_scores[i])) for i in order]
+
+	def flush(self):
+		"""Write pending vector pages to disk."""
+		self._vectors.flush()
+
+	def _open_vectors(self, capacity: int):
+		"""(Re)map the vector file with room for capacity rows, growing it if needed."""
+		path = self.directory / self.VECTORS_FILE
+		if self._vectors is not None:
+			self._vectors.flush()
+			self._vectors = None
+		size = capacity * self.dim * np.dtype(np.float16).itemsize
+		with open(path, "ab") as f:
+			if f.tell() < size:
+				f.truncate(size)
+		self._vectors = np.memmap(path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
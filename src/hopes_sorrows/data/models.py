@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -86,4 +86,18 @@ class SentimentAnalysis(Base):
     transcription = relationship("Transcription", back_populates="sentiment_analyses")
 
     def __repr__(self):
-        return f"<SentimentAnalysis(analyzer='{self.analyzer_type.value}', label='{self.label}', category='{self.category}')>" 
\ No newline at end of file
+        return f"<SentimentAnalysis(analyzer='{self.analyzer_type.value}', label='{self.label}', category='{self.category}')>" 
+
+class PatternHitRecord(Base):
+    """Model for storing a transcription's raw classifier pattern hits, for re-scoring without re-matching"""
+    __tablename__ = 'pattern_hits'
+
+    transcription_id = Column(Integer, ForeignKey('transcriptions.id'), primary_key=True)
+    match_version = Column(String(40), primary_key=True)  # Classifier match fingerprint the hits belong to
+    pattern_ids = Column(LargeBinary, nullable=False)  # uint16 pattern indices, one per hit
+    context_scores = Column(LargeBinary, nullable=False)  # float32 context multipliers, one per hit
+    flags = Column(Integer, nullable=False, default=0)  # Keyword, filtered-content and skip bits
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PatternHitRecord(transcription_id={self.transcription_id}, match_version='{self.match_version}')>"
@@ -1,6 +1,6 @@
 import sqlite3
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import json
 
 class DatabaseSchema:
@@ -88,6 +88,7 @@ class DatabaseSchema:
 					FOREIGN KEY (speaker_id) REFERENCES speaker_profiles(speaker_id)
 				)
 			""")
+			cursor.execute("CREATE INDEX IF NOT EXISTS idx_narrative_arcs_speaker ON narrative_arcs (speaker_id, sequence_number)")
 			
 			conn.commit()
 		
@@ -163,6 +164,37 @@ class DatabaseSchema:
 				(speaker_id, sequence_number, category)
 			)
 		
+	def save_speaker_states(self, profiles: Dict[str, Dict[str, float]], arcs: List[Tuple[str, int, str]],
+							keep_arcs: Optional[int] = None):
+		"""
+		Write speaker profiles and (speaker_id, sequence_number, category) narrative arc entries in one transaction.
+		
+		With keep_arcs, only the latest keep_arcs narrative arc entries of each written speaker are kept.
+		"""
+		now = datetime.now()
+		with sqlite3.connect(self.db_path) as conn:
+			cursor = conn.cursor()
+			cursor.executemany(
+				"""INSERT OR REPLACE INTO speaker_profiles
+				   (speaker_id, calibration_factors, last_updated)
+				   VALUES (?, ?, ?)""",
+				[(speaker_id, json.dumps(factors), now) for speaker_id, factors in profiles.items()]
+			)
+			cursor.executemany(
+				"""INSERT INTO narrative_arcs
+				   (speaker_id, sequence_number, category)
+				   VALUES (?, ?, ?)""",
+				arcs
+			)
+			if keep_arcs is not None:
+				latest = {}
+				for speaker_id, sequence_number, _ in arcs:
+					latest[speaker_id] = max(sequence_number, latest.get(speaker_id, sequence_number))
+				cursor.executemany(
+					"DELETE FROM narrative_arcs WHERE speaker_id = ? AND sequence_number <= ?",
+					[(speaker_id, sequence_number - keep_arcs) for speaker_id, sequence_number in latest.items()]
+				)
+		
 	def get_speaker_profile(self, speaker_id: str) -> Optional[Dict]:
 		"""Get speaker profile with calibration factors."""
 		with sqlite3.connect(self.db_path) as conn:
@@ -9,7 +9,12 @@ import json
 import numpy as np
 
 # Use relative imports for the new package structure
-from ...analysis.sentiment.sa_transformers import analyze_sentiment as analyze_sentiment_transformer
+from ...analysis.sentiment.sa_transformers import (
+    analyze_sentiment as analyze_sentiment_transformer,
+    start_background_warmup,
+    wait_for_analyzer,
+    get_model_status
+)
 from ...analysis.sentiment.sa_LLM import analyze_sentiment as analyze_sentiment_llm
 from ...data.db_manager import DatabaseManager
 from ...data.models import AnalyzerType
@@ -55,6 +60,10 @@ def create_app():
     app.db_manager = db_manager
     app.socketio = socketio
     
+    # Load and warm the transformer in the background so the first upload doesn't pay for it
+    if config.get('MODEL_WARMUP_ENABLED'):
+        start_background_warmup()
+    
     @app.route('/')
     def landing():
         """Landing page introducing the project."""
@@ -181,6 +190,15 @@ def create_app():
             session_id = request.form.get('session_id', str(uuid.uuid4()))
             print(f"📄 Processing audio file: {audio_file.filename}, session: {session_id}")
             
+            # Wait for the background warm-up instead of loading the model a second time
+            if not wait_for_analyzer(config.get('MODEL_READY_TIMEOUT')):
+                print("⏳ Sentiment model still loading, rejecting upload")
+                return jsonify({
+                    'success': False,
+                    'error': 'Sentiment model is still loading, please try again shortly',
+                    'model_status': get_model_status()
+                }), 503
+            
             # Save the audio file temporarily
             temp_dir = tempfile.mkdtemp()
             temp_filename = f"recording_{session_id}.wav"
@@ -395,6 +413,29 @@ def create_app():
                 'message': f'LLM module error: {str(e)}'
             })
 
+    @app.route('/api/ready')
+    def ready():
+        """Report whether the sentiment model is loading, warming or ready."""
+        status = get_model_status()
+        return jsonify(status), 200 if status['ready'] else 503
+
+    @app.route('/api/cache_stats')
+    def cache_stats():
+        """Report sentiment result cache hit/miss counters."""
+        from ...analysis.sentiment.result_cache import get_result_cache
+
+        cache = get_result_cache()
+        if cache is None:
+            return jsonify({'enabled': False})
+        return jsonify({'enabled': True, **cache.stats()})
+
+    @app.route('/api/cascade_stats')
+    def cascade_stats():
+        """Report how often the lexical fast path fires and how often audits disagree with it."""
+        from ...analysis.sentiment.combined_analyzer import get_combined_analyzer
+
+        return jsonify(get_combined_analyzer().get_cascade_stats())
+
     @app.route('/api/reanalyze_with_llm', methods=['POST'])
     def reanalyze_with_llm():
         """Re-analyze existing transcriptions with LLM for enhanced results."""
@@ -434,7 +475,8 @@ def create_app():
                         transcription.speaker_id, 
                         None, 
                         use_llm=True, 
-                        verbose=False
+                        verbose=False,
+                        allow_fast_path=False
                     )
                     
                     # Check if LLM was actually used
@@ -0,0 +1,62 @@
+import random
+import unittest
+import numpy as np
+from hopes_sorrows.analysis.sentiment.advanced_classifier import (
+    AdvancedHopeSorrowClassifier, EmotionCategory, CATEGORY_COLUMNS
+)
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+
+TEXTS = [
+    "I will achieve my dreams and make a better future for myself.",
+    "I lost everything I worked for and it's all gone now.",
+    "The pain is too much to bear, I feel broken inside.",
+    "I was hurt, but I've learned to heal and move forward.",
+    "I'm excited about the future but scared of what might happen.",
+    "It feels like both an adventure and a terrible mistake.",
+    "The death of my father taught me that life is short and precious.",
+    "I find myself questioning everything I thought I knew.",
+    "I'm not really hopeful about any of this, never was.",
+    "I'm very grateful, really, for everything I have.",
+    "This is **** and I hate it.",
+    "Went to the store and bought some bread.",
+    "ok",
+    "la la la la",
+    "",
+    "!!! ???",
+]
+
+class TestClassifyBatch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(19)
+        self.texts = TEXTS + [" ".join(rng.sample(TEXTS[:12], 3)) for _ in range(40)]
+        self.sentiments = [rng.choice([-0.9, -0.6, -0.4, 0.0, 0.3, 0.6, 0.9]) for _ in self.texts]
+        self.speakers = [rng.choice(["a", "b", None]) for _ in self.texts]
+
+    def test_matches_classify_emotion(self):
+        """Batch categories, confidences and scores should equal per-text classification."""
+        single, batch = (AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+                         for _ in range(2))
+        for classifier in (single, batch):
+            classifier.update_speaker_profile("a", EmotionCategory.SORROW, 0.9)
+
+        result = batch.classify_batch(self.texts, self.sentiments, self.speakers)
+        self.assertEqual(result.category_scores.shape, (len(self.texts), len(CATEGORY_COLUMNS)))
+        for row, (text, sentiment, speaker) in enumerate(zip(self.texts, self.sentiments, self.speakers)):
+            expected = single.classify_emotion(text, sentiment, speaker or "unknown")
+            self.assertEqual(result.categories[row], expected.category, text)
+            self.assertAlmostEqual(result.confidences[row], expected.confidence, places=9)
+            self.assertAlmostEqual(result.margins[row], expected.margin, places=9)
+            expected_scores = [expected.category_scores.get(category.value, 0.0) for category in CATEGORY_COLUMNS]
+            np.testing.assert_allclose(result.category_scores[row], expected_scores, rtol=0, atol=1e-9)
+
+    def test_empty_and_mismatched_inputs(self):
+        """An empty batch gives empty arrays; lengths must agree."""
+        classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        result = classifier.classify_batch([], [])
+        self.assertEqual(result.categories, [])
+        self.assertEqual(result.category_scores.shape, (0, len(CATEGORY_COLUMNS)))
+        with self.assertRaises(ValueError):
+            classifier.classify_batch(["one text"], [0.1, 0.2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+from hopes_sorrows.analysis.sentiment import sa_transformers, result_cache
+from hopes_sorrows.analysis.sentiment.inference_client import RemoteSentimentAnalyzer
+from hopes_sorrows.analysis.sentiment.combined_analyzer import CombinedSentimentAnalyzer, analyze_sentiment_combined
+
+class TestLexicalCascade(unittest.TestCase):
+    def test_decisive_text_takes_fast_path(self):
+        """A strongly patterned utterance should be answered without running the models."""
+        analyzer = CombinedSentimentAnalyzer(cascade=True, cascade_margin=0.8, audit_rate=0.0)
+        analyzer._analyze_full = lambda *args: self.fail("full path should not run")
+
+        result = analyzer.analyze("I feel broken inside", use_llm=False)
+
+        self.assertEqual(result["analysis_source"], "lexical_fast_path")
+        self.assertEqual(result["category"], "sorrow")
+        self.assertLess(result["score"], 0)
+        self.assertEqual(analyzer.get_cascade_stats()["fast_path"], 1)
+
+    def test_undecided_text_takes_full_path(self):
+        analyzer = CombinedSentimentAnalyzer(cascade=True, cascade_margin=0.8, audit_rate=0.0)
+        analyzer._analyze_full = lambda *args: {"category": "ambivalent", "analysis_source": "transformer_only"}
+
+        for text in ["I'm excited about the future but scared of what might happen.", "Hello there", "This is ***"]:
+            self.assertEqual(analyzer.analyze(text, use_llm=False)["analysis_source"], "transformer_only")
+        self.assertEqual(analyzer.get_cascade_stats()["full_path"], 3)
+
+    def test_audit_counts_disagreements(self):
+        """Sampled fast-path answers are re-run in full and disagreements are counted."""
+        analyzer = CombinedSentimentAnalyzer(cascade=True, cascade_margin=0.8, audit_rate=1.0)
+        analyzer._analyze_full = lambda *args: {"category": "hope"}
+
+        analyzer.analyze("I feel broken inside", use_llm=False)
+        analyzer._auditor.shutdown(wait=True)
+
+        stats = analyzer.get_cascade_stats()
+        self.assertEqual(stats["audited"], 1)
+        self.assertEqual(stats["audit_disagreements"], 1)
+        self.assertEqual(stats["recent_disagreements"][0]["full_path"], "hope")
+
+class TestCombinedFallback(unittest.TestCase):
+    def test_unavailable_model_falls_back(self):
+        """Building the cache key must not load the model, so a load failure still degrades to the fallback."""
+        def unavailable():
+            raise OSError("model unavailable")
+
+        with mock.patch.object(sa_transformers, "_sentiment_analyzer", None), \
+                mock.patch.object(sa_transformers, "get_analyzer", unavailable), \
+                mock.patch.object(result_cache, "get_result_cache", lambda: None):
+            result = analyze_sentiment_combined("Went to the store and bought some bread.", use_llm=False, verbose=False)
+
+        self.assertEqual(result["category"], "reflective_neutral")
+        self.assertTrue(result["degraded"])
+
+    def test_unreachable_inference_server_falls_back(self):
+        """A client for a server that is down is created without contacting it, and analysis degrades."""
+        client = RemoteSentimentAnalyzer("http://127.0.0.1:9", timeout=0.5)
+        with mock.patch.object(sa_transformers, "_sentiment_analyzer", client), \
+                mock.patch.object(result_cache, "get_result_cache", lambda: None):
+            result = analyze_sentiment_combined("Went to the store and bought some bread.", use_llm=False, verbose=False)
+
+        self.assertEqual(result["category"], "reflective_neutral")
+        self.assertTrue(result["degraded"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+
+class TestClassificationResult(unittest.TestCase):
+    def setUp(self):
+        self.classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        self.calls = 0
+        generate = self.classifier._generate_explanation
+
+        def counting_generate(*args):
+            self.calls += 1
+            return generate(*args)
+        self.classifier._generate_explanation = counting_generate
+
+    def test_explanation_built_on_first_access(self):
+        """The explanation should be generated once, and only when read."""
+        result = self.classifier.classify_emotion("I'm excited about the future but scared of what might happen.", 0.2, "a")
+        self.assertEqual(self.calls, 0)
+        self.assertIn(f"Classified as {result.category.value.upper()}", result.explanation)
+        result.explanation
+        self.assertEqual(self.calls, 1)
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_serialized_fields(self):
+        """to_dict should carry the category, confidence, pattern dicts and explanation."""
+        result = self.classifier.classify_emotion("The pain is too much to bear, I feel broken inside.", -0.8, "a")
+        serialized = result.to_dict()
+        self.assertEqual(serialized["category"], result.category.value)
+        self.assertEqual(serialized["classification_confidence"], result.confidence)
+        self.assertEqual(serialized["matched_patterns"], [
+            {"pattern": pattern.description, "weight": weight, "category": pattern.category.value}
+            for pattern, weight in result.matched_patterns
+        ])
+        self.assertEqual(serialized["explanation"], result.explanation)
+        self.assertEqual(set(result.category_scores), {category.value for category in EmotionCategory})
+
+    def test_fallback_results(self):
+        """Short texts keep their fixed explanation and empty scores."""
+        result = self.classifier.classify_emotion("ok", 0.0, "a")
+        self.assertEqual(result.category, EmotionCategory.REFLECTIVE_NEUTRAL)
+        self.assertIn("too short", result.explanation)
+        self.assertEqual(result.category_scores, {})
+        self.assertEqual(result.to_dict()["matched_patterns"], [])
+
+if __name__ == '__main__':
+    unittest.main()
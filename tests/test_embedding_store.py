@@ -0,0 +1,45 @@
+import tempfile
+import unittest
+import numpy as np
+from hopes_sorrows.core.exceptions import ConfigurationError
+from hopes_sorrows.data.embedding_store import EmbeddingStore
+
+class TestEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_add_grow_and_reopen(self):
+        """Vectors should survive growing past the initial capacity and reopening the store."""
+        store = EmbeddingStore(self.tmp.name, dim=8, model_identity="model", initial_capacity=4)
+        vectors = self.rng.normal(size=(10, 8)).astype(np.float32)
+        store.add(range(10), vectors)
+        store.add([3], np.ones((1, 8)))
+
+        reopened = EmbeddingStore(self.tmp.name)
+        self.assertEqual(len(reopened), 10)
+        self.assertEqual(reopened.vectors.dtype, np.float16)
+        np.testing.assert_allclose(reopened.get(9), vectors[9], atol=1e-2)
+        np.testing.assert_allclose(reopened.get(3), np.ones(8))
+        self.assertIsNone(reopened.get(42))
+
+        with self.assertRaises(ConfigurationError):
+            EmbeddingStore(self.tmp.name, model_identity="other-model")
+
+    def test_most_similar(self):
+        """Similarity search should rank an exact copy first across chunk boundaries."""
+        store = EmbeddingStore(self.tmp.name, dim=16)
+        vectors = self.rng.normal(size=(50, 16))
+        store.add([f"t{i}" for i in range(50)], vectors)
+
+        hits = store.most_similar(vectors[37], k=3, chunk_size=8)
+        self.assertEqual(len(hits), 3)
+        self.assertEqual(hits[0][0], "t37")
+        self.assertGreater(hits[0][1], 0.99)
+        self.assertGreaterEqual(hits[1][1], hits[2][1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+from hopes_sorrows.analysis.sentiment.incremental import ClassificationSession
+
+WORDS = [
+    "I", "will", "achieve", "my", "dreams", "lost", "everything", "it's", "all", "gone", "now", "hurt", "but",
+    "learned", "to", "heal", "excited", "scared", "both", "and", "&", "adventure", "terrible", "mistake", "death",
+    "of", "the", "past", "time", "u", "ur", "thru", "cuz", "thought", "felt", "made", "me", "find", "myself",
+    "questioning", "wondering", "not", "never", "very", "really", "hope", "future", "better", "broke", "inside",
+    "Grief", "LOVE", "happy", "sad", "****", "...", "!!", "la", "a", "b", "x.", "ΣΑΣ", "İt",
+]
+SEPARATORS = [" ", " ", " ", " ", "  ", "\n", " \t", ", ", ". "]
+
+class TestClassificationSession(unittest.TestCase):
+    def setUp(self):
+        self.classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+
+    def assert_same(self, result, expected, text):
+        self.assertEqual(result.category, expected.category, text)
+        self.assertEqual(result.confidence, expected.confidence, text)
+        self.assertEqual(result.margin, expected.margin, text)
+        self.assertEqual(result.category_scores, expected.category_scores, text)
+        self.assertEqual([(pattern.description, score) for pattern, score in result.matched_patterns],
+                         [(pattern.description, score) for pattern, score in expected.matched_patterns], text)
+        self.assertEqual(result.explanation, expected.explanation, text)
+
+    def random_text(self, rng, words):
+        return "".join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(words))
+
+    def test_updates_match_full_classification(self):
+        """Every update should equal classify_emotion on the text so far, however the text is split."""
+        rng = random.Random(25)
+        for _ in range(40):
+            text = " " * rng.randint(0, 2) + self.random_text(rng, rng.randint(1, 400))
+            session = ClassificationSession(self.classifier, "a")
+            position = 0
+            while position < len(text):
+                end = min(len(text), position + rng.randint(1, rng.choice([2, 8, 30, 120])))
+                sentiment = rng.choice([-0.9, -0.4, 0.0, 0.6, 0.9])
+                result = session.update(text[position:end], sentiment)
+                position = end
+                self.assert_same(result, self.classifier.classify_emotion(text[:end], sentiment, "a"), text[:end])
+
+    def test_nonsense_and_single_letters(self):
+        """Texts that only turn nonsensical (or stop being so) late should still match."""
+        rng = random.Random(7)
+        for text in ["la la la la " * 40, "a b c d e f g " * 30 + "h", "a b c d e f g " * 30 + "hope",
+                     "!! ... " * 50 + "I hope so", "tick tock tick tock " * 20 + "la la"]:
+            session = ClassificationSession(self.classifier, "a")
+            position = 0
+            while position < len(text):
+                end = min(len(text), position + rng.randint(1, 25))
+                result = session.update(text[position:end], 0.3)
+                position = end
+                self.assert_same(result, self.classifier.classify_emotion(text[:end], 0.3, "a"), text[:end])
+
+    def test_window_stays_bounded(self):
+        """The text an update re-derives should not grow with the transcript."""
+        rng = random.Random(3)
+        session = ClassificationSession(self.classifier, "a")
+        windows = []
+        for _ in range(3000):
+            session.update(rng.choice(WORDS) + " ", 0.0)
+            windows.append(len(session._normalized) + len(session._tail))
+        self.assertLess(max(windows[1000:]), 4 * max(windows[:300]))
+        self.assertLess(max(windows), 3000)
+
+    def test_exact_mode_classifies_whole_text(self):
+        """Unbounded gaps can't be committed, so exact mode re-classifies everything and still matches."""
+        classifier = AdvancedHopeSorrowClassifier(match_mode="exact",
+                                                  speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        session = ClassificationSession(classifier, "a")
+        text = ""
+        for chunk in ["I was excited ", "about it all ", "but in the end ", "terrified of losing it."]:
+            text += chunk
+            self.assert_same(session.update(chunk, 0.1), classifier.classify_emotion(text, 0.1, "a"), text)
+
+if __name__ == '__main__':
+    unittest.main()
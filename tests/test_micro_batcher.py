@@ -0,0 +1,71 @@
+import threading
+import unittest
+from hopes_sorrows.analysis.sentiment.micro_batcher import MicroBatcher, MicroBatcherClosed
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_calls_are_coalesced(self):
+        """Concurrent submissions should share batch calls and get their own results back."""
+        batch_sizes = []
+
+        def batch_fn(items):
+            batch_sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+        barrier = threading.Barrier(8)
+        results = {}
+
+        def worker(value):
+            barrier.wait()
+            results[value] = batcher.submit(value).result(timeout=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        self.assertEqual(results, {i: i * 2 for i in range(8)})
+        self.assertEqual(sum(batch_sizes), 8)
+        self.assertLess(len(batch_sizes), 8)
+        self.assertTrue(all(size <= 8 for size in batch_sizes))
+
+    def test_errors_propagate_to_callers(self):
+        def batch_fn(items):
+            raise RuntimeError("model failed")
+
+        batcher = MicroBatcher(batch_fn, max_wait_ms=0)
+        with self.assertRaises(RuntimeError):
+            batcher.submit("text").result(timeout=5)
+        batcher.close()
+
+    def test_close_resolves_every_future(self):
+        """Items submitted while the batcher closes should get a result or MicroBatcherClosed, never hang."""
+        for _ in range(20):
+            batcher = MicroBatcher(lambda items: list(items), max_batch_size=4, max_wait_ms=1)
+            futures = []
+
+            def worker():
+                for i in range(200):
+                    try:
+                        futures.append(batcher.submit(i))
+                    except MicroBatcherClosed:
+                        return
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            batcher.close()
+            for thread in threads:
+                thread.join()
+            for future in futures:
+                try:
+                    future.result(timeout=5)
+                except MicroBatcherClosed:
+                    pass
+            with self.assertRaises(MicroBatcherClosed):
+                batcher.submit(0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import re
+import unittest
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.pattern_engine import PatternEngine, bound_gaps, literal_prefixes
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+
+class TestPatternEngine(unittest.TestCase):
+    def setUp(self):
+        self.classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        self.texts = [
+            "i'm excited about the future but scared of what might happen, both an adventure and a terrible mistake.",
+            "watching my childhood home being demolished broke something inside me. memories of growing up are gone.",
+            "the death of my father taught me that life is short, but now i see that healing takes time.",
+            "I don't know how to feel. Part of me wants to stay but part of me wants to leave. Not really sure.",
+            "just thinking about what really matters... see that? get it? understand excited people.",
+            "",
+        ]
+
+    def reference(self, patterns, text):
+        return sorted(
+            (index, match.start(), match.end())
+            for index, pattern in enumerate(patterns)
+            for match in re.finditer(pattern, text)
+        )
+
+    def test_matches_per_pattern_finditer(self):
+        """One engine scan should report exactly the hits of running every pattern separately."""
+        engine = self.classifier.pattern_engine
+        patterns = engine.patterns
+        for text in self.texts:
+            lowered = text.lower()
+            self.assertEqual(engine.scan(lowered), self.reference(patterns, lowered))
+
+    def test_engine_shared_per_pattern_set(self):
+        """Classifiers with the same pattern set should reuse one compiled engine."""
+        self.assertIs(AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory)).pattern_engine, self.classifier.pattern_engine)
+
+    def test_candidates_from_anchor_words(self):
+        """Only patterns whose anchor words occur in the text should be candidates."""
+        engine = self.classifier.pattern_engine
+        descriptions = lambda text: {self.classifier.all_patterns[i].description for i in engine.candidates(text)}
+
+        self.assertEqual(engine.candidates("my cat sat by a mat"), set())
+        self.assertEqual(descriptions("bittersweet"), {"Ambivalent descriptors"})
+        # "broke" anchors "broke.*inside" as a word prefix, so "broken" still selects it
+        self.assertIn("Internal breaking", descriptions("broken inside"))
+
+    def test_literal_prefixes_and_fallback(self):
+        """Patterns without a literal anchor should still be matched through their own scan."""
+        self.assertEqual(literal_prefixes(r"\b(both.*and|can't wait|colou?r)\b"), {"both", "can't wait", "colo"})
+        self.assertIsNone(literal_prefixes(r"(happy|sad)"))
+        self.assertIsNone(literal_prefixes(r"\b(.*sad|happy)"))
+
+        patterns = [r"\b(sad|happy)\b", r"\w+ness", r"\b(a|b)?c"]
+        text = "happiness is sad, bc sadness c"
+        self.assertEqual(PatternEngine(patterns).scan(text), self.reference(patterns, text))
+
+class TestBoundedGaps(unittest.TestCase):
+    def test_gap_window(self):
+        """A bounded gap should match within the token window and not beyond it."""
+        pattern = re.compile(bound_gaps(r"\b(memories|childhood).*\b(lost|gone)\b", 5))
+        self.assertIsNotNone(pattern.search("memories of that house are gone"))
+        self.assertIsNotNone(pattern.search("childhood friendships lost"))
+        self.assertIsNone(pattern.search("memories of the old red house by the lake are gone"))
+        self.assertEqual(bound_gaps(r"[.*]\.*x", 3), r"[.*]\.*x")
+
+    def test_modes_agree_on_realistic_text(self):
+        """Exact and bounded classifiers should find the same patterns in ordinary utterances."""
+        exact = AdvancedHopeSorrowClassifier(match_mode="exact",
+                                             speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        bounded = AdvancedHopeSorrowClassifier(match_mode="bounded", gap_tokens=20,
+                                               speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        self.assertNotEqual(exact.pattern_set_version, bounded.pattern_set_version)
+        for text in [
+            "Watching my childhood home being demolished broke something inside me.",
+            "I'm excited about the future but scared of what might happen.",
+            "The death of my father taught me that life is short and precious.",
+        ]:
+            normalized = exact._normalize_text_for_classification(text)
+            self.assertEqual(exact._detect_patterns(normalized), bounded._detect_patterns(normalized))
+
+if __name__ == "__main__":
+    unittest.main()
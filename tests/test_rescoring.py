@@ -0,0 +1,116 @@
+import os
+import random
+import tempfile
+import unittest
+from dataclasses import replace
+import numpy as np
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+from hopes_sorrows.analysis.sentiment.rescoring import (
+    encode_hits, decode_hits, record_pattern_hits, backfill_pattern_hits, rescore_corpus
+)
+from hopes_sorrows.data.db_manager import DatabaseManager
+from hopes_sorrows.data.models import AnalyzerType, SentimentAnalysis
+
+TEXTS = [
+    "I will achieve my dreams and make a better future for myself.",
+    "I lost everything I worked for and it's all gone now.",
+    "I was hurt, but I've learned to heal and move forward.",
+    "I'm excited about the future but scared of what might happen.",
+    "It feels like both an adventure and a terrible mistake.",
+    "The death of my father taught me that life is short and precious.",
+    "I find myself questioning everything I thought I knew.",
+    "I'm not really hopeful about any of this, never was.",
+    "This is **** and I hate it.",
+    "Went to the store and bought some bread.",
+    "ok",
+    "la la la la",
+]
+
+class TestRescoring(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(f"sqlite:///{os.path.join(self.tmp.name, 'corpus.db')}")
+        self.classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+
+        rng = random.Random(23)
+        self.texts = TEXTS + [" ".join(rng.sample(TEXTS[:10], 2)) for _ in range(20)]
+        self.scores = [rng.choice([-0.9, -0.4, 0.0, 0.6, 0.9]) for _ in self.texts]
+        self.categories = [category.value for category in
+                           self.classifier.score_hits(self.classifier.extract_hits(self.texts), self.scores).categories]
+        session = self.db.create_recording_session()
+        self.speaker = self.db.add_speaker(session.id, "A")
+        self.transcription_ids, self.analysis_ids = [], []
+        for text, score, category in zip(self.texts, self.scores, self.categories):
+            transcription = self.db.add_transcription(self.speaker.id, text)
+            analysis = self.db.add_sentiment_analysis(transcription.id, AnalyzerType.TRANSFORMER, "neutral",
+                                                      category, score, 0.5)
+            self.transcription_ids.append(transcription.id)
+            self.analysis_ids.append(analysis.id)
+
+    def tearDown(self):
+        self.db.close()
+        self.db.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_encode_decode_round_trip(self):
+        """Stored records should decode to the extracted hits."""
+        hits = self.classifier.extract_hits(self.texts)
+        decoded = decode_hits(hits.match_version, encode_hits(hits))
+        for field in ("flags", "rows", "patterns", "context"):
+            np.testing.assert_array_equal(getattr(decoded, field), getattr(hits, field))
+
+    def test_rescore_matches_classification(self):
+        """Re-scoring stored hits should give the categories of classifying the texts again."""
+        record_pattern_hits(self.db, self.transcription_ids[:5], self.texts[:5], classifier=self.classifier)
+        self.assertEqual(backfill_pattern_hits(self.db, self.classifier, chunk_size=4), len(self.texts) - 5)
+        self.assertEqual(backfill_pattern_hits(self.db, self.classifier), 0)
+
+        for parameters in (None, self.classifier.scoring_parameters()):
+            report = rescore_corpus(self.db, parameters, self.classifier)
+            self.assertEqual((report["analyses"], report["changed"], report["skipped"]), (len(self.texts), 0, 0))
+
+        tuned = self.classifier.scoring_parameters({"Explicit happiness": 0.1, "Loss language": 1.2},
+                                                   transformative_keyword_boost=1.5)
+        expected = self.classifier.score_hits(self.classifier.extract_hits(self.texts), self.scores, parameters=tuned)
+        report = rescore_corpus(self.db, tuned, self.classifier)
+        new_categories = [report["changes"].get(analysis_id, category)
+                          for analysis_id, category in zip(self.analysis_ids, self.categories)]
+        self.assertEqual(new_categories, [category.value for category in expected.categories])
+
+        report = rescore_corpus(self.db, tuned, self.classifier, write=True)
+        self.assertGreater(report["changed"], 0)
+        self.assertEqual(rescore_corpus(self.db, tuned, self.classifier)["changed"], 0)
+
+    def test_other_analyzer_categories_are_kept(self):
+        """Combined results store an averaged score and another analyzer's category; re-scoring must not touch them."""
+        text = "I will achieve my dreams and make a better future for myself."
+        transcription = self.db.add_transcription(self.speaker.id, text)
+        combined = self.db.add_sentiment_analysis(transcription.id, AnalyzerType.COMBINED, "negative",
+                                                  "sorrow", 0.6 * 0.8 + 0.4 * -0.7, 0.9)
+        backfill_pattern_hits(self.db, self.classifier)
+
+        report = rescore_corpus(self.db, None, self.classifier, write=True)
+        self.assertEqual((report["changed"], report["skipped"]), (0, 1))
+        tuned = self.classifier.scoring_parameters({"Explicit happiness": 0.1}, transformative_keyword_boost=1.5)
+        report = rescore_corpus(self.db, tuned, self.classifier, write=True)
+        self.assertNotIn(combined.id, report["changes"])
+        self.db.session.expire_all()
+        self.assertEqual(self.db.session.get(SentimentAnalysis, combined.id).category, "sorrow")
+
+    def test_default_parameters_match_classify_emotion(self):
+        """Unit-calibration scoring with default parameters should equal classify_emotion."""
+        result = self.classifier.score_hits(self.classifier.extract_hits(self.texts), self.scores)
+        for text, score, category in zip(self.texts, self.scores, result.categories):
+            self.assertEqual(category, self.classifier.classify_emotion(text, score, "fresh-speaker").category, text)
+
+    def test_match_version_ignores_weights(self):
+        """Tuning weights changes the pattern set version but not the version stored hits are keyed by."""
+        reweighted = [replace(pattern, weight=pattern.weight / 2) for pattern in self.classifier.all_patterns]
+        self.assertEqual(self.classifier._compute_match_version(reweighted), self.classifier.match_version)
+        self.assertNotEqual(self.classifier._compute_pattern_set_version(reweighted), self.classifier.pattern_set_version)
+        with self.assertRaises(ValueError):
+            self.classifier.scoring_parameters({"No such pattern": 1.0})
+
+if __name__ == '__main__':
+    unittest.main()
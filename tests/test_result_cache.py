@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from hopes_sorrows.analysis.sentiment.result_cache import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "cache.db"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_survives_restart(self):
+        """Results stored by one cache instance should be served from disk by the next."""
+        cache = ResultCache(self.db_path, memory_size=4)
+        key = cache.make_key("I will heal", "transformer", "model@torch", "1-abc")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {"score": np.float32(0.5), "category": "hope"}, "transformer", "model@torch", "1-abc")
+        self.assertEqual(cache.get(key)["category"], "hope")
+
+        reopened = ResultCache(self.db_path, memory_size=4)
+        self.assertAlmostEqual(reopened.get(key)["score"], 0.5)
+        self.assertEqual(reopened.stats()["disk_hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_version_change_invalidates(self):
+        """Switching the model or pattern version should purge that analyzer's old entries."""
+        cache = ResultCache(self.db_path)
+        old_key = cache.make_key("text", "transformer", "model@torch", "1-abc")
+        cache.put(old_key, {"category": "hope"}, "transformer", "model@torch", "1-abc")
+        other_key = cache.make_key("text", "llm", "gpt", "1-abc")
+        cache.put(other_key, {"category": "sorrow"}, "llm", "gpt", "1-abc")
+
+        cache.ensure_current("transformer", "model@torch", "2-def")
+        self.assertIsNone(cache.get(old_key))
+        self.assertEqual(cache.get(other_key)["category"], "sorrow")
+
+    def test_size_eviction(self):
+        """The disk store should evict least recently used rows past max_entries."""
+        cache = ResultCache(self.db_path, memory_size=2, max_entries=10)
+        keys = [cache.make_key(f"text {i}", "transformer", "m", "v") for i in range(25)]
+        for i, key in enumerate(keys):
+            cache.put(key, {"i": i}, "transformer", "m", "v")
+
+        self.assertLessEqual(cache.stats()["disk_entries"], 10)
+        self.assertGreater(cache.stats()["evictions"], 0)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual(cache.get(keys[-1])["i"], 24)
+
+if __name__ == "__main__":
+    unittest.main()
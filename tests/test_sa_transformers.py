@@ -0,0 +1,232 @@
+import tempfile
+import unittest
+import numpy as np
+from hopes_sorrows.analysis.sentiment.sa_transformers import (
+    get_analyzer, SentimentAnalyzer, EmotionMapping, start_background_warmup, wait_for_analyzer, get_model_status
+)
+from hopes_sorrows.analysis.sentiment.backends import ONNX_AVAILABLE, ONNX_TOLERANCE
+from hopes_sorrows.analysis.sentiment.worker_pool import TransformerWorkerPool
+from hopes_sorrows.analysis.sentiment.inference_server import create_inference_app
+from hopes_sorrows.analysis.sentiment.streaming import analyze_stream, open_embedding_store
+
+class TestBatchInference(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = get_analyzer()
+        self.texts = [
+            "I will achieve my dreams and make a better future for myself.",
+            "",
+            "I lost everything I worked for and it's all gone now.",
+            "I'm excited about the future but scared of what might happen, and I keep going back and forth about whether this was the right decision for my family.",
+            "Hello",
+        ]
+
+    def test_batch_matches_single(self):
+        """Batched results should match the single-text path in the original order."""
+        single = [self.analyzer.analyze(text, speaker_id="batch_speaker") for text in self.texts]
+        batched = self.analyzer.analyze_batch(self.texts, speaker_ids=["batch_speaker"] * len(self.texts), batch_size=2)
+
+        self.assertEqual(len(batched), len(self.texts))
+        for expected, actual in zip(single, batched):
+            self.assertEqual(expected["category"], actual["category"])
+            self.assertEqual(expected["label"], actual["label"])
+            self.assertAlmostEqual(expected["score"], actual["score"], places=4)
+            self.assertAlmostEqual(expected["confidence"], actual["confidence"], places=4)
+
+    def test_speaker_ids_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_batch(["one", "two"], speaker_ids=["a"])
+
+    def test_worker_pool_matches_batch(self):
+        """Forked workers should return the same results, in input order, as analyze_batch()."""
+        texts = self.texts * 4
+        expected = self.analyzer.analyze_batch(texts)
+        with TransformerWorkerPool(self.analyzer, workers=2, chunk_size=3) as pool:
+            pooled = pool.analyze(texts)
+
+        self.assertEqual([r["category"] for r in expected], [r["category"] for r in pooled])
+        for a, b in zip(expected, pooled):
+            self.assertAlmostEqual(a["score"], b["score"], places=4)
+
+class TestEmotionMapping(unittest.TestCase):
+    def setUp(self):
+        # anger, disgust, fear, joy, neutral, sadness, surprise
+        self.probs = np.array([
+            [0.0, 0.0, 0.0, 0.9, 0.1, 0.0, 0.0],
+            [0.0, 0.0, 0.1, 0.0, 0.2, 0.7, 0.0],
+            [0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.1, 0.0, 0.0, 0.3, 0.3, 0.0, 0.3],
+        ], dtype=np.float32)
+
+    def test_matrix_mapping(self):
+        scores, confidences, labels = EmotionMapping().apply(self.probs)
+
+        np.testing.assert_allclose(scores, [0.9, -0.8, 0.0, 0.35 / 0.85], rtol=1e-5)
+        np.testing.assert_allclose(confidences, [0.9, 0.7, 0.0, 0.3], rtol=1e-6)
+        self.assertEqual(list(labels), ["very_positive", "very_negative", "neutral", "neutral"])
+
+    def test_boundary_scores(self):
+        """Scores on a threshold belong to the lower label, as with score <= threshold."""
+        def baseline(score):
+            for threshold, label in zip([-0.6, -0.3, -0.1, 0.2], ["very_negative", "negative", "neutral", "positive"]):
+                if score <= threshold:
+                    return label
+            return "very_positive"
+
+        mapping = EmotionMapping()
+        scores = [-1.0, -0.6, -0.59, -0.3, -0.29, -0.1, -0.09, 0.0, 0.2, 0.21, 1.0]
+        expected = [baseline(score) for score in scores]
+        self.assertEqual(list(mapping.label_for(np.array(scores), np.full(len(scores), 0.9))), expected)
+        self.assertEqual(list(mapping.label_for(scores, [0.9] * len(scores))), expected)
+        float32_scores = np.array(scores, dtype=np.float32)
+        self.assertEqual(list(mapping.label_for(float32_scores, np.full(len(scores), 0.9))),
+                         [baseline(float(score)) for score in float32_scores])
+
+    def test_remap_stored_probabilities(self):
+        """A different mapping can be applied to stored probabilities without the model."""
+        mapping = EmotionMapping(low_confidence=0.2)
+        _, _, labels = mapping.apply(self.probs)
+        self.assertEqual(labels[3], "very_positive")
+
+    def test_analyzer_reports_probabilities(self):
+        result = get_analyzer().analyze("I will achieve my dreams and make a better future for myself.")
+        probs = np.array([list(result["emotion_probabilities"].values())], dtype=np.float32)
+        scores, _, labels = get_analyzer().mapping.apply(probs)
+        self.assertAlmostEqual(float(result["score"]), float(scores[0]), places=5)
+        self.assertEqual(result["label"], labels[0])
+
+class TestWarmup(unittest.TestCase):
+    def test_background_warmup_reaches_ready(self):
+        """Warm-up should load the shared analyzer once and release waiters when ready."""
+        thread = start_background_warmup(rounds=1)
+        self.assertIs(start_background_warmup(rounds=1), thread)
+        self.assertTrue(wait_for_analyzer(timeout=300))
+
+        status = get_model_status()
+        self.assertEqual(status["state"], "ready")
+        self.assertTrue(status["ready"])
+        self.assertIsNotNone(status["warmup_seconds"])
+
+class TestLongTextWindows(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = get_analyzer()
+        self.long_text = " ".join(
+            ["I will achieve my dreams and make a better future for myself."] * 60 +
+            ["I lost everything I worked for and it's all gone now."] * 60
+        )
+
+    def test_long_text_reports_windows(self):
+        """Texts past the model context should be analyzed in overlapping windows, not truncated."""
+        result = self.analyzer.analyze(self.long_text)
+        windows = result["window_scores"]
+
+        self.assertGreater(len(windows), 1)
+        self.assertEqual(result["window_strategy"], "length_weighted")
+        self.assertEqual(windows[0]["char_start"], 0)
+        self.assertEqual(windows[-1]["char_end"], len(self.long_text))
+        for previous, current in zip(windows, windows[1:]):
+            self.assertLess(current["char_start"], previous["char_end"])
+
+    def test_max_intensity_picks_strongest_window(self):
+        result = self.analyzer.analyze_long(self.long_text, strategy="max_intensity")
+        strongest = max(result["window_scores"], key=lambda w: abs(w["score"]))
+        self.assertAlmostEqual(float(result["score"]), strongest["score"], places=4)
+
+    def test_short_text_matches_analyze(self):
+        text = "I'm thinking about what this experience means to me."
+        self.assertAlmostEqual(float(self.analyzer.analyze_long(text)["score"]),
+                               float(self.analyzer.analyze(text)["score"]), places=5)
+
+class TestEmbeddings(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = get_analyzer()
+        self.texts = [
+            "I will achieve my dreams and make a better future for myself.",
+            "",
+            "I lost everything I worked for and it's all gone now.",
+        ]
+
+    def test_batch_embeddings_match_single(self):
+        """Embeddings should not depend on batching or padding, and empty texts get zero vectors."""
+        batched = self.analyzer.analyze_batch(self.texts, return_embeddings=True)
+        single = self.analyzer.analyze(self.texts[2], return_embedding=True)
+        matrix = self.analyzer.embed(self.texts)
+
+        self.assertEqual(matrix.shape, (3, self.analyzer.backend.hidden_size))
+        self.assertFalse(matrix[1].any())
+        np.testing.assert_allclose(batched[2]["embedding"], single["embedding"], atol=1e-5)
+        np.testing.assert_allclose(matrix[0], batched[0]["embedding"], atol=1e-5)
+        self.assertNotIn("embedding", self.analyzer.analyze(self.texts[0]))
+
+    def test_stream_fills_store(self):
+        """analyze_stream should persist embeddings by record id and strip them from results."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = open_embedding_store(self.analyzer, tmp)
+            records = [(10 + i, text, None) for i, text in enumerate(self.texts)]
+            results = list(analyze_stream(records, batch_size=2, embedding_store=store))
+
+            self.assertEqual([record_id for record_id, _ in results], [10, 11, 12])
+            self.assertNotIn("embedding", results[0][1])
+            self.assertEqual(store.most_similar(self.analyzer.embed([self.texts[2]])[0], k=1)[0][0], 12)
+
+class TestTorchScriptBackend(unittest.TestCase):
+    def test_torchscript_matches_torch(self):
+        """Bucket-padded TorchScript graphs should reproduce the eager probabilities."""
+        texts = [
+            "Hello",
+            "I'm thinking about what this experience means to me.",
+            "I want to move on but I can't let go of the past. " * 12,
+        ]
+        torch_probs = SentimentAnalyzer(backend="torch")._predict_emotions(texts)
+        script_probs = SentimentAnalyzer(backend="torchscript")._predict_emotions(texts)
+
+        self.assertLessEqual(float(np.abs(torch_probs - script_probs).max()), 1e-4)
+
+        torch_embeddings = SentimentAnalyzer(backend="torch").embed(texts)
+        script_embeddings = SentimentAnalyzer(backend="torchscript").embed(texts)
+        self.assertLessEqual(float(np.abs(torch_embeddings - script_embeddings).max()), 1e-4)
+
+class TestInferenceServer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = get_analyzer()
+        self.client = create_inference_app(self.analyzer, warm_up=False).test_client()
+
+    def test_analyze_matches_local(self):
+        text = "I'm going to learn from this experience and grow stronger."
+        expected = self.analyzer.analyze(text)
+        response = self.client.post("/analyze", json={"text": text})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["category"], expected["category"])
+        self.assertAlmostEqual(response.get_json()["score"], float(expected["score"]), places=5)
+
+    def test_batch_and_info(self):
+        response = self.client.post("/analyze_batch", json={"texts": ["Hello", "", "I feel broken inside"]})
+        self.assertEqual(len(response.get_json()["results"]), 3)
+
+        info = self.client.get("/info").get_json()
+        self.assertEqual(info["model_identity"], self.analyzer.model_identity)
+
+        bad = self.client.post("/analyze_batch", json={"texts": ["a"], "speaker_ids": ["x", "y"]})
+        self.assertEqual(bad.status_code, 400)
+
+@unittest.skipUnless(ONNX_AVAILABLE, "onnxruntime not installed")
+class TestOnnxBackend(unittest.TestCase):
+    def test_onnx_matches_torch(self):
+        """The ONNX backend should reproduce the PyTorch emotion probabilities."""
+        texts = [
+            "I'm thinking about what this experience means to me.",
+            "The pain is too much to bear, I feel broken inside.",
+            "I'm excited about the future but scared of what might happen.",
+        ]
+        torch_probs = SentimentAnalyzer(backend="torch")._predict_emotions(texts)
+        onnx_probs = SentimentAnalyzer(backend="onnx")._predict_emotions(texts)
+
+        self.assertEqual(onnx_probs.shape, (len(texts), 7))
+        self.assertLessEqual(float(np.abs(torch_probs - onnx_probs).max()), ONNX_TOLERANCE)
+
+        torch_embeddings = SentimentAnalyzer(backend="torch").embed(texts)
+        onnx_embeddings = SentimentAnalyzer(backend="onnx").embed(texts)
+        self.assertLessEqual(float(np.abs(torch_embeddings - onnx_embeddings).max()), 1e-3)
+
+if __name__ == "__main__":
+    unittest.main()
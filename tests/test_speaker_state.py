@@ -0,0 +1,147 @@
+import random
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+
+CATEGORIES = [category.value for category in EmotionCategory]
+
+class TestSpeakerStateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "speaker_state.db"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_memory_is_bounded(self):
+        """Speakers beyond max_speakers are evicted LRU-first and each arc keeps history_size entries."""
+        store = SpeakerStateStore(CATEGORIES, max_speakers=3, history_size=4)
+        for i in range(10):
+            store.append_category(f"speaker_{i}", "hope")
+        store.calibration("speaker_7")
+        store.append_category("speaker_10", "sorrow")
+        self.assertEqual(len(store), 3)
+        self.assertIn("speaker_7", store)
+        self.assertNotIn("speaker_8", store)
+        self.assertEqual(store.stats()["evictions"], 8)
+
+        for category in ["hope", "sorrow", "hope", "ambivalent", "transformative", "hope"]:
+            history = store.append_category("speaker_7", category)
+        self.assertEqual(history, ["hope", "ambivalent", "transformative", "hope"])
+        # Without a database nothing is queued for writing
+        store.scale_calibration("speaker_7", "hope", 1.2)
+        self.assertEqual((store.stats()["pending_profiles"], store.stats()["pending_arcs"]), (0, 0))
+
+    def test_state_survives_restart_and_eviction(self):
+        """Calibration and recent categories should be reloaded from the database."""
+        store = SpeakerStateStore(CATEGORIES, max_speakers=2, history_size=3, db_path=self.db_path)
+        store.scale_calibration("alice", "hope", 1.4)
+        for category in ["sorrow", "hope", "hope", "transformative"]:
+            store.append_category("alice", category)
+        # Evicting alice writes her pending changes before she can be reloaded
+        store.calibration("bob")
+        store.calibration("carol")
+        self.assertNotIn("alice", store)
+        self.assertEqual(store.history("alice"), ["hope", "hope", "transformative"])
+        store.close()
+
+        reopened = SpeakerStateStore(CATEGORIES, history_size=3, db_path=self.db_path)
+        self.assertAlmostEqual(reopened.calibration("alice")["hope"], 1.4)
+        self.assertEqual(reopened.append_category("alice", "sorrow"), ["hope", "transformative", "sorrow"])
+        reopened.close()
+        arc = reopened._schema.get_narrative_arc("alice", limit=10)
+        # Only the latest history_size arc entries are kept in the database
+        self.assertEqual([entry["sequence_number"] for entry in arc], [5, 4, 3])
+
+    def test_classifiers_share_state(self):
+        """Classifiers given one store should see each other's calibration and arcs."""
+        store = SpeakerStateStore(CATEGORIES)
+        first, second = AdvancedHopeSorrowClassifier(speaker_state=store), AdvancedHopeSorrowClassifier(speaker_state=store)
+        first.update_speaker_profile("visitor", EmotionCategory.SORROW, 1.0)
+        self.assertAlmostEqual(second._get_speaker_calibration("visitor")[EmotionCategory.SORROW], 1.5)
+        first.classify_emotion("The death of my father taught me to heal.", 0.0, "visitor", context_window=["before"])
+        self.assertEqual(second.speaker_state.history("visitor"), ["transformative"])
+
+class TestConcurrentClassification(unittest.TestCase):
+    TEXTS = [
+        "I will achieve my dreams and make a better future for myself.",
+        "I lost everything I worked for and it's all gone now.",
+        "I was hurt, but I've learned to heal and move forward.",
+        "It feels like both an adventure and a terrible mistake.",
+        "The death of my father taught me that life is short and precious.",
+        "I find myself questioning everything I thought I knew.",
+        "Went to the store and bought some bread.",
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = random.Random(21)
+        # Per speaker, an ordered script of classifications and calibration feedback
+        self.scripts = {
+            f"speaker_{i}": [
+                ("feedback", rng.choice(list(EmotionCategory)), rng.random()) if rng.random() < 0.15 else
+                ("classify", rng.choice(self.TEXTS), rng.uniform(-1, 1), rng.random() < 0.7)
+                for _ in range(25)
+            ]
+            for i in range(24)
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_step(self, classifier, speaker_id, step, results):
+        if step[0] == "feedback":
+            classifier.update_speaker_profile(speaker_id, step[1], step[2])
+            return
+        _, text, sentiment, with_context = step
+        result = classifier.classify_emotion(text, sentiment, speaker_id, context_window=["earlier"] if with_context else None)
+        results[speaker_id].append((result.category, result.confidence, result.category_scores))
+
+    def make_classifier(self, name):
+        # Few speakers in memory, so eviction and reloading from disk happen while threads run
+        store = SpeakerStateStore(CATEGORIES, max_speakers=5, db_path=Path(self.tmp.name) / f"{name}.db", flush_interval=0.01)
+        return AdvancedHopeSorrowClassifier(speaker_state=store)
+
+    def test_threads_match_serial_execution(self):
+        """Many threads sharing one classifier should give the results of running every speaker serially."""
+        serial = self.make_classifier("serial")
+        expected = {speaker_id: [] for speaker_id in self.scripts}
+        for speaker_id, script in self.scripts.items():
+            for step in script:
+                self.run_step(serial, speaker_id, step, expected)
+
+        shared = self.make_classifier("threaded")
+        actual = {speaker_id: [] for speaker_id in self.scripts}
+        speakers = list(self.scripts)
+        start = threading.Barrier(12)
+        errors = []
+
+        def worker(own):
+            try:
+                start.wait()
+                # Interleave this thread's speakers, keeping each speaker's own order
+                for steps in zip(*(self.scripts[speaker_id] for speaker_id in own)):
+                    for speaker_id, step in zip(own, steps):
+                        self.run_step(shared, speaker_id, step, actual)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(speakers[i::12],)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(actual, expected)
+        for store in (serial.speaker_state, shared.speaker_state):
+            store.close()
+        for speaker_id in speakers:
+            self.assertEqual(shared.speaker_state.history(speaker_id), serial.speaker_state.history(speaker_id))
+            self.assertEqual(shared.speaker_state.calibration(speaker_id), serial.speaker_state.calibration(speaker_id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from hopes_sorrows.analysis.sentiment.advanced_classifier import EmotionCategory
+from hopes_sorrows.analysis.sentiment.streaming import analyze_stream, read_jsonl_records, json_default
+
+class RecordingAnalyzer:
+    """Echoes texts back and remembers the batch sizes it was called with."""
+    def __init__(self):
+        self.batch_sizes = []
+
+    def analyze_batch(self, texts, speaker_ids=None):
+        self.batch_sizes.append(len(texts))
+        return [{"text": text, "speaker_id": speaker_id} for text, speaker_id in zip(texts, speaker_ids)]
+
+class TestAnalyzeStream(unittest.TestCase):
+    def test_lazy_bounded_and_ordered(self):
+        """Input should be pulled one batch at a time and results yielded in input order."""
+        pulled = []
+
+        def records():
+            for i in range(10):
+                pulled.append(i)
+                yield i, f"text {i}", f"spk{i % 2}"
+
+        analyzer = RecordingAnalyzer()
+        stream = analyze_stream(records(), batch_size=4, analyzer=analyzer)
+
+        first_id, first = next(stream)
+        self.assertEqual((first_id, first["text"], first["speaker_id"]), (0, "text 0", "spk0"))
+        self.assertEqual(len(pulled), 4)
+
+        rest = list(stream)
+        self.assertEqual([record_id for record_id, _ in rest], list(range(1, 10)))
+        self.assertEqual(analyzer.batch_sizes, [4, 4, 2])
+
+    def test_two_field_records_and_jsonl(self):
+        """(id, text) records and JSONL input should both be accepted."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "records.jsonl"
+            path.write_text(
+                json.dumps({"id": "a", "text": "hello", "speaker_id": "s1"}) + "\n\n" +
+                json.dumps({"text": "no id"}) + "\n",
+                encoding="utf-8"
+            )
+            records = list(read_jsonl_records(path))
+        self.assertEqual(records, [("a", "hello", "s1"), (3, "no id", None)])
+
+        results = list(analyze_stream([("x", "only text")], analyzer=RecordingAnalyzer()))
+        self.assertEqual(results[0][1]["speaker_id"], None)
+
+        with self.assertRaises(ValueError):
+            list(analyze_stream([("x",)], analyzer=RecordingAnalyzer()))
+
+    def test_json_default(self):
+        """Numpy values and enums in results should serialize; anything else should still fail."""
+        result = {"score": np.float32(0.5), "probs": np.array([1, 2]), "category": EmotionCategory.HOPE}
+        self.assertEqual(json.loads(json.dumps(result, default=json_default)),
+                         {"score": 0.5, "probs": [1, 2], "category": EmotionCategory.HOPE.value})
+        with self.assertRaises(TypeError):
+            json.dumps({"value": object()}, default=json_default)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import re
+import random
+import unittest
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+from hopes_sorrows.analysis.sentiment.text_normalizer import TextNormalizer, TRANSCRIPTION_FIXES, TENSE_NORMALIZATIONS
+
+def sequential_normalize(text):
+    """The classifier's original normalizer: one re.sub pass per replacement."""
+    normalized = text.lower()
+    for table in (TRANSCRIPTION_FIXES, TENSE_NORMALIZATIONS):
+        for phrase, replacement in table.items():
+            normalized = re.sub(r'\b' + re.escape(phrase) + r'\b', replacement, normalized)
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+class TestTextNormalizer(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = TextNormalizer()
+
+    def fuzz_corpus(self, count=3000, seed=18):
+        rng = random.Random(seed)
+        words = (list(TRANSCRIPTION_FIXES) + list(TENSE_NORMALIZATIONS) +
+                 ["of", "the", "past", "my", "time", "you", "over", "you're", "u2", "_u", "feltz", "Saw",
+                  "KNEW", "Thru", "I", "really", "naïve", "ÜR", "café", "12", "don't", "of-my", "İ"])
+        separators = [" ", " ", " ", "  ", "\t", "\n", " \r\n ", " ", " ", ", ", ". ", "'", "-", "_", ""]
+        corpus = []
+        for _ in range(count):
+            parts = [rng.choice(separators)]
+            for _ in range(rng.randint(0, 12)):
+                word = rng.choice(words)
+                if rng.random() < 0.2:
+                    word = word.upper() if rng.random() < 0.5 else word.title()
+                parts.append(word)
+                parts.append(rng.choice(separators))
+            corpus.append("".join(parts))
+        return corpus
+
+    def test_matches_sequential_passes(self):
+        """One scan should produce exactly the text of the per-replacement re.sub passes."""
+        corpus = self.fuzz_corpus() + [
+            "", "   ", "I felt it Of The Past week, cuz u knew.", "thru\tthe of  my time", "of the past of my of time",
+        ]
+        for text in corpus:
+            self.assertEqual(self.normalizer.normalize(text), sequential_normalize(text), repr(text))
+
+    def test_classifier_uses_tables(self):
+        """The classifier's normalization should apply the shared tables."""
+        classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        self.assertEqual(classifier._normalize_text_for_classification("  I Realized  u were\tright "),
+                         "i realize you were right")
+
+    def test_custom_tables(self):
+        """Extra tables should be applied in the same scan; chained rewrites are rejected."""
+        normalizer = TextNormalizer([TRANSCRIPTION_FIXES, {"gonna": "going to"}])
+        self.assertEqual(normalizer.normalize("Gonna go thru it"), "going to go through it")
+        with self.assertRaises(ValueError):
+            TextNormalizer([{"gonna": "going to", "going": "went"}])
+        with self.assertRaises(ValueError):
+            TextNormalizer([{"Gonna": "going to"}])
+
+if __name__ == '__main__':
+    unittest.main()
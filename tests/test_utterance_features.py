@@ -0,0 +1,73 @@
+import re
+import random
+import unittest
+from hopes_sorrows.analysis.sentiment.advanced_classifier import AdvancedHopeSorrowClassifier, EmotionCategory
+from hopes_sorrows.analysis.sentiment.speaker_state import SpeakerStateStore
+from hopes_sorrows.analysis.sentiment.utterance_features import UtteranceFeatures
+
+def legacy_is_nonsensical(text):
+    """The ingest nonsense check as it was before UtteranceFeatures."""
+    text_lower = text.lower().strip()
+    words = text_lower.split()
+    if len(words) == 1 and len(text_lower) < 4:
+        if text_lower not in ['yes', 'no', 'ok', 'hi', 'bye', 'wow', 'oh', 'ah', 'um', 'uh', 'you']:
+            return True
+    if len(words) >= 3:
+        unique_words = set(words)
+        if len(unique_words) <= 2 and len(words) >= 4:
+            return True
+        if len(unique_words) <= 3 and len(words) >= 6:
+            word_counts = {}
+            for word in words:
+                word_counts[word] = word_counts.get(word, 0) + 1
+            if max(word_counts.values()) >= 3:
+                return True
+    for pattern in [r'^[a-z]{1,3}\.{3,}$', r'^[a-z\s]{1,10}\.$', r'^[^a-zA-Z\s]*$', r'^[a-z]\s[a-z]\s[a-z](\s[a-z])*$']:
+        if re.match(pattern, text_lower):
+            return True
+    non_alpha_count = sum(1 for char in text if not char.isalpha() and not char.isspace())
+    return len(text) > 0 and non_alpha_count / len(text) > 0.5
+
+class TestUtteranceFeatures(unittest.TestCase):
+    def test_nonsense_flag_matches_legacy_check(self):
+        """The shared nonsense flag should agree with the old ingest check."""
+        rng = random.Random(22)
+        words = ["la", "tick", "tock", "a", "b", "c", "hi", "ok", "I", "hope", "it", "works", "...", "!!", "?", "x."]
+        texts = ["", "ok", "zz", "la la la la", "a b c d", "a...", "short.", "!!! ???", "I hope it works out."]
+        texts += [" ".join(rng.choice(words) for _ in range(rng.randint(1, 8))) for _ in range(2000)]
+        for text in texts:
+            self.assertEqual(UtteranceFeatures(text).is_nonsensical, legacy_is_nonsensical(text), repr(text))
+
+    def test_pattern_hits_computed_once(self):
+        """Classifying the same features twice should match the patterns only once."""
+        classifier = AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+        calls = []
+        original = classifier._pattern_hits
+        classifier._pattern_hits = lambda text: calls.append(text) or original(text)
+
+        features = UtteranceFeatures("  I lost everything, but I will heal and move forward.  ")
+        first = classifier.classify_emotion(features.text, -0.4, "a", features=features)
+        second = classifier.classify_emotion(features.text, 0.6, "b", features=features)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(first.matched_patterns and second.matched_patterns)
+
+    def test_results_match_without_features(self):
+        """Passing features should not change the classification."""
+        with_features, without = (AdvancedHopeSorrowClassifier(speaker_state=SpeakerStateStore(c.value for c in EmotionCategory))
+                                  for _ in range(2))
+        for text, sentiment in [("I will achieve my dreams.", 0.8), ("It's all gone now.", -0.7),
+                                ("la la la la", 0.0), ("This is **** and I hate it.", -0.5)]:
+            expected = without.classify_emotion(text, sentiment, "a")
+            result = with_features.classify_emotion(text, sentiment, "a", features=UtteranceFeatures(text))
+            self.assertEqual(result.category, expected.category)
+            self.assertEqual(result.confidence, expected.confidence)
+            self.assertEqual(result.category_scores, expected.category_scores)
+
+    def test_features_for_other_text_are_ignored(self):
+        """Features built for a different text should not be used."""
+        features = UtteranceFeatures("I will achieve my dreams.")
+        self.assertIs(UtteranceFeatures.of("  I will achieve my dreams.\n", features), features)
+        self.assertIsNot(UtteranceFeatures.of("It's all gone now.", features), features)
+
+if __name__ == '__main__':
+    unittest.main()